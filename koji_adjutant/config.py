@@ -8,7 +8,9 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Any, Callable, Dict, Mapping, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
 
 try:
     import koji
@@ -17,10 +19,24 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-# Module-level config cache
-_config: Optional[Dict[str, Any]] = None
+# Module-level config cache: read-only snapshot of the [adjutant] section
+_config: Optional[Mapping[str, Any]] = None
 _options: Optional[Any] = None  # Kojid options object (initialized by kojid main)
 
+# Marks an option missing from the kojid options object
+_UNSET = object()
+
+# Strings accepted as true by _parse_bool; anything else is false
+_TRUE_STRINGS = frozenset(("true", "1", "yes", "on"))
+
+# Container defaults, built once at import; accessors copy where they
+# hand back a mutable type
+_DEFAULT_MOUNTS: Tuple[str, ...] = ("/mnt/koji:/mnt/koji:rw:Z",)
+_DEFAULT_LABELS: Mapping[str, str] = MappingProxyType({})
+_DEFAULT_TIMEOUTS: Mapping[str, int] = MappingProxyType(
+    {"pull": 300, "start": 60, "stop_grace": 20}
+)
+
 
 def initialize(options: Any) -> None:
     """Initialize config module with kojid options object.
@@ -36,7 +52,7 @@ def initialize(options: Any) -> None:
     logger.debug("Config module initialized with kojid options object")
 
 
-def _parse_config_file(config_file: Optional[str] = None) -> Dict[str, Any]:
+def _parse_config_file(config_file: Optional[str] = None) -> Mapping[str, Any]:
     """Parse kojid.conf file using koji library (FALLBACK ONLY).
 
     NOTE: This is now a fallback path. When kojid initializes config module
@@ -47,19 +63,30 @@ def _parse_config_file(config_file: Optional[str] = None) -> Dict[str, Any]:
         config_file: Optional path to config file. If None, uses default.
 
     Returns:
-        Empty dict (settings come from options object when available)
+        Read-only snapshot of the [adjutant] section, empty if the koji
+        library, the file or the section is unavailable.
     """
     logger.debug("Using fallback config parsing (options object not initialized)")
-    # Return empty dict - when used with kojid, settings come from options object
-    # This avoids duplicate config parsing and the NoSectionError
-    return {}
+    if koji is None:
+        return MappingProxyType({})
+    config_file = config_file or "/etc/kojid/kojid.conf"
+    try:
+        parsed = koji.read_config_files(config_file)
+        # Missing file or section is not an error: settings then come from defaults
+        section = dict(parsed["adjutant"]) if "adjutant" in parsed else {}
+    except Exception as exc:
+        logger.warning("Could not read config file %s: %s", config_file, exc)
+        section = {}
+    return MappingProxyType(section)
+
 
+def _get_config() -> Mapping[str, Any]:
+    """Get parsed config snapshot, reading the config file on first use.
 
-def _get_config() -> Dict[str, Any]:
-    """Get parsed config dict, initializing if needed.
+    The file is read at most once until reset_config() is called.
 
     Returns:
-        Config dict with [adjutant] section values.
+        Read-only mapping of [adjutant] section values.
     """
     global _config
     if _config is None:
@@ -101,9 +128,8 @@ def _get_config_value(
 
     # Check options object (if initialized by kojid)
     if _options is not None:
-        option_key = f"adjutant_{key}"
-        if hasattr(_options, option_key):
-            value = getattr(_options, option_key)
+        value = getattr(_options, f"adjutant_{key}", _UNSET)
+        if value is not _UNSET:
             if converter and isinstance(value, str):
                 try:
                     return converter(value)
@@ -137,7 +163,7 @@ def _parse_bool(value: Any) -> bool:
     if isinstance(value, bool):
         return value
     if isinstance(value, str):
-        return value.lower() in ("true", "1", "yes", "on")
+        return value.lower() in _TRUE_STRINGS
     return bool(value)
 
 
@@ -148,38 +174,46 @@ def _parse_timeouts(value: Any) -> Dict[str, int]:
     - Dict: {"pull": 300, "start": 60, "stop_grace": 20}
     - String: "pull=300,start=60,stop_grace=20"
     """
-    if isinstance(value, dict):
-        return value
+    if isinstance(value, Mapping):
+        return dict(value)
     if isinstance(value, str):
-        timeouts = {}
-        for item in value.split(","):
-            if "=" in item:
-                key, val = item.split("=", 1)
-                try:
-                    timeouts[key.strip()] = int(val.strip())
-                except ValueError:
-                    logger.warning("Invalid timeout value: %s", item)
-        return timeouts
-    return {"pull": 300, "start": 60, "stop_grace": 20}
+        return dict(_split_timeouts(value))
+    return dict(_DEFAULT_TIMEOUTS)
+
+
+@lru_cache(maxsize=32)
+def _split_timeouts(value: str) -> Tuple[Tuple[str, int], ...]:
+    """Tokenize a "key=seconds,..." timeouts string (memoized per string)."""
+    timeouts = {}
+    for item in value.split(","):
+        key, sep, val = item.partition("=")
+        if sep:
+            try:
+                timeouts[key.strip()] = int(val)
+            except ValueError:
+                logger.warning("Invalid timeout value: %s", item)
+    return tuple(timeouts.items())
 
 
 def _parse_mounts(value: Any) -> list[str]:
     """Parse container mounts from config.
 
     Accepts:
-    - List: ["/mnt/koji:/mnt/koji:rw:Z"]
+    - List or tuple: ["/mnt/koji:/mnt/koji:rw:Z"]
     - String (space or comma separated): "/mnt/koji:/mnt/koji:rw:Z"
     """
-    if isinstance(value, list):
-        return value
+    if isinstance(value, (list, tuple)):
+        return list(value)
     if isinstance(value, str):
-        # Split by comma or space
-        mounts = []
-        for item in value.replace(",", " ").split():
-            if item.strip():
-                mounts.append(item.strip())
-        return mounts
-    return ["/mnt/koji:/mnt/koji:rw:Z"]
+        return list(_split_mounts(value))
+    return list(_DEFAULT_MOUNTS)
+
+
+@lru_cache(maxsize=32)
+def _split_mounts(value: str) -> Tuple[str, ...]:
+    """Tokenize a comma or space separated mounts string (memoized per string)."""
+    # Split by comma or space
+    return tuple(value.replace(",", " ").split())
 
 
 def _parse_labels(value: Any) -> Mapping[str, str]:
@@ -189,16 +223,22 @@ def _parse_labels(value: Any) -> Mapping[str, str]:
     - Dict: {"key": "value"}
     - String: "key1=value1,key2=value2"
     """
-    if isinstance(value, dict):
+    if isinstance(value, Mapping):
         return value
     if isinstance(value, str):
-        labels = {}
-        for item in value.split(","):
-            if "=" in item:
-                key, val = item.split("=", 1)
-                labels[key.strip()] = val.strip()
-        return labels
-    return {}
+        return dict(_split_labels(value))
+    return _DEFAULT_LABELS
+
+
+@lru_cache(maxsize=32)
+def _split_labels(value: str) -> Tuple[Tuple[str, str], ...]:
+    """Tokenize a "key=value,..." labels string (memoized per string)."""
+    labels = {
+        key.strip(): val.strip()
+        for key, sep, val in (item.partition("=") for item in value.split(","))
+        if sep
+    }
+    return tuple(labels.items())
 
 
 def adjutant_task_image_default() -> str:
@@ -229,7 +269,7 @@ def adjutant_container_mounts() -> list[str]:
     """
     value = _get_config_value(
         "container_mounts",
-        ["/mnt/koji:/mnt/koji:rw:Z"],
+        _DEFAULT_MOUNTS,
         env_var="KOJI_ADJUTANT_CONTAINER_MOUNTS",
     )
     return _parse_mounts(value)
@@ -252,7 +292,7 @@ def adjutant_container_labels() -> Mapping[str, str]:
     """
     value = _get_config_value(
         "container_labels",
-        {},
+        _DEFAULT_LABELS,
         env_var="KOJI_ADJUTANT_CONTAINER_LABELS",
     )
     return _parse_labels(value)
@@ -265,7 +305,7 @@ def adjutant_container_timeouts() -> Dict[str, int]:
     """
     value = _get_config_value(
         "container_timeouts",
-        {"pull": 300, "start": 60, "stop_grace": 20},
+        _DEFAULT_TIMEOUTS,
         env_var="KOJI_ADJUTANT_CONTAINER_TIMEOUTS",
     )
     return _parse_timeouts(value)
@@ -291,6 +331,47 @@ def adjutant_policy_cache_ttl() -> int:
     )
 
 
+def adjutant_policy_cache_ttl_tag() -> Optional[int]:
+    """Cache TTL in seconds for policies found in tag extra data.
+
+    None (the default) means use policy_cache_ttl.
+    """
+    return _get_config_value(
+        "policy_cache_ttl_tag",
+        None,
+        env_var="KOJI_ADJUTANT_POLICY_CACHE_TTL_TAG",
+        converter=int,
+    )
+
+
+def adjutant_policy_cache_ttl_build_config() -> Optional[int]:
+    """Cache TTL in seconds for policies found in build config extra data.
+
+    None (the default) means use policy_cache_ttl.
+    """
+    return _get_config_value(
+        "policy_cache_ttl_build_config",
+        None,
+        env_var="KOJI_ADJUTANT_POLICY_CACHE_TTL_BUILD_CONFIG",
+        converter=int,
+    )
+
+
+def adjutant_policy_cache_ttl_miss() -> Optional[int]:
+    """Cache TTL in seconds for tags with no policy on the hub.
+
+    While cached, such tags use the config default image without a hub
+    query. None (the default) means use policy_cache_ttl; 0 disables
+    caching of misses.
+    """
+    return _get_config_value(
+        "policy_cache_ttl_miss",
+        None,
+        env_var="KOJI_ADJUTANT_POLICY_CACHE_TTL_MISS",
+        converter=int,
+    )
+
+
 def adjutant_buildroot_enabled() -> bool:
     """Enable buildroot initialization (Phase 2.2).
 
@@ -467,7 +548,10 @@ def _get_volume_mounts_from_runtime() -> Dict[str, str]:
 
 
 def reset_config() -> None:
-    """Reset config cache (useful for testing)."""
+    """Reset config cache and memoized value parsing (useful for testing)."""
     global _config, _options
     _config = None
     _options = None
+    _split_mounts.cache_clear()
+    _split_labels.cache_clear()
+    _split_timeouts.cache_clear()
@@ -1,4 +1,5 @@
 from .interface import (
+    BoundedInMemoryLogSink,
     ContainerError,
     ContainerHandle,
     ContainerManager,
@@ -11,6 +12,7 @@ from .interface import (
 )
 
 __all__ = [
+    "BoundedInMemoryLogSink",
     "ContainerError",
     "ContainerHandle",
     "ContainerManager",
@@ -153,6 +153,22 @@ class ContainerManager(Protocol):
         """
         ...
 
+    def copy_many(
+        self,
+        handle: ContainerHandle,
+        files: Sequence[tuple[Path, str]],
+    ) -> None:  # pragma: no cover - protocol
+        """Copy several files from host to container in one operation.
+        
+        Args:
+            handle: Container to copy to
+            files: Sequence of (host path, absolute container path) pairs
+            
+        Raises:
+            ContainerError: If any source is invalid or the copy fails
+        """
+        ...
+
     def run(
         self,
         spec: ContainerSpec,
@@ -191,3 +207,36 @@ class InMemoryLogSink:
     @property
     def stderr(self) -> bytes:
         return bytes(self._stderr)
+
+
+class BoundedInMemoryLogSink:
+    """In-memory sink that keeps only the last ``max_bytes`` of each stream.
+
+    Memory use stays flat however much a container writes, which suits tests
+    that only look for a marker near the end of the output.
+    """
+
+    def __init__(self, max_bytes: int = 4096) -> None:
+        self.max_bytes = max_bytes
+        self._stdout: bytearray = bytearray()
+        self._stderr: bytearray = bytearray()
+
+    def _append(self, buffer: bytearray, data: bytes) -> None:
+        buffer.extend(data)
+        overflow = len(buffer) - self.max_bytes
+        if overflow > 0:
+            del buffer[:overflow]
+
+    def write_stdout(self, data: bytes) -> None:
+        self._append(self._stdout, data)
+
+    def write_stderr(self, data: bytes) -> None:
+        self._append(self._stderr, data)
+
+    @property
+    def stdout(self) -> bytes:
+        return bytes(self._stdout)
+
+    @property
+    def stderr(self) -> bytes:
+        return bytes(self._stderr)
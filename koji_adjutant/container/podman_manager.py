@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-import io
 import logging
 import os
+import stat
 import tarfile
+import tempfile
 from datetime import datetime, timezone
+from functools import cached_property
 from pathlib import Path
 from queue import Queue
-from threading import Event, Thread
+from threading import Condition, Event, Thread
 from time import monotonic, sleep
-from typing import Dict, Iterable, Optional, Sequence
+from typing import Dict, Iterable, Optional, Sequence, Union
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +44,124 @@ except ImportError:
         return None
 
 
+# Exec output batching bounds: hand buffered output to the sink once it
+# reaches this many bytes, or at the latest this long after the first
+# buffered byte arrived
+_EXEC_BATCH_BYTES = 64 * 1024
+_EXEC_BATCH_SECONDS = 0.25
+
+
+class _ExecOutputBatch:
+    """Coalesce consecutive exec output frames before writing to a sink.
+
+    Frames are buffered while they come from the same stream and flushed
+    when the stream switches, so stdout/stderr ordering is preserved. A
+    single flusher thread, started with the first frame, flushes the
+    buffer once its oldest byte is _EXEC_BATCH_SECONDS old, so output
+    followed by a quiet spell still reaches the sink. close() flushes
+    what is left and stops the flusher.
+    """
+
+    def __init__(self, sink: LogSink) -> None:
+        self._sink = sink
+        self._stream: Optional[str] = None
+        self._buffer = bytearray()
+        self._cond = Condition()
+        # monotonic() time by which the buffered output must be flushed
+        self._deadline: Optional[float] = None
+        self._closed = False
+        self._flusher: Optional[Thread] = None
+
+    def add(self, stream: str, data: bytes) -> None:
+        with self._cond:
+            if self._flusher is None:
+                self._flusher = Thread(
+                    target=self._run_flusher, name="podman-exec-flusher", daemon=True
+                )
+                self._flusher.start()
+            if stream != self._stream:
+                self._flush()
+                self._stream = stream
+            self._buffer += data
+            if len(self._buffer) >= _EXEC_BATCH_BYTES:
+                self._flush()
+            elif self._deadline is None:
+                self._deadline = monotonic() + _EXEC_BATCH_SECONDS
+                self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._flush()
+            self._cond.notify()
+        if self._flusher is not None:
+            self._flusher.join()
+
+    def _run_flusher(self) -> None:
+        with self._cond:
+            while not self._closed:
+                if self._deadline is None:
+                    self._cond.wait()
+                    continue
+                remaining = self._deadline - monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                else:
+                    self._flush()
+
+    def _flush(self) -> None:
+        # Caller holds self._cond
+        self._deadline = None
+        if not self._buffer:
+            return
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        if self._stream == "stderr":
+            self._sink.write_stderr(data)
+        else:
+            self._sink.write_stdout(data)
+
+
+# Archives for copy_to()/copy_many() stay in memory up to this size and
+# spill to a temporary file beyond it
+_ARCHIVE_SPOOL_BYTES = 1024 * 1024
+
+
+def _spool_archive(entries: Iterable[tuple[Path, str]]) -> tempfile.SpooledTemporaryFile:
+    """Pack (source, arcname) entries into a tar archive rewound for reading.
+
+    The caller closes the returned file once it has been uploaded.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=_ARCHIVE_SPOOL_BYTES)
+    try:
+        with tarfile.open(fileobj=spool, mode="w") as tar:
+            for src_path, arcname in entries:
+                # Preserve permissions of the source file
+                tar.add(src_path, arcname=arcname, recursive=False)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+def _archive_data(
+    spool: tempfile.SpooledTemporaryFile,
+) -> Union[bytes, tempfile.SpooledTemporaryFile]:
+    """Return the upload body for a spooled archive.
+
+    requests sizes a file body through fileno(), which would roll an
+    in-memory spool over to disk, so archives small enough to still be
+    held in memory are passed as bytes and only larger ones as the file
+    itself.
+    """
+    size = spool.seek(0, os.SEEK_END)
+    spool.seek(0)
+    if size <= _ARCHIVE_SPOOL_BYTES:
+        return spool.read()
+    return spool
+
+
 class PodmanManager(ContainerManager):
     """Podman-backed implementation of ContainerManager.
 
@@ -67,8 +187,6 @@ class PodmanManager(ContainerManager):
         self._network_default = (
             adj_config.adjutant_network_enabled() if network_default is None else network_default
         )
-        # Lazy-init Podman client on first use to make tests lighter
-        self._client = None  # type: ignore[var-annotated]
         # Timeouts
         t = adj_config.adjutant_container_timeouts()
         self._timeout_pull_s = int(t.get("pull", 300))
@@ -93,7 +211,6 @@ class PodmanManager(ContainerManager):
         """
         socket_path = adj_config.adjutant_podman_socket()
         try:
-            self._ensure_client()
             # Try to ping Podman daemon
             info = self._client.ping()
             # Get version info
@@ -116,7 +233,6 @@ class PodmanManager(ContainerManager):
             }
 
     def ensure_image_available(self, image: str) -> None:
-        self._ensure_client()
         try:
             has_local = self._has_image(image)
         except APIError as exc:  # pragma: no cover - pass through as ContainerError
@@ -131,7 +247,6 @@ class PodmanManager(ContainerManager):
             self._pull_image(image)
 
     def create(self, spec: ContainerSpec) -> ContainerHandle:
-        self._ensure_client()
         try:
             container_id = self._create_container(spec)
         except APIError as exc:
@@ -201,7 +316,6 @@ class PodmanManager(ContainerManager):
         return ContainerHandle(container_id=container_id)
 
     def start(self, handle: ContainerHandle) -> None:
-        self._ensure_client()
         try:
             self._start_container(handle.container_id)
         except APIError as exc:
@@ -224,19 +338,16 @@ class PodmanManager(ContainerManager):
                 logger.debug("Failed to update container status in monitoring: %s", exc)
 
     def stream_logs(self, handle: ContainerHandle, sink: LogSink, follow: bool = True) -> None:
-        self._ensure_client()
         # Non-blocking stream: run in background, drop-oldest on pressure
         self._stream_container_logs(handle.container_id, sink, follow=follow)
 
     def wait(self, handle: ContainerHandle) -> int:
-        self._ensure_client()
         try:
             return self._wait_container_exit_code(handle.container_id)
         except APIError as exc:
             raise ContainerError("failed waiting for container", cause=exc)
 
     def remove(self, handle: ContainerHandle, force: bool = False) -> None:
-        self._ensure_client()
         try:
             self._remove_container(handle.container_id, force=force)
         except NotFound:
@@ -270,7 +381,6 @@ class PodmanManager(ContainerManager):
         environment: Optional[Dict[str, str]] = None,
     ) -> int:
         """Execute command in running container via podman exec."""
-        self._ensure_client()
         try:
             container = self._client.containers.get(handle.container_id)
         except NotFound as exc:
@@ -297,36 +407,45 @@ class PodmanManager(ContainerManager):
                 exit_code_hint = None
 
             # Stream output to sink
-            # Generator yields (stdout_bytes, stderr_bytes) tuples or raw bytes
-            for chunk in exec_gen:
-                if chunk is None:
-                    continue
-                # Handle both tuple (stdout, stderr) and bytes formats
-                if isinstance(chunk, tuple):
-                    # Handle tuple format: (stdout_bytes, stderr_bytes)
-                    # Some versions may return tuples with different lengths
-                    if len(chunk) >= 2:
-                        stdout_data, stderr_data = chunk[0], chunk[1]
-                    elif len(chunk) == 1:
-                        stdout_data, stderr_data = chunk[0], None
-                    else:
-                        continue  # Skip empty tuples
-
-                    if stdout_data:
-                        sink.write_stdout(stdout_data)
-                    if stderr_data:
-                        sink.write_stderr(stderr_data)
-                elif isinstance(chunk, bytes):
-                    # When demux doesn't work, treat as stdout
-                    sink.write_stdout(chunk)
-                else:
-                    # Defensive: convert to bytes if possible
-                    try:
-                        data = bytes(chunk)
-                        sink.write_stdout(data)
-                    except (TypeError, ValueError):
-                        # Skip chunks we can't handle
+            # Generator yields (stdout_bytes, stderr_bytes) tuples or raw bytes.
+            # Podman frames are often tiny (one line each), so consecutive
+            # frames from the same stream are coalesced and handed to the
+            # sink in batches, bounded by size and age to keep logs live.
+            batch = _ExecOutputBatch(sink)
+            add = batch.add
+            try:
+                for chunk in exec_gen:
+                    if chunk is None:
                         continue
+                    # Handle both tuple (stdout, stderr) and bytes formats
+                    if isinstance(chunk, tuple):
+                        # Handle tuple format: (stdout_bytes, stderr_bytes)
+                        # Some versions may return tuples with different lengths
+                        if len(chunk) >= 2:
+                            stdout_data, stderr_data = chunk[0], chunk[1]
+                        elif len(chunk) == 1:
+                            stdout_data, stderr_data = chunk[0], None
+                        else:
+                            continue  # Skip empty tuples
+
+                        if stdout_data:
+                            add("stdout", stdout_data)
+                        if stderr_data:
+                            add("stderr", stderr_data)
+                    elif isinstance(chunk, bytes):
+                        # When demux doesn't work, treat as stdout
+                        add("stdout", chunk)
+                    else:
+                        # Defensive: convert to bytes if possible
+                        try:
+                            data = bytes(chunk)
+                            add("stdout", data)
+                        except (TypeError, ValueError):
+                            # Skip chunks we can't handle
+                            continue
+            finally:
+                # Also stops the flusher when the stream fails
+                batch.close()
 
             # Get exit code
             # If we got exit_code_hint from the streaming call, use it if valid
@@ -356,7 +475,6 @@ class PodmanManager(ContainerManager):
         dest_path: str,
     ) -> None:
         """Copy file to container using podman put_archive."""
-        self._ensure_client()
         try:
             container = self._client.containers.get(handle.container_id)
         except NotFound as exc:
@@ -364,31 +482,52 @@ class PodmanManager(ContainerManager):
         except APIError as exc:
             raise ContainerError("failed to get container for copy", cause=exc)
 
-        # Validate source path exists
-        src_path = Path(src_path)
-        if not src_path.exists():
-            raise ContainerError(f"source path does not exist: {src_path}")
-
-        if not src_path.is_file():
-            raise ContainerError(f"source path is not a file: {src_path}")
+        src_path = self._validate_copy_source(src_path)
 
         try:
-            # Create tar archive of single file
-            tar_stream = io.BytesIO()
-            with tarfile.open(fileobj=tar_stream, mode="w") as tar:
-                # Add file with basename as arcname, preserving permissions
-                tar.add(src_path, arcname=os.path.basename(dest_path), recursive=False)
-            tar_stream.seek(0)
-
-            # Put archive in container at parent directory
-            dest_dir = os.path.dirname(dest_path)
-            container.put_archive(path=dest_dir, data=tar_stream.read())
+            # Tar archive of single file, named after the destination basename
+            with _spool_archive([(src_path, os.path.basename(dest_path))]) as archive:
+                # Put archive in container at parent directory
+                dest_dir = os.path.dirname(dest_path)
+                container.put_archive(path=dest_dir, data=_archive_data(archive))
 
         except APIError as exc:
             raise ContainerError(f"failed to copy file to container: {src_path} -> {dest_path}", cause=exc)
         except Exception as exc:
             raise ContainerError(f"failed to create archive for copy: {src_path}", cause=exc)
 
+    def copy_many(
+        self,
+        handle: ContainerHandle,
+        files: Sequence[tuple[Path, str]],
+    ) -> None:
+        """Copy several files to container with a single put_archive call.
+
+        All entries are packed into one tar stream rooted at "/", so the
+        batch costs one API roundtrip regardless of how many files it holds.
+        """
+        try:
+            container = self._client.containers.get(handle.container_id)
+        except NotFound as exc:
+            raise ContainerError(f"container not found: {handle.container_id}", cause=exc)
+        except APIError as exc:
+            raise ContainerError("failed to get container for copy", cause=exc)
+
+        # Validate every source before building the archive
+        entries = [(self._validate_copy_source(src), dest) for src, dest in files]
+        if not entries:
+            return
+
+        try:
+            archive_entries = [(src, dest.lstrip("/")) for src, dest in entries]
+            with _spool_archive(archive_entries) as archive:
+                container.put_archive(path="/", data=_archive_data(archive))
+
+        except APIError as exc:
+            raise ContainerError(f"failed to copy files to container: {[d for _, d in entries]}", cause=exc)
+        except Exception as exc:
+            raise ContainerError("failed to create archive for copy", cause=exc)
+
     def run(self, spec: ContainerSpec, sink: LogSink, attach_streams: bool = True) -> ContainerRunResult:
         self.ensure_image_available(spec.image)
         handle = self.create(spec)
@@ -419,18 +558,33 @@ class PodmanManager(ContainerManager):
 
     # --- private helpers (placeholders until wired with Podman API) ---
 
-    def _ensure_client(self) -> None:
-        if self._client is None:
-            if PodmanClient is None:
-                # In test environments without podman, allow stubbing
-                raise ContainerError("Podman client not available")
-            # Get socket path from config
-            socket_path = adj_config.adjutant_podman_socket()
-            logger.debug("Initializing PodmanClient with socket: %s", socket_path)
-            self._client = PodmanClient(base_url=socket_path)
+    @cached_property
+    def _client(self) -> "PodmanClient":
+        """Podman client, created on first use to make tests lighter.
+
+        Tests may assign a stub to this attribute before first use.
+        """
+        if PodmanClient is None:
+            # In test environments without podman, allow stubbing
+            raise ContainerError("Podman client not available")
+        # Get socket path from config
+        socket_path = adj_config.adjutant_podman_socket()
+        logger.debug("Initializing PodmanClient with socket: %s", socket_path)
+        return PodmanClient(base_url=socket_path)
+
+    def _validate_copy_source(self, src_path: Path) -> Path:
+        src_path = Path(src_path)
+        # One stat() answers both existence and file type
+        try:
+            mode = src_path.stat().st_mode
+        except (FileNotFoundError, NotADirectoryError):
+            raise ContainerError(f"source path does not exist: {src_path}")
+
+        if not stat.S_ISREG(mode):
+            raise ContainerError(f"source path is not a file: {src_path}")
+        return src_path
 
     def _has_image(self, image: str) -> bool:
-        assert self._client is not None
         try:
             self._client.images.get(image)
             return True
@@ -438,7 +592,6 @@ class PodmanManager(ContainerManager):
             return False
 
     def _pull_image(self, image: str) -> None:
-        assert self._client is not None
         deadline = monotonic() + self._timeout_pull_s
         last_exc: Optional[BaseException] = None
         while True:
@@ -453,8 +606,6 @@ class PodmanManager(ContainerManager):
             sleep(1.0)
 
     def _create_container(self, spec: ContainerSpec) -> str:
-        assert self._client is not None
-
         # Get host mount mappings for podman-in-podman
         host_mount_map = adj_config.adjutant_host_mount_map()
         if host_mount_map:
@@ -615,7 +766,6 @@ class PodmanManager(ContainerManager):
         return container.id
 
     def _start_container(self, container_id: str) -> None:
-        assert self._client is not None
         container = self._client.containers.get(container_id)
         container.start()
         # Wait for running or exited with start timeout
@@ -630,7 +780,6 @@ class PodmanManager(ContainerManager):
             sleep(0.2)
 
     def _stream_container_logs(self, container_id: str, sink: LogSink, *, follow: bool) -> None:
-        assert self._client is not None
         container = self._client.containers.get(container_id)
 
         stop_event = Event()
@@ -690,7 +839,6 @@ class PodmanManager(ContainerManager):
         t_writer.start()
 
     def _wait_container_exit_code(self, container_id: str) -> int:
-        assert self._client is not None
         container = self._client.containers.get(container_id)
         # Podman-py wait() returns dict or status code depending on version
         result = container.wait()
@@ -701,7 +849,6 @@ class PodmanManager(ContainerManager):
         return code
 
     def _remove_container(self, container_id: str, *, force: bool) -> None:
-        assert self._client is not None
         container = self._client.containers.get(container_id)
         try:
             container.remove(force=force)
@@ -7278,6 +7278,9 @@ def get_options():
                 'adjutant_network_enabled': True,
                 'adjutant_policy_enabled': True,
                 'adjutant_policy_cache_ttl': 300,
+                'adjutant_policy_cache_ttl_tag': None,
+                'adjutant_policy_cache_ttl_build_config': None,
+                'adjutant_policy_cache_ttl_miss': None,
                 'adjutant_buildroot_enabled': True,
                 'adjutant_monitoring_enabled': True,
                 'adjutant_monitoring_bind': '0.0.0.0:8080',
@@ -7293,7 +7296,9 @@ def get_options():
                         'timeout', 'rpmbuild_timeout', 'oz_install_timeout',
                         'task_avail_delay', 'buildroot_basic_cleanup_delay',
                         'buildroot_final_cleanup_delay',
-                        'adjutant_policy_cache_ttl', 'adjutant_monitoring_container_history_ttl',
+                        'adjutant_policy_cache_ttl', 'adjutant_policy_cache_ttl_tag',
+                        'adjutant_policy_cache_ttl_build_config', 'adjutant_policy_cache_ttl_miss',
+                        'adjutant_monitoring_container_history_ttl',
                         'adjutant_monitoring_task_history_ttl']:
                 try:
                     defaults[name] = int(value)
@@ -2,17 +2,18 @@
 
 from __future__ import annotations
 
+import heapq
 import logging
 import threading
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ContainerInfo:
     """Container information stored in registry."""
 
@@ -29,7 +30,7 @@ class ContainerInfo:
     user: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskInfo:
     """Task information stored in registry."""
 
@@ -46,11 +47,41 @@ class TaskInfo:
     progress: Optional[Dict[str, Any]] = None
 
 
+def _pop_expired(
+    expiry: List[Tuple[float, Hashable]],
+    entries: Dict[Any, Any],
+    history_ttl: float,
+    now: float,
+) -> List[Hashable]:
+    """Delete entries whose history TTL has passed, using an expiry heap.
+
+    The heap holds (finished timestamp + TTL, key) pairs pushed whenever an
+    entry finishes. Only the expired prefix of the heap is visited. Stale
+    pairs, for entries since removed, re-registered or finished again later,
+    are dropped without deleting anything.
+
+    Returns:
+        Keys of the removed entries
+    """
+    removed = []
+    while expiry and expiry[0][0] < now:
+        _, key = heapq.heappop(expiry)
+        entry = entries.get(key)
+        if entry is None or entry.finished_at is None:
+            continue
+        if now - entry.finished_at.timestamp() > history_ttl:
+            del entries[key]
+            removed.append(key)
+    return removed
+
+
 class ContainerRegistry:
     """Thread-safe container registry tracking active containers.
 
     Uses RLock for thread-safe operations and supports TTL-based cleanup
-    of completed containers.
+    of completed containers. get() reads without the lock: a single dict
+    lookup is atomic under the GIL. Mutations keep the lock so epoch
+    bumps are never lost.
     """
 
     def __init__(self, history_ttl: int = 3600):
@@ -60,8 +91,21 @@ class ContainerRegistry:
             history_ttl: TTL in seconds for completed containers (default: 3600)
         """
         self._containers: Dict[str, ContainerInfo] = {}
+        # Ids of containers not yet removed, in registration order
+        self._active: Dict[str, None] = {}
+        # (expiry timestamp, container_id) heap for cleanup_old_entries()
+        self._expiry: List[Tuple[float, str]] = []
         self._lock = threading.RLock()
         self._history_ttl = history_ttl
+        self._epoch = 0
+
+    @property
+    def epoch(self) -> int:
+        """Counter bumped on every mutation, for caching derived views.
+
+        Only changes made through registry methods are counted.
+        """
+        return self._epoch
 
     def register(
         self,
@@ -100,6 +144,8 @@ class ContainerRegistry:
                 command=command or [],
                 user=user,
             )
+            self._active[container_id] = None
+            self._epoch += 1
             logger.debug("Registered container: %s (task_id=%s)", container_id, task_id)
 
     def unregister(self, container_id: str) -> None:
@@ -109,10 +155,16 @@ class ContainerRegistry:
             container_id: Container ID to unregister
         """
         with self._lock:
-            if container_id in self._containers:
-                container = self._containers[container_id]
+            container = self._containers.get(container_id)
+            if container is not None:
                 container.status = "removed"
                 container.finished_at = datetime.now(timezone.utc)
+                self._active.pop(container_id, None)
+                heapq.heappush(
+                    self._expiry,
+                    (container.finished_at.timestamp() + self._history_ttl, container_id),
+                )
+                self._epoch += 1
                 logger.debug("Unregistered container: %s", container_id)
                 # Don't remove immediately - keep for history TTL
                 # Cleanup happens in cleanup_old_entries()
@@ -125,10 +177,16 @@ class ContainerRegistry:
             status: New status ("created", "running", "exited", "removed")
         """
         with self._lock:
-            if container_id in self._containers:
-                self._containers[container_id].status = status
-                if status == "running" and not self._containers[container_id].started_at:
-                    self._containers[container_id].started_at = datetime.now(timezone.utc)
+            container = self._containers.get(container_id)
+            if container is not None:
+                container.status = status
+                if status == "running" and not container.started_at:
+                    container.started_at = datetime.now(timezone.utc)
+                if status == "removed":
+                    self._active.pop(container_id, None)
+                else:
+                    self._active[container_id] = None
+                self._epoch += 1
 
     def get(self, container_id: str) -> Optional[ContainerInfo]:
         """Get container info by ID.
@@ -139,8 +197,7 @@ class ContainerRegistry:
         Returns:
             ContainerInfo if found, None otherwise
         """
-        with self._lock:
-            return self._containers.get(container_id)
+        return self._containers.get(container_id)
 
     def list_containers(self, active_only: bool = False) -> List[ContainerInfo]:
         """List all containers.
@@ -152,10 +209,10 @@ class ContainerRegistry:
             List of ContainerInfo objects
         """
         with self._lock:
-            containers = list(self._containers.values())
             if active_only:
-                containers = [c for c in containers if c.status != "removed"]
-            return containers
+                # Visit only the active entries, not the whole history
+                return [self._containers[i] for i in self._active]
+            return list(self._containers.values())
 
     def cleanup_old_entries(self) -> int:
         """Remove entries older than TTL.
@@ -164,22 +221,15 @@ class ContainerRegistry:
             Number of entries removed
         """
         with self._lock:
-            now = time.time()
-            removed = 0
-            to_remove = []
-
-            for container_id, container in self._containers.items():
-                if container.finished_at:
-                    # Check if finished container is older than TTL
-                    finished_ts = container.finished_at.timestamp()
-                    if now - finished_ts > self._history_ttl:
-                        to_remove.append(container_id)
-
-            for container_id in to_remove:
-                del self._containers[container_id]
-                removed += 1
+            expired = _pop_expired(
+                self._expiry, self._containers, self._history_ttl, time.time()
+            )
+            for container_id in expired:
+                self._active.pop(container_id, None)
+            removed = len(expired)
 
             if removed > 0:
+                self._epoch += 1
                 logger.debug("Cleaned up %d old container entries", removed)
 
             return removed
@@ -188,13 +238,18 @@ class ContainerRegistry:
         """Clear all entries."""
         with self._lock:
             self._containers.clear()
+            self._active.clear()
+            self._expiry.clear()
+            self._epoch += 1
 
 
 class TaskRegistry:
     """Thread-safe task registry tracking active tasks.
 
     Uses RLock for thread-safe operations and supports TTL-based cleanup
-    of completed tasks.
+    of completed tasks. get() reads without the lock: a single dict
+    lookup is atomic under the GIL. Mutations keep the lock so epoch
+    bumps are never lost.
     """
 
     def __init__(self, history_ttl: int = 3600):
@@ -204,8 +259,21 @@ class TaskRegistry:
             history_ttl: TTL in seconds for completed tasks (default: 3600)
         """
         self._tasks: Dict[int, TaskInfo] = {}
+        # Ids of running tasks, in registration order
+        self._active: Dict[int, None] = {}
+        # (expiry timestamp, task_id) heap for cleanup_old_entries()
+        self._expiry: List[Tuple[float, int]] = []
         self._lock = threading.RLock()
         self._history_ttl = history_ttl
+        self._epoch = 0
+
+    @property
+    def epoch(self) -> int:
+        """Counter bumped on every mutation, for caching derived views.
+
+        Only changes made through registry methods are counted.
+        """
+        return self._epoch
 
     def register_task(
         self,
@@ -240,6 +308,8 @@ class TaskRegistry:
                 container_id=container_id,
                 log_path=log_path,
             )
+            self._active[task_id] = None
+            self._epoch += 1
             logger.debug("Registered task: %d (type=%s)", task_id, task_type)
 
     def update_task_status(self, task_id: int, status: str) -> None:
@@ -250,10 +320,20 @@ class TaskRegistry:
             status: New status ("running", "completed", "failed")
         """
         with self._lock:
-            if task_id in self._tasks:
-                self._tasks[task_id].status = status
+            task = self._tasks.get(task_id)
+            if task is not None:
+                task.status = status
+                if status == "running":
+                    self._active[task_id] = None
+                else:
+                    self._active.pop(task_id, None)
                 if status in ("completed", "failed"):
-                    self._tasks[task_id].finished_at = datetime.now(timezone.utc)
+                    task.finished_at = datetime.now(timezone.utc)
+                    heapq.heappush(
+                        self._expiry,
+                        (task.finished_at.timestamp() + self._history_ttl, task_id),
+                    )
+                self._epoch += 1
 
     def update_task_progress(self, task_id: int, progress: Dict[str, Any]) -> None:
         """Update task progress.
@@ -263,8 +343,10 @@ class TaskRegistry:
             progress: Progress dict with keys like "stage", "percent"
         """
         with self._lock:
-            if task_id in self._tasks:
-                self._tasks[task_id].progress = progress
+            task = self._tasks.get(task_id)
+            if task is not None:
+                task.progress = progress
+                self._epoch += 1
 
     def update_container_id(self, task_id: int, container_id: str) -> None:
         """Update container ID for task.
@@ -274,8 +356,10 @@ class TaskRegistry:
             container_id: Container ID
         """
         with self._lock:
-            if task_id in self._tasks:
-                self._tasks[task_id].container_id = container_id
+            task = self._tasks.get(task_id)
+            if task is not None:
+                task.container_id = container_id
+                self._epoch += 1
 
     def get(self, task_id: int) -> Optional[TaskInfo]:
         """Get task info by ID.
@@ -286,8 +370,7 @@ class TaskRegistry:
         Returns:
             TaskInfo if found, None otherwise
         """
-        with self._lock:
-            return self._tasks.get(task_id)
+        return self._tasks.get(task_id)
 
     def list_tasks(self, active_only: bool = False) -> List[TaskInfo]:
         """List all tasks.
@@ -299,10 +382,10 @@ class TaskRegistry:
             List of TaskInfo objects
         """
         with self._lock:
-            tasks = list(self._tasks.values())
             if active_only:
-                tasks = [t for t in tasks if t.status == "running"]
-            return tasks
+                # Visit only the running entries, not the whole history
+                return [self._tasks[i] for i in self._active]
+            return list(self._tasks.values())
 
     def cleanup_old_entries(self) -> int:
         """Remove entries older than TTL.
@@ -311,22 +394,13 @@ class TaskRegistry:
             Number of entries removed
         """
         with self._lock:
-            now = time.time()
-            removed = 0
-            to_remove = []
-
-            for task_id, task in self._tasks.items():
-                if task.finished_at:
-                    # Check if finished task is older than TTL
-                    finished_ts = task.finished_at.timestamp()
-                    if now - finished_ts > self._history_ttl:
-                        to_remove.append(task_id)
-
-            for task_id in to_remove:
-                del self._tasks[task_id]
-                removed += 1
+            expired = _pop_expired(self._expiry, self._tasks, self._history_ttl, time.time())
+            for task_id in expired:
+                self._active.pop(task_id, None)
+            removed = len(expired)
 
             if removed > 0:
+                self._epoch += 1
                 logger.debug("Cleaned up %d old task entries", removed)
 
             return removed
@@ -334,4 +408,7 @@ class TaskRegistry:
     def clear(self) -> None:
         """Clear all entries."""
         with self._lock:
-            self._tasks.clear()
\ No newline at end of file
+            self._tasks.clear()
+            self._active.clear()
+            self._expiry.clear()
+            self._epoch += 1
\ No newline at end of file
@@ -4,13 +4,13 @@ from __future__ import annotations
 
 import json
 import logging
-import socket
+import os
 import time
 from datetime import datetime, timezone
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from io import BytesIO
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Dict, Optional, Tuple, Union
 from urllib.parse import parse_qs, urlparse
 
 from .registry import ContainerInfo, ContainerRegistry, TaskInfo, TaskRegistry
@@ -27,24 +27,85 @@ except ImportError:
     create_app = None
 
 
-class MonitoringRequestHandler(BaseHTTPRequestHandler):
-    """HTTP request handler for monitoring endpoints."""
+def _tail_offset(f, size: int, lines: int, block_size: int = 8192) -> int:
+    """Find the byte offset where the last ``lines`` lines of a file begin.
+
+    Reads backwards from the end in doubling blocks until enough newlines
+    have been seen, like ``tail -n``, so the cost is bounded by the size of
+    the tail rather than the file. A non-positive count selects the whole
+    file.
+    """
+    if lines <= 0:
+        return 0
+
+    block = block_size
+    while True:
+        offset = max(size - block, 0)
+        f.seek(offset)
+        data = f.read(size - offset)
+
+        # A newline terminating the final line does not start a new one
+        pos = len(data) - 1 if data.endswith(b"\n") else len(data)
+        for _ in range(lines):
+            pos = data.rfind(b"\n", 0, pos)
+            if pos == -1:
+                break
+        else:
+            return offset + pos + 1
+
+        if offset == 0:
+            return 0
+        block *= 2
+
+
+class FileBody:
+    """Byte range of an open file used as a response body.
+
+    Lets the HTTP handler stream the range with os.sendfile() while
+    in-process callers can simply read() it. The caller owns the file and
+    must close() it.
+    """
+
+    def __init__(self, file: BinaryIO, offset: int, count: int):
+        self.file = file
+        self.offset = offset
+        self.count = count
+
+    def read(self) -> bytes:
+        """Read the whole range into memory."""
+        self.file.seek(self.offset)
+        return self.file.read(self.count)
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> "FileBody":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# (status code, headers, body) produced by MonitoringAPI.route()
+Response = Tuple[int, Dict[str, str], Union[bytes, FileBody]]
+
+
+class MonitoringAPI:
+    """Routes monitoring API requests, independent of the HTTP transport.
+
+    MonitoringRequestHandler writes the responses to its socket; tests and
+    other in-process callers can call route() directly.
+    """
 
     def __init__(
         self,
-        request,
-        client_address,
-        server,
         worker_id: str,
         container_registry: ContainerRegistry,
         task_registry: TaskRegistry,
     ):
-        """Initialize request handler.
+        """Initialize API router.
 
         Args:
-            request: Socket request
-            client_address: Client address
-            server: HTTP server instance
             worker_id: Worker identifier
             container_registry: Container registry instance
             task_registry: Task registry instance
@@ -52,49 +113,45 @@ class MonitoringRequestHandler(BaseHTTPRequestHandler):
         self.worker_id = worker_id
         self.container_registry = container_registry
         self.task_registry = task_registry
-        self.server_start_time = time.time()
-        super().__init__(request, client_address, server)
+        self.start_time = time.time()
+        # Serialized list bodies keyed by path, as (registry epoch, body)
+        self._body_cache: Dict[str, Tuple[int, bytes]] = {}
 
-    def log_message(self, format, *args):
-        """Override to use our logger."""
-        logger.debug("%s - %s", self.address_string(), format % args)
+    def route(self, method: str, path: str, query: str = "") -> Optional[Response]:
+        """Dispatch an API request.
 
-    def do_GET(self):
-        """Handle GET requests."""
-        try:
-            parsed_path = urlparse(self.path)
-            path = parsed_path.path
-
-            # Route API requests to existing handlers
-            if path == "/api/v1/status":
-                self._handle_status()
-            elif path == "/api/v1/containers":
-                self._handle_list_containers()
-            elif path.startswith("/api/v1/containers/"):
-                container_id = path.split("/")[-1]
-                self._handle_container_details(container_id)
-            elif path == "/api/v1/tasks":
-                self._handle_list_tasks()
-            elif path.startswith("/api/v1/tasks/"):
-                parts = path.split("/")
-                if len(parts) >= 5 and parts[-1] == "logs":
-                    task_id = int(parts[-2])
-                    self._handle_task_logs(task_id, parsed_path.query)
-                else:
-                    task_id = int(parts[-1])
-                    self._handle_task_details(task_id)
-            else:
-                # Non-API routes: delegate to Flask (if available)
-                if FLASK_AVAILABLE and self.server.flask_app:
-                    self._handle_flask_request()
-                else:
-                    self._send_error(404, "Not Found", "Unknown endpoint")
+        Args:
+            method: HTTP method
+            path: Request path, without query string
+            query: Raw query string
 
-        except Exception as exc:
-            logger.error("Error handling request: %s", exc, exc_info=True)
-            self._send_error(500, "Internal Server Error", str(exc))
+        Returns:
+            (status, headers, body) tuple, or None if the path is not an
+            API endpoint
+        """
+        if method != "GET":
+            return None
+
+        if path == "/api/v1/status":
+            return self._handle_status()
+        elif path == "/api/v1/containers":
+            return self._handle_list_containers()
+        elif path.startswith("/api/v1/containers/"):
+            container_id = path.split("/")[-1]
+            return self._handle_container_details(container_id)
+        elif path == "/api/v1/tasks":
+            return self._handle_list_tasks()
+        elif path.startswith("/api/v1/tasks/"):
+            parts = path.split("/")
+            if len(parts) >= 5 and parts[-1] == "logs":
+                task_id = int(parts[-2])
+                return self._handle_task_logs(task_id, query)
+            else:
+                task_id = int(parts[-1])
+                return self._handle_task_details(task_id)
+        return None
 
-    def _handle_status(self):
+    def _handle_status(self) -> Response:
         """Handle GET /api/v1/status."""
         # Cleanup old entries periodically
         self.container_registry.cleanup_old_entries()
@@ -131,7 +188,7 @@ class MonitoringRequestHandler(BaseHTTPRequestHandler):
 
         status_data = {
             "worker_id": self.worker_id,
-            "uptime_seconds": int(time.time() - self.server_start_time),
+            "uptime_seconds": int(time.time() - self.start_time),
             "status": "healthy" if podman_health["status"] == "healthy" else "degraded",
             "podman": podman_health,
             "capacity": capacity_value,
@@ -141,10 +198,23 @@ class MonitoringRequestHandler(BaseHTTPRequestHandler):
             "last_task_time": last_task_time,
         }
 
-        self._send_json(200, status_data)
+        return _json_response(200, status_data)
 
-    def _handle_list_containers(self):
+    def _cached_body(self, path: str, epoch: int) -> Optional[bytes]:
+        """Return the cached body for path if the registry is unchanged."""
+        cached = self._body_cache.get(path)
+        if cached is not None and cached[0] == epoch:
+            return cached[1]
+        return None
+
+    def _handle_list_containers(self) -> Response:
         """Handle GET /api/v1/containers."""
+        path = "/api/v1/containers"
+        epoch = self.container_registry.epoch
+        body = self._cached_body(path, epoch)
+        if body is not None:
+            return 200, dict(_JSON_HEADERS), body
+
         containers = self.container_registry.list_containers(active_only=True)
 
         containers_data = []
@@ -160,14 +230,15 @@ class MonitoringRequestHandler(BaseHTTPRequestHandler):
                 }
             )
 
-        self._send_json(200, {"containers": containers_data, "total": len(containers_data)})
+        response = _json_response(200, {"containers": containers_data, "total": len(containers_data)})
+        self._body_cache[path] = (epoch, response[2])
+        return response
 
-    def _handle_container_details(self, container_id: str):
+    def _handle_container_details(self, container_id: str) -> Response:
         """Handle GET /api/v1/containers/<id>."""
         container = self.container_registry.get(container_id)
         if not container:
-            self._send_error(404, "Not Found", f"Container not found: {container_id}")
-            return
+            return _error_response(404, "Not Found", f"Container not found: {container_id}")
 
         # Extract spec details
         spec = container.spec
@@ -205,10 +276,16 @@ class MonitoringRequestHandler(BaseHTTPRequestHandler):
             "finished_at": container.finished_at.isoformat() if container.finished_at else None,
         }
 
-        self._send_json(200, container_data)
+        return _json_response(200, container_data)
 
-    def _handle_list_tasks(self):
+    def _handle_list_tasks(self) -> Response:
         """Handle GET /api/v1/tasks."""
+        path = "/api/v1/tasks"
+        epoch = self.task_registry.epoch
+        body = self._cached_body(path, epoch)
+        if body is not None:
+            return 200, dict(_JSON_HEADERS), body
+
         tasks = self.task_registry.list_tasks(active_only=True)
 
         tasks_data = []
@@ -225,14 +302,15 @@ class MonitoringRequestHandler(BaseHTTPRequestHandler):
                 }
             )
 
-        self._send_json(200, {"tasks": tasks_data, "total": len(tasks_data)})
+        response = _json_response(200, {"tasks": tasks_data, "total": len(tasks_data)})
+        self._body_cache[path] = (epoch, response[2])
+        return response
 
-    def _handle_task_details(self, task_id: int):
+    def _handle_task_details(self, task_id: int) -> Response:
         """Handle GET /api/v1/tasks/<id>."""
         task = self.task_registry.get(task_id)
         if not task:
-            self._send_error(404, "Not Found", f"Task not found: {task_id}")
-            return
+            return _error_response(404, "Not Found", f"Task not found: {task_id}")
 
         task_data = {
             "task_id": task.task_id,
@@ -248,14 +326,13 @@ class MonitoringRequestHandler(BaseHTTPRequestHandler):
             "progress": task.progress,
         }
 
-        self._send_json(200, task_data)
+        return _json_response(200, task_data)
 
-    def _handle_task_logs(self, task_id: int, query_string: str):
+    def _handle_task_logs(self, task_id: int, query_string: str) -> Response:
         """Handle GET /api/v1/tasks/<id>/logs."""
         task = self.task_registry.get(task_id)
         if not task:
-            self._send_error(404, "Not Found", f"Task not found: {task_id}")
-            return
+            return _error_response(404, "Not Found", f"Task not found: {task_id}")
 
         # Parse query parameters
         params = parse_qs(query_string)
@@ -264,8 +341,7 @@ class MonitoringRequestHandler(BaseHTTPRequestHandler):
         # Get log path
         log_path = task.log_path
         if not log_path:
-            self._send_error(404, "Not Found", f"Log path not available for task {task_id}")
-            return
+            return _error_response(404, "Not Found", f"Log path not available for task {task_id}")
 
         # Convert log_path to absolute if needed
         log_file = Path(log_path)
@@ -274,27 +350,28 @@ class MonitoringRequestHandler(BaseHTTPRequestHandler):
             log_file = Path("/mnt/koji") / log_path.lstrip("/")
 
         if not log_file.exists():
-            self._send_error(404, "Not Found", f"Log file not found: {log_path}")
-            return
+            return _error_response(404, "Not Found", f"Log file not found: {log_path}")
 
-        # Read log file (last N lines)
+        # Locate the last N lines
         try:
-            with open(log_file, "rb") as f:
-                lines = f.readlines()
-                if len(lines) > tail_lines:
-                    lines = lines[-tail_lines:]
-                log_content = b"".join(lines)
-
-            self.send_response(200)
-            self.send_header("Content-Type", "text/plain; charset=utf-8")
-            self.send_header("Content-Length", str(len(log_content)))
-            self.send_header("Access-Control-Allow-Origin", "*")
-            self.end_headers()
-            self.wfile.write(log_content)
+            f = open(log_file, "rb")
+        except Exception as exc:
+            logger.error("Error reading log file: %s", exc, exc_info=True)
+            return _error_response(500, "Internal Server Error", f"Failed to read log file: {exc}")
 
+        try:
+            size = os.fstat(f.fileno()).st_size
+            start = _tail_offset(f, size, tail_lines)
         except Exception as exc:
+            f.close()
             logger.error("Error reading log file: %s", exc, exc_info=True)
-            self._send_error(500, "Internal Server Error", f"Failed to read log file: {exc}")
+            return _error_response(500, "Internal Server Error", f"Failed to read log file: {exc}")
+
+        headers = {
+            "Content-Type": "text/plain; charset=utf-8",
+            "Access-Control-Allow-Origin": "*",
+        }
+        return 200, headers, FileBody(f, start, size - start)
 
     def _check_podman_health(self) -> dict:
         """Check Podman connectivity health.
@@ -316,20 +393,108 @@ class MonitoringRequestHandler(BaseHTTPRequestHandler):
                 "error": str(exc),
             }
 
-    def _send_json(self, status_code: int, data: dict):
-        """Send JSON response."""
-        json_data = json.dumps(data, indent=2).encode("utf-8")
+
+_JSON_HEADERS = {
+    "Content-Type": "application/json; charset=utf-8",
+    "Access-Control-Allow-Origin": "*",
+}
+
+
+def _json_response(status_code: int, data: dict) -> Response:
+    """Build a JSON response."""
+    json_data = json.dumps(data, indent=2).encode("utf-8")
+    return status_code, dict(_JSON_HEADERS), json_data
+
+
+def _error_response(status_code: int, error: str, message: str) -> Response:
+    """Build an error JSON response."""
+    error_data = {"error": error, "error_code": error.upper().replace(" ", "_"), "message": message}
+    return _json_response(status_code, error_data)
+
+
+class MonitoringRequestHandler(BaseHTTPRequestHandler):
+    """HTTP request handler for monitoring endpoints.
+
+    API routing is delegated to the server's MonitoringAPI; anything it
+    does not recognize goes to the Flask web UI when available.
+    """
+
+    def log_message(self, format, *args):
+        """Override to use our logger."""
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        """Handle GET requests."""
+        try:
+            parsed_path = urlparse(self.path)
+
+            response = self.server.api.route("GET", parsed_path.path, parsed_path.query)
+            if response is not None:
+                self._send_response(*response)
+            # Non-API routes: delegate to Flask (if available)
+            elif FLASK_AVAILABLE and self.server.flask_app:
+                self._handle_flask_request()
+            else:
+                self._send_error(404, "Not Found", "Unknown endpoint")
+
+        except Exception as exc:
+            logger.error("Error handling request: %s", exc, exc_info=True)
+            self._send_error(500, "Internal Server Error", str(exc))
+
+    def _send_response(self, status_code: int, headers: Dict[str, str], body: Union[bytes, FileBody]):
+        """Write a routed response to the client.
+
+        A FileBody is closed even if the client goes away while the
+        headers are written.
+        """
+        if isinstance(body, FileBody):
+            with body:
+                self._send_headers(status_code, headers, body.count)
+                self._send_file(body.file, body.offset, body.count)
+        else:
+            self._send_headers(status_code, headers, len(body))
+            self.wfile.write(body)
+
+    def _send_headers(self, status_code: int, headers: Dict[str, str], length: int):
+        """Write the status line and headers, including Content-Length."""
         self.send_response(status_code)
-        self.send_header("Content-Type", "application/json; charset=utf-8")
-        self.send_header("Content-Length", str(len(json_data)))
-        self.send_header("Access-Control-Allow-Origin", "*")
+        for header, value in headers.items():
+            self.send_header(header, value)
+        self.send_header("Content-Length", str(length))
         self.end_headers()
-        self.wfile.write(json_data)
+
+    def _send_file(self, f, offset: int, count: int):
+        """Send a byte range of an open file as the response body.
+
+        Uses os.sendfile() so the kernel copies straight from the page cache
+        to the socket, falling back to a read/write loop where that is not
+        supported.
+        """
+        self.wfile.flush()
+        try:
+            out_fd = self.wfile.fileno()
+            while count > 0:
+                sent = os.sendfile(out_fd, f.fileno(), offset, count)
+                if sent == 0:
+                    # File shrank underneath us
+                    return
+                offset += sent
+                count -= sent
+            return
+        except (AttributeError, OSError, ValueError) as exc:
+            logger.debug("sendfile unavailable, copying log via userspace: %s", exc)
+
+        f.seek(offset)
+        while count > 0:
+            chunk = f.read(min(count, 65536))
+            if not chunk:
+                return
+            self.wfile.write(chunk)
+            count -= len(chunk)
 
     def _send_error(self, status_code: int, error: str, message: str):
         """Send error JSON response."""
-        error_data = {"error": error, "error_code": error.upper().replace(" ", "_"), "message": message}
-        self._send_json(status_code, error_data)
+        self._send_response(*_error_response(status_code, error, message))
 
     def _handle_flask_request(self):
         """Handle request via Flask WSGI application."""
@@ -405,6 +570,11 @@ class MonitoringRequestHandler(BaseHTTPRequestHandler):
 class MonitoringServer(ThreadingHTTPServer):
     """HTTP server for monitoring endpoints."""
 
+    # Rebind immediately after restart, and never let in-flight handler
+    # threads hold up shutdown
+    allow_reuse_address = True
+    daemon_threads = True
+
     def __init__(
         self,
         bind_address: str,
@@ -427,6 +597,7 @@ class MonitoringServer(ThreadingHTTPServer):
         self.worker_id = worker_id
         self.container_registry = container_registry
         self.task_registry = task_registry
+        self.api = MonitoringAPI(worker_id, container_registry, task_registry)
 
         # Create Flask app if available
         self.flask_app = None
@@ -438,21 +609,7 @@ class MonitoringServer(ThreadingHTTPServer):
 
         # Create server socket
         server_address = (bind_address, port)
-
-        def handler_factory(request, client_address, server):
-            return MonitoringRequestHandler(
-                request,
-                client_address,
-                server,
-                worker_id=worker_id,
-                container_registry=container_registry,
-                task_registry=task_registry,
-            )
-
-        super().__init__(server_address, handler_factory)
-
-        # Set socket options for reuse
-        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        super().__init__(server_address, MonitoringRequestHandler)
 
         # If port was 0, get the actual assigned port
         if port == 0:
@@ -4,6 +4,6 @@ This module provides PolicyResolver for resolving container images
 based on hub-configured policies (ADR 0003).
 """
 
-from .resolver import PolicyResolver
+from .resolver import HubSession, PolicyResolver
 
-__all__ = ["PolicyResolver"]
+__all__ = ["HubSession", "PolicyResolver"]
@@ -7,27 +7,138 @@ from __future__ import annotations
 
 import json
 import logging
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Protocol, Tuple
 
 from .. import config as adj_config
 
+try:
+    # orjson parses the small policy documents noticeably faster
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Where a cached policy came from; each source has its own cache TTL
+POLICY_SOURCE_TAG = "tag"
+POLICY_SOURCE_BUILD_CONFIG = "build_config"
+POLICY_SOURCE_MISS = "miss"
+
+# Rule fields each indexed rule type matches on
+_RULE_KEY_FIELDS = {
+    "tag_arch": ("tag", "arch"),
+    "tag": ("tag",),
+    "task_type": ("task_type",),
+}
+
+
+class HubSession(Protocol):
+    """The part of a koji ClientSession that policy resolution uses.
+
+    Sessions that also provide koji's ``multicall()`` have both lookups
+    sent to the hub in a single round trip.
+    """
+
+    def getTag(
+        self, tag: Any, event: Optional[int] = None, strict: bool = False
+    ) -> Optional[Dict[str, Any]]:  # pragma: no cover - protocol
+        ...
+
+    def getBuildConfig(
+        self, tag: Any, event: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:  # pragma: no cover - protocol
+        ...
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPolicy:
+    """Policy rules indexed by the fields each rule type matches on.
+
+    Built once per fetched policy so that resolution is a few dict lookups
+    in precedence order instead of a scan over the rule list. Where several
+    rules of one type match the same key, the first one wins.
+    """
+
+    by_tag_arch: Dict[Tuple[str, str], str]
+    by_tag: Dict[str, str]
+    by_task_type: Dict[str, str]
+    default: Optional[str]
+
+    @classmethod
+    def from_policy(cls, policy: Dict[str, Any]) -> "CompiledPolicy":
+        """Index the rules of a policy dict.
+
+        Args:
+            policy: Policy dict with "rules" key
+
+        Returns:
+            CompiledPolicy; empty if the rules are malformed
+        """
+        by_tag_arch: Dict[Tuple[str, str], str] = {}
+        by_tag: Dict[str, str] = {}
+        by_task_type: Dict[str, str] = {}
+        default_image = None
+
+        rules = policy.get("rules", [])
+        if not isinstance(rules, list):
+            logger.error("Policy rules must be a list")
+            rules = []
+
+        for rule in rules:
+            if not isinstance(rule, dict):
+                logger.warning("Invalid rule format (not a dict): %s", rule)
+                continue
+
+            image = rule.get("image")
+            rule_type = rule.get("type")
+            if rule_type == "default":
+                # Later default rules override earlier ones
+                default_image = image
+                continue
+            fields = _RULE_KEY_FIELDS.get(rule_type) if isinstance(rule_type, str) else None
+            if not image or fields is None:
+                continue
 
-@dataclass
+            key = tuple(rule.get(name) for name in fields)
+            if not all(isinstance(value, str) for value in key):
+                logger.warning("Invalid rule format (match fields not strings): %s", rule)
+                continue
+
+            if rule_type == "tag_arch":
+                by_tag_arch.setdefault(key, image)
+            elif rule_type == "tag":
+                by_tag.setdefault(key[0], image)
+            else:
+                by_task_type.setdefault(key[0], image)
+
+        return cls(by_tag_arch, by_tag, by_task_type, default_image)
+
+
+@dataclass(slots=True)
 class CachedPolicy:
-    """Cached policy with TTL tracking."""
+    """Cached policy with TTL tracking.
+
+    ``cached_at`` is a ``time.monotonic()`` timestamp, so expiry is immune
+    to wall-clock changes. ``source`` records where the policy was found;
+    a ``POLICY_SOURCE_MISS`` entry records that the hub had no policy.
+    """
 
     policy: Dict[str, Any]
-    cached_at: datetime
     ttl_seconds: int
+    cached_at: float = field(default_factory=time.monotonic)
+    fingerprint: Optional[int] = None
+    source: str = POLICY_SOURCE_TAG
+    compiled: CompiledPolicy = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.compiled = CompiledPolicy.from_policy(self.policy)
 
     def is_valid(self) -> bool:
         """Check if cache entry is still valid."""
-        age = (datetime.now() - self.cached_at).total_seconds()
-        return age < self.ttl_seconds
+        return time.monotonic() - self.cached_at < self.ttl_seconds
 
 
 class PolicyResolver:
@@ -48,17 +159,24 @@ class PolicyResolver:
         )
     """
 
-    def __init__(self, session: Any, config: Optional[Dict[str, Any]] = None):
+    def __init__(self, session: HubSession, config: Optional[Dict[str, Any]] = None):
         """Initialize PolicyResolver.
 
         Args:
-            session: Koji ClientSession instance (must have getTag, getBuildConfig methods)
+            session: Koji ClientSession, or anything providing HubSession
             config: Optional config dict (uses adj_config module if None)
         """
         self.session = session
         self.config = config
-        self._cache: Dict[tuple[str, str], CachedPolicy] = {}
+        # Policies live in tag extra data, so one entry serves every arch
+        self._cache: Dict[str, CachedPolicy] = {}
         self._ttl_seconds = adj_config.adjutant_policy_cache_ttl()
+        # Per-source TTL overrides; None falls back to _ttl_seconds
+        self._ttl_by_source: Dict[str, Optional[int]] = {
+            POLICY_SOURCE_TAG: adj_config.adjutant_policy_cache_ttl_tag(),
+            POLICY_SOURCE_BUILD_CONFIG: adj_config.adjutant_policy_cache_ttl_build_config(),
+            POLICY_SOURCE_MISS: adj_config.adjutant_policy_cache_ttl_miss(),
+        }
         self._policy_enabled = adj_config.adjutant_policy_enabled()
 
     def resolve_image(
@@ -71,10 +189,11 @@ class PolicyResolver:
         """Resolve container image from hub policy or config fallback.
 
         Evaluation order:
-        1. Check cache (by tag+arch key)
+        1. Check cache (by tag)
         2. Query hub for policy (if enabled)
         3. Evaluate rules in precedence order
-        4. Cache result (if from hub)
+        4. Cache result (if from hub), or reuse an expired entry if the hub
+           is unavailable
         5. Fallback to config default if no match
 
         Args:
@@ -86,16 +205,29 @@ class PolicyResolver:
         Returns:
             Container image reference (e.g., "registry/image:tag")
         """
+        # The same few tags, arches and task types recur across tasks;
+        # interned strings hash and compare faster as cache and rule keys
+        tag_name = sys.intern(tag_name)
+        arch = sys.intern(arch)
+        task_type = sys.intern(task_type)
+
         # Check cache first
-        cache_key = (tag_name, arch)
-        cached = self._get_cached_policy(cache_key)
+        cached = self._get_cached_policy(tag_name)
         if cached:
             logger.debug(
                 "Using cached policy for tag=%s arch=%s", tag_name, arch
             )
-            image = self._evaluate_policy(cached.policy, tag_name, arch, task_type)
+            image = self._evaluate_policy(cached.compiled, tag_name, arch, task_type)
             if image:
                 return image
+            # The cached policy (or recorded miss) is current for every arch
+            logger.debug(
+                "No cached rule for tag=%s arch=%s task_type=%s, using config default",
+                tag_name,
+                arch,
+                task_type,
+            )
+            return self._config_default()
 
         # If policy disabled, skip hub query
         if not self._policy_enabled:
@@ -103,12 +235,25 @@ class PolicyResolver:
             return self._config_default()
 
         # Query hub for policy
-        policy = self._fetch_policy(tag_name, event_id)
-        if policy:
-            # Cache the policy
-            self._cache_policy(cache_key, policy)
+        policy_data, source = self._fetch_policy_data(tag_name, event_id)
+        cached = None
+        if policy_data:
+            # Cache the policy, reusing the compiled rules if unchanged
+            cached = self._refresh_policy(tag_name, policy_data, source)
+        elif source == POLICY_SOURCE_MISS:
+            self._cache_policy(tag_name, {"rules": []}, source=POLICY_SOURCE_MISS)
+        else:
+            # Hub unavailable: a stale policy beats the config default
+            cached = self._cache.get(tag_name)
+            if cached:
+                logger.warning(
+                    "Hub unavailable, using expired cached policy for tag=%s arch=%s",
+                    tag_name,
+                    arch,
+                )
+        if cached:
             # Evaluate and return
-            image = self._evaluate_policy(policy, tag_name, arch, task_type)
+            image = self._evaluate_policy(cached.compiled, tag_name, arch, task_type)
             if image:
                 return image
             # Policy exists but no rule matched, use policy default if available
@@ -125,54 +270,150 @@ class PolicyResolver:
         )
         return self._config_default()
 
-    def _fetch_policy(
+    def _fetch_policy_data(
         self, tag_name: str, event_id: Optional[int] = None
-    ) -> Optional[Dict[str, Any]]:
-        """Fetch policy from hub (tag extra data → build config extra).
+    ) -> Tuple[Optional[Any], Optional[str]]:
+        """Fetch raw policy data from hub (tag extra data → build config extra).
 
         Args:
             tag_name: Build tag name
             event_id: Optional event ID
 
         Returns:
-            Policy dict or None if not found/unavailable
+            Tuple of policy data as stored on the hub (JSON string or dict)
+            and its source. If the hub has no policy, the data is None and
+            the source is POLICY_SOURCE_MISS; if the hub is unavailable,
+            both are None.
         """
         try:
-            # Try tag extra data first
-            tag_info = self.session.getTag(tag_name, event=event_id, strict=False)
-            if tag_info:
-                extra_data = tag_info.get("extra", {})
-                policy_json = extra_data.get("adjutant_image_policy")
-                if policy_json:
-                    if isinstance(policy_json, str):
-                        policy = json.loads(policy_json)
-                    else:
-                        policy = policy_json
-                    logger.debug("Found policy in tag extra data for tag=%s", tag_name)
-                    return self._extract_policy_dict(policy)
-
-            # Try build config extra data as fallback
-            build_config = self.session.getBuildConfig(tag_name, event=event_id)
-            if build_config:
-                extra_data = build_config.get("extra", {})
-                policy_json = extra_data.get("adjutant_image_policy")
-                if policy_json:
-                    if isinstance(policy_json, str):
-                        policy = json.loads(policy_json)
-                    else:
-                        policy = policy_json
-                    logger.debug(
-                        "Found policy in build config extra data for tag=%s", tag_name
-                    )
-                    return self._extract_policy_dict(policy)
+            lookups = self._policy_lookups(tag_name, event_id)
+            # Tag extra data takes precedence over build config extra data
+            for source, lookup in lookups:
+                info = lookup()
+                if info:
+                    policy_data = info.get("extra", {}).get("adjutant_image_policy")
+                    if policy_data:
+                        logger.debug(
+                            "Found policy in %s extra data for tag=%s", source, tag_name
+                        )
+                        return policy_data, source
 
         except Exception as exc:
             logger.warning(
                 "Failed to fetch policy from hub for tag=%s: %s", tag_name, exc
             )
             # Don't cache failures - allow retry on next task
+            return None, None
 
-        return None
+        return None, POLICY_SOURCE_MISS
+
+    def _policy_lookups(
+        self, tag_name: str, event_id: Optional[int] = None
+    ) -> Tuple[Tuple[str, Callable[[], Any]], ...]:
+        """Prepare the hub lookups that may hold a policy, in precedence order.
+
+        With a multicall-capable session both lookups are sent to the hub
+        in one round trip. Otherwise each is made when first called, so
+        the build config is only requested if the tag has no policy.
+
+        Args:
+            tag_name: Build tag name
+            event_id: Optional event ID
+
+        Returns:
+            Tuple of (source, lookup) pairs; each lookup returns the tag or
+            build config info, or raises the hub error
+        """
+        multicall = getattr(self.session, "multicall", None)
+        if callable(multicall):
+            with multicall(strict=False) as m:
+                tag_call = m.getTag(tag_name, event=event_id, strict=False)
+                build_config_call = m.getBuildConfig(tag_name, event=event_id)
+            return (
+                (POLICY_SOURCE_TAG, lambda: tag_call.result),
+                (POLICY_SOURCE_BUILD_CONFIG, lambda: build_config_call.result),
+            )
+
+        session = self.session
+        return (
+            (
+                POLICY_SOURCE_TAG,
+                lambda: session.getTag(tag_name, event=event_id, strict=False),
+            ),
+            (
+                POLICY_SOURCE_BUILD_CONFIG,
+                lambda: session.getBuildConfig(tag_name, event=event_id),
+            ),
+        )
+
+    @staticmethod
+    def _policy_fingerprint(policy_data: Any) -> int:
+        """Fingerprint raw policy data so unchanged policies can be detected.
+
+        Args:
+            policy_data: Policy data as returned by the hub
+
+        Returns:
+            Hash of the policy data
+        """
+        if isinstance(policy_data, str):
+            return hash(policy_data)
+        return hash(json.dumps(policy_data, sort_keys=True, default=str))
+
+    def _refresh_policy(
+        self, tag_name: str, policy_data: Any, source: str
+    ) -> CachedPolicy:
+        """Cache freshly fetched policy data, reusing an unchanged entry.
+
+        If the existing entry for this tag was built from identical policy
+        data, only its timestamp is renewed and its compiled rules are kept.
+        Invalid data is cached as an empty policy, so a broken policy is
+        not decoded again until it changes.
+
+        Args:
+            tag_name: Build tag name
+            policy_data: Policy data as returned by the hub
+            source: Where the policy data was found
+
+        Returns:
+            Cache entry for the policy
+        """
+        fingerprint = self._policy_fingerprint(policy_data)
+        cached = self._cache.get(tag_name)
+        if (
+            cached is not None
+            and cached.source == source
+            and cached.fingerprint == fingerprint
+        ):
+            cached.cached_at = time.monotonic()
+            logger.debug("Policy unchanged, renewed cache entry for tag=%s", tag_name)
+            return cached
+
+        policy = self._extract_policy_dict(policy_data)
+        if policy is None:
+            # Matches no rule, so resolution falls back to the config default
+            policy = {"rules": []}
+        return self._cache_policy(tag_name, policy, fingerprint, source)
+
+    def _decode_policy_extra(self, raw: Any) -> Optional[Any]:
+        """Decode a policy value as stored in hub extra data.
+
+        Policies are normally stored as JSON strings; values that are not
+        strings are assumed to be decoded already and returned unchanged.
+
+        Args:
+            raw: adjutant_image_policy value from tag or build config extra
+
+        Returns:
+            Decoded policy data, or None if the JSON is invalid
+        """
+        if not isinstance(raw, str):
+            return raw
+        try:
+            return _json_loads(raw)
+        except ValueError as exc:
+            logger.error("Invalid JSON in policy: %s", exc)
+            return None
 
     def _extract_policy_dict(self, policy_data: Any) -> Optional[Dict[str, Any]]:
         """Extract policy dict from various formats.
@@ -188,12 +429,9 @@ class PolicyResolver:
         Returns:
             Policy dict with "rules" key, or None if invalid
         """
-        if isinstance(policy_data, str):
-            try:
-                policy_data = json.loads(policy_data)
-            except json.JSONDecodeError as exc:
-                logger.error("Invalid JSON in policy: %s", exc)
-                return None
+        policy_data = self._decode_policy_extra(policy_data)
+        if policy_data is None:
+            return None
 
         if not isinstance(policy_data, dict):
             logger.error("Policy must be a dict, got %s", type(policy_data))
@@ -211,7 +449,7 @@ class PolicyResolver:
         return policy_data
 
     def _evaluate_policy(
-        self, policy: Dict[str, Any], tag_name: str, arch: str, task_type: str
+        self, compiled: CompiledPolicy, tag_name: str, arch: str, task_type: str
     ) -> Optional[str]:
         """Evaluate policy rules in precedence order.
 
@@ -222,7 +460,7 @@ class PolicyResolver:
         4. default: Fallback rule
 
         Args:
-            policy: Policy dict with "rules" key
+            compiled: Compiled policy rules
             tag_name: Build tag name
             arch: Architecture
             task_type: Task type
@@ -230,90 +468,85 @@ class PolicyResolver:
         Returns:
             Image string if match found, None otherwise
         """
-        rules = policy.get("rules", [])
-        if not isinstance(rules, list):
-            logger.error("Policy rules must be a list")
-            return None
+        image = compiled.by_tag_arch.get((tag_name, arch))
+        if image:
+            logger.debug(
+                "Matched tag_arch rule: tag=%s arch=%s -> %s", tag_name, arch, image
+            )
+            return image
 
-        default_image = None
+        image = compiled.by_tag.get(tag_name)
+        if image:
+            logger.debug("Matched tag rule: tag=%s -> %s", tag_name, image)
+            return image
 
-        for rule in rules:
-            if not isinstance(rule, dict):
-                logger.warning("Invalid rule format (not a dict): %s", rule)
-                continue
+        image = compiled.by_task_type.get(task_type)
+        if image:
+            logger.debug("Matched task_type rule: task_type=%s -> %s", task_type, image)
+            return image
 
-            rule_type = rule.get("type")
-            if rule_type == "tag_arch":
-                if rule.get("tag") == tag_name and rule.get("arch") == arch:
-                    image = rule.get("image")
-                    if image:
-                        logger.debug(
-                            "Matched tag_arch rule: tag=%s arch=%s -> %s",
-                            tag_name,
-                            arch,
-                            image,
-                        )
-                        return image
-            elif rule_type == "tag":
-                if rule.get("tag") == tag_name:
-                    image = rule.get("image")
-                    if image:
-                        logger.debug(
-                            "Matched tag rule: tag=%s -> %s", tag_name, image
-                        )
-                        return image
-            elif rule_type == "task_type":
-                if rule.get("task_type") == task_type:
-                    image = rule.get("image")
-                    if image:
-                        logger.debug(
-                            "Matched task_type rule: task_type=%s -> %s",
-                            task_type,
-                            image,
-                        )
-                        return image
-            elif rule_type == "default":
-                # Store default but continue checking for more specific matches
-                default_image = rule.get("image")
-                logger.debug("Found default rule: %s", default_image)
+        if compiled.default:
+            logger.debug("Using policy default image: %s", compiled.default)
+        return compiled.default
 
-        # Return default if found, otherwise None
-        if default_image:
-            logger.debug("Using policy default image: %s", default_image)
-        return default_image
-
-    def _cache_policy(self, cache_key: tuple[str, str], policy: Dict[str, Any]) -> None:
-        """Cache policy with TTL.
+    def _cache_policy(
+        self,
+        tag_name: str,
+        policy: Dict[str, Any],
+        fingerprint: Optional[int] = None,
+        source: str = POLICY_SOURCE_TAG,
+    ) -> CachedPolicy:
+        """Cache policy with the TTL for its source.
 
         Args:
-            cache_key: (tag_name, arch) tuple
+            tag_name: Build tag name
             policy: Policy dict to cache
+            fingerprint: Fingerprint of the raw policy data
+            source: Where the policy was found
+
+        Returns:
+            The new cache entry
         """
-        self._cache[cache_key] = CachedPolicy(
+        cached = self._cache[tag_name] = CachedPolicy(
             policy=policy,
-            cached_at=datetime.now(),
-            ttl_seconds=self._ttl_seconds,
+            ttl_seconds=self._ttl_for(source),
+            fingerprint=fingerprint,
+            source=source,
         )
-        logger.debug("Cached policy for key=%s", cache_key)
+        logger.debug("Cached policy for tag=%s", tag_name)
+        return cached
+
+    def _ttl_for(self, source: str) -> int:
+        """Get the cache TTL for policies from the given source.
+
+        Args:
+            source: Where the policy was found
+
+        Returns:
+            TTL in seconds
+        """
+        ttl = self._ttl_by_source.get(source)
+        return self._ttl_seconds if ttl is None else ttl
 
     def _get_cached_policy(
-        self, cache_key: tuple[str, str]
+        self, tag_name: str
     ) -> Optional[CachedPolicy]:
         """Get cached policy if valid.
 
+        Expired entries are left in place until the next hub fetch, which
+        renews them if the policy is unchanged.
+
         Args:
-            cache_key: (tag_name, arch) tuple
+            tag_name: Build tag name
 
         Returns:
             CachedPolicy if valid, None otherwise
         """
-        cached = self._cache.get(cache_key)
+        cached = self._cache.get(tag_name)
         if cached and cached.is_valid():
             return cached
-        # Remove expired entry
         if cached:
-            del self._cache[cache_key]
-            logger.debug("Cache entry expired for key=%s", cache_key)
+            logger.debug("Cache entry expired for tag=%s", tag_name)
         return None
 
     def _config_default(self) -> str:
@@ -323,25 +556,16 @@ class PolicyResolver:
     def invalidate_cache(self, tag_name: Optional[str] = None, arch: Optional[str] = None) -> None:
         """Invalidate cache entries.
 
+        Policies are cached per tag, so the tag's entry is dropped for
+        every arch.
+
         Args:
             tag_name: Optional tag name (if None, invalidates all)
-            arch: Optional architecture (if None, invalidates all for tag)
+            arch: Ignored; accepted for compatibility with per-arch callers
         """
         if tag_name is None:
             # Invalidate all
             self._cache.clear()
             logger.debug("Invalidated all cache entries")
-        elif arch is None:
-            # Invalidate all entries for this tag
-            keys_to_remove = [
-                key for key in self._cache.keys() if key[0] == tag_name
-            ]
-            for key in keys_to_remove:
-                del self._cache[key]
-            logger.debug("Invalidated cache entries for tag=%s", tag_name)
-        else:
-            # Invalidate specific entry
-            cache_key = (tag_name, arch)
-            if cache_key in self._cache:
-                del self._cache[cache_key]
-                logger.debug("Invalidated cache entry for tag=%s arch=%s", tag_name, arch)
+        elif self._cache.pop(tag_name, None) is not None:
+            logger.debug("Invalidated cache entry for tag=%s", tag_name)
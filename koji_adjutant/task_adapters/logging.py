@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
+from time import monotonic
 from typing import BinaryIO, Optional
 
 from .base import KojiLogSink
@@ -21,28 +22,42 @@ class FileKojiLogSink:
 
     Streams container stdout/stderr to a Koji logger instance and simultaneously
     persists all output to a log file for archival purposes.
+
+    By default the file is flushed after every write. With a non-zero
+    ``buffer_size`` writes are buffered and flushed at most every
+    ``flush_interval`` seconds, and on close.
     """
 
     def __init__(
         self,
         koji_logger: logging.Logger,
         log_file_path: Path,
+        buffer_size: int = 0,
+        flush_interval: float = 0.0,
     ) -> None:
         """Initialize KojiLogSink with logger and file destination.
 
         Args:
             koji_logger: Koji task logger instance (from self.logger in task handlers)
             log_file_path: Path to log file (e.g., `/mnt/koji/logs/<task_id>/container.log`)
+            buffer_size: File buffer size in bytes; 0 flushes after every write
+            flush_interval: Maximum seconds between flushes when buffering
         """
         self.koji_logger = koji_logger
         self.log_file_path = log_file_path
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
         self._file_handle: Optional[BinaryIO] = None
+        self._last_flush = monotonic()
 
         # Ensure log directory exists
         try:
             self.log_file_path.parent.mkdir(parents=True, exist_ok=True)
             # Open file in append mode (in case of multiple writes)
-            self._file_handle = open(self.log_file_path, "ab")
+            if buffer_size > 0:
+                self._file_handle = open(self.log_file_path, "ab", buffering=buffer_size)
+            else:
+                self._file_handle = open(self.log_file_path, "ab")
         except Exception as exc:
             # Log error but don't fail - logging to Koji is more important
             logger.warning(
@@ -72,14 +87,7 @@ class FileKojiLogSink:
             logger.warning("Error writing stdout to Koji logger: %s", exc)
 
         # Persist to file
-        if self._file_handle:
-            try:
-                self._file_handle.write(data)
-                self._file_handle.flush()
-            except Exception as exc:
-                logger.warning(
-                    "Error writing stdout to log file %s: %s", self.log_file_path, exc
-                )
+        self._write_file(data, "stdout")
 
     def write_stderr(self, data: bytes) -> None:
         """Write stderr data to both Koji logger and file.
@@ -101,14 +109,28 @@ class FileKojiLogSink:
             logger.warning("Error writing stderr to Koji logger: %s", exc)
 
         # Persist to file
-        if self._file_handle:
-            try:
-                self._file_handle.write(data)
+        self._write_file(data, "stderr")
+
+    def _write_file(self, data: bytes, stream: str) -> None:
+        """Append data to the log file, flushing per the buffering policy.
+
+        Args:
+            data: Bytes to persist
+            stream: Stream name, used in warnings
+        """
+        if not self._file_handle:
+            return
+
+        try:
+            self._file_handle.write(data)
+            now = monotonic()
+            if self.buffer_size <= 0 or now - self._last_flush >= self.flush_interval:
                 self._file_handle.flush()
-            except Exception as exc:
-                logger.warning(
-                    "Error writing stderr to log file %s: %s", self.log_file_path, exc
-                )
+                self._last_flush = now
+        except Exception as exc:
+            logger.warning(
+                "Error writing %s to log file %s: %s", stream, self.log_file_path, exc
+            )
 
     def close(self) -> None:
         """Close log file handle. Should be called when logging is complete."""
@@ -27,6 +27,9 @@ class GitHandler:
         r'^https?://gitlab\.com/',
     ]
     
+    # All of the above as one compiled alternation
+    _GIT_URL_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in GIT_URL_PATTERNS))
+    
     @staticmethod
     def is_scm_url(url: str) -> bool:
         """Check if URL is a git URL.
@@ -45,10 +48,7 @@ class GitHandler:
             >>> GitHandler.is_scm_url("svn://example.com/repo")
             False
         """
-        for pattern in GitHandler.GIT_URL_PATTERNS:
-            if re.match(pattern, url):
-                return True
-        return False
+        return GitHandler._GIT_URL_RE.match(url) is not None
     
     def __init__(self, url: str, options: Optional[Dict] = None):
         """Initialize git handler.
@@ -0,0 +1,132 @@
+"""PolicyResolver microbenchmarks: cold, warm and expired cache resolves.
+
+These guard the cache-hit path against regressions. They need
+pytest-benchmark and only run when KOJI_ADJUTANT_RUN_BENCH is set:
+
+    KOJI_ADJUTANT_RUN_BENCH=1 pytest tests/bench
+
+Timings depend on the host, so median limits are opt-in, in
+microseconds per resolve: KOJI_ADJUTANT_BENCH_COLD_MAX_US,
+KOJI_ADJUTANT_BENCH_WARM_MAX_US and KOJI_ADJUTANT_BENCH_EXPIRED_MAX_US.
+Without them the benchmarks only report, e.g. for comparison against a
+saved run with ``--benchmark-compare-fail``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from koji_adjutant.policy.resolver import PolicyResolver  # noqa: E402
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("KOJI_ADJUTANT_RUN_BENCH"),
+    reason="benchmarks run only when KOJI_ADJUTANT_RUN_BENCH is set",
+)
+
+
+def _median_limit(name):
+    """Median time per resolve allowed by KOJI_ADJUTANT_BENCH_<name>_MAX_US, in seconds.
+
+    The hub below answers without any round trip, so cold and expired
+    limits cover resolver overhead only.
+    """
+    value = os.environ.get(f"KOJI_ADJUTANT_BENCH_{name}_MAX_US")
+    return float(value) * 1e-6 if value else None
+
+
+WARM_MAX = _median_limit("WARM")
+COLD_MAX = _median_limit("COLD")
+EXPIRED_MAX = _median_limit("EXPIRED")
+
+POLICY = {
+    "rules": [
+        {
+            "type": "tag_arch",
+            "tag": "f39-build",
+            "arch": "x86_64",
+            "image": "registry/koji-adjutant-task:f39-x86_64",
+        },
+        {"type": "tag", "tag": "f39-build", "image": "registry/koji-adjutant-task:f39"},
+        {
+            "type": "task_type",
+            "task_type": "createrepo",
+            "image": "registry/koji-adjutant-task:repo",
+        },
+        {"type": "default", "image": "registry/koji-adjutant-task:default"},
+    ]
+}
+
+RESOLVE_ARGS = ("f39-build", "x86_64", "buildArch")
+EXPECTED_IMAGE = "registry/koji-adjutant-task:f39-x86_64"
+
+
+class InstantHub:
+    """Hub session answering policy lookups without delay."""
+
+    def __init__(self) -> None:
+        self.tag_info = {"extra": {"adjutant_image_policy": json.dumps(POLICY)}}
+
+    def getTag(self, tag_name, event=None, strict=False):
+        return self.tag_info
+
+    def getBuildConfig(self, tag_name, event=None):
+        return None
+
+
+@pytest.fixture
+def resolver():
+    """Create a PolicyResolver backed by an instant hub."""
+    return PolicyResolver(InstantHub())
+
+
+def assert_median_below(benchmark, limit):
+    """Check the benchmark median against a limit.
+
+    Skipped when no limit is configured or benchmarking is disabled.
+    """
+    if limit is None or benchmark.stats is None:
+        return
+    median = benchmark.stats.stats.median
+    assert median < limit, f"median {median * 1e6:.2f}us exceeds {limit * 1e6:.2f}us"
+
+
+@pytest.mark.benchmark(group="resolver")
+class TestResolverBench:
+    """Time resolve_image against empty, populated and expired caches."""
+
+    def test_cold_resolve(self, benchmark, resolver):
+        """Empty cache: one hub lookup, policy decode and compile."""
+        image = benchmark.pedantic(
+            resolver.resolve_image,
+            args=RESOLVE_ARGS,
+            setup=resolver.invalidate_cache,
+            rounds=1000,
+        )
+        assert image == EXPECTED_IMAGE
+        assert_median_below(benchmark, COLD_MAX)
+
+    def test_warm_resolve(self, benchmark, resolver):
+        """Cache hit: no hub traffic."""
+        resolver.resolve_image(*RESOLVE_ARGS)
+
+        image = benchmark.pedantic(
+            resolver.resolve_image, args=RESOLVE_ARGS, rounds=1000, iterations=100
+        )
+        assert image == EXPECTED_IMAGE
+        assert_median_below(benchmark, WARM_MAX)
+
+    def test_expired_resolve(self, benchmark, resolver):
+        """Expired entry: hub is asked again and the unchanged policy renewed."""
+        resolver._ttl_seconds = 0
+        resolver.resolve_image(*RESOLVE_ARGS)
+
+        image = benchmark.pedantic(
+            resolver.resolve_image, args=RESOLVE_ARGS, rounds=1000, iterations=100
+        )
+        assert image == EXPECTED_IMAGE
+        assert_median_below(benchmark, EXPIRED_MAX)
@@ -0,0 +1,46 @@
+"""Shared pytest configuration for the koji-adjutant test suite."""
+
+from __future__ import annotations
+
+import pytest
+
+from koji_adjutant import config as adj_config
+
+CONTAINER_SCOPES = ("session", "package", "module", "class", "function")
+
+
+def pytest_addoption(parser):
+    # Registered here rather than in tests/integration so that the option is
+    # known at startup however the tests are selected.
+    parser.addoption(
+        "--containers-scope",
+        choices=CONTAINER_SCOPES,
+        default="session",
+        help=(
+            "scope of the shared Podman fixtures in integration tests "
+            "(default: session); use 'function' to isolate each test"
+        ),
+    )
+
+
+class _EmptyKojidConf:
+    """Stand-in for the koji module that reads an empty kojid.conf."""
+
+    @staticmethod
+    def read_config_files(files=None):
+        return {}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _no_host_kojid_conf():
+    """Keep the suite from reading the host's /etc/kojid/kojid.conf.
+
+    Without a kojid options object, config falls back to parsing that
+    file, so on a koji builder its [adjutant] section would leak into
+    every test. Session scoped so that session fixtures are covered too;
+    tests that need file contents patch adj_config.koji themselves.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(adj_config, "koji", _EmptyKojidConf)
+        mp.setattr(adj_config, "_config", None)
+        yield
@@ -0,0 +1,143 @@
+"""Lightweight fakes for integration tests."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+# A canned hub response, or a callable mapping tag name to one
+Response = Union[None, dict, Callable[[str], Optional[dict]]]
+
+
+class FakeKojiSession:
+    """Stand-in for koji.ClientSession serving policy lookups.
+
+    Only getTag, getBuildConfig and multicall are provided. Each lookup
+    returns the configured response (``tag_info`` / ``build_config``),
+    raises ``error`` when set, and records its arguments so tests can
+    assert on hub traffic; ``multicall_calls`` records the method names of
+    each multicall batch. An optional ``latency`` in seconds simulates one
+    hub round trip per direct call or multicall batch.
+    """
+
+    __slots__ = (
+        "tag_info",
+        "build_config",
+        "error",
+        "latency",
+        "getTag_calls",
+        "getBuildConfig_calls",
+        "multicall_calls",
+    )
+
+    def __init__(
+        self,
+        tag_info: Response = None,
+        build_config: Response = None,
+        latency: float = 0.0,
+    ) -> None:
+        self.tag_info = tag_info
+        self.build_config = build_config
+        self.error: Optional[Exception] = None
+        self.latency = latency
+        self.getTag_calls: List[Tuple[Any, Any, bool]] = []
+        self.getBuildConfig_calls: List[Tuple[Any, Any]] = []
+        self.multicall_calls: List[Tuple[str, ...]] = []
+
+    def reset(self) -> None:
+        """Clear responses, error and recorded calls."""
+        self.tag_info = None
+        self.build_config = None
+        self.error = None
+        self.getTag_calls.clear()
+        self.getBuildConfig_calls.clear()
+        self.multicall_calls.clear()
+
+    def getTag(self, tag_name: Any, event: Any = None, strict: bool = False) -> Optional[dict]:
+        self._round_trip()
+        return self._getTag(tag_name, event=event, strict=strict)
+
+    def getBuildConfig(self, tag_name: Any, event: Any = None) -> Optional[dict]:
+        self._round_trip()
+        return self._getBuildConfig(tag_name, event=event)
+
+    def multicall(self, strict: bool = False) -> "FakeMultiCall":
+        return FakeMultiCall(self)
+
+    def _getTag(self, tag_name: Any, event: Any = None, strict: bool = False) -> Optional[dict]:
+        self.getTag_calls.append((tag_name, event, strict))
+        return self._respond(self.tag_info, tag_name)
+
+    def _getBuildConfig(self, tag_name: Any, event: Any = None) -> Optional[dict]:
+        self.getBuildConfig_calls.append((tag_name, event))
+        return self._respond(self.build_config, tag_name)
+
+    def _round_trip(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _respond(self, response: Response, tag_name: Any) -> Optional[dict]:
+        if self.error is not None:
+            raise self.error
+        if callable(response):
+            return response(tag_name)
+        return response
+
+
+class FakeCall:
+    """Result placeholder for a call queued in a FakeMultiCall."""
+
+    __slots__ = ("method", "args", "kwargs", "_value", "_error")
+
+    def __init__(self, method: str, args: tuple, kwargs: dict) -> None:
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self._value: Any = None
+        self._error: Optional[Exception] = None
+
+    @property
+    def result(self) -> Any:
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class FakeMultiCall:
+    """Non-strict multicall batch, evaluated when the context exits."""
+
+    __slots__ = ("_session", "_calls")
+
+    def __init__(self, session: FakeKojiSession) -> None:
+        self._session = session
+        self._calls: List[FakeCall] = []
+
+    def __enter__(self) -> "FakeMultiCall":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.call_all()
+
+    def getTag(self, *args: Any, **kwargs: Any) -> FakeCall:
+        return self._queue("getTag", args, kwargs)
+
+    def getBuildConfig(self, *args: Any, **kwargs: Any) -> FakeCall:
+        return self._queue("getBuildConfig", args, kwargs)
+
+    def call_all(self) -> None:
+        calls, self._calls = self._calls, []
+        if not calls:
+            return
+        session = self._session
+        session.multicall_calls.append(tuple(call.method for call in calls))
+        session._round_trip()
+        for call in calls:
+            try:
+                call._value = getattr(session, "_" + call.method)(*call.args, **call.kwargs)
+            except Exception as exc:
+                call._error = exc
+
+    def _queue(self, method: str, args: tuple, kwargs: dict) -> FakeCall:
+        call = FakeCall(method, args, kwargs)
+        self._calls.append(call)
+        return call
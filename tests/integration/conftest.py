@@ -0,0 +1,60 @@
+"""Shared fixtures for integration tests."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+try:
+    from podman import PodmanClient
+except Exception:
+    PodmanClient = None  # type: ignore[assignment,misc]
+
+from koji_adjutant.container.podman_manager import PodmanManager
+
+
+def containers_scope(fixture_name: str, config: pytest.Config) -> str:
+    """Return the scope chosen with --containers-scope for Podman fixtures."""
+    return config.getoption("--containers-scope")
+
+
+def _new_podman_manager() -> PodmanManager:
+    # Under pytest-xdist each worker labels its containers with its own id
+    return PodmanManager(
+        pull_always=False,  # Use if-not-present for tests
+        network_default=True,
+        worker_id=os.environ.get("PYTEST_XDIST_WORKER", "test-worker"),
+    )
+
+
+@pytest.fixture(scope="session")
+def podman_available():
+    """Check once per session that Podman answers; skip dependent tests if not."""
+    if PodmanClient is None:
+        pytest.skip("Podman Python API not available")
+
+    try:
+        with PodmanClient() as client:
+            # Only reachability matters; listing containers scales with the host
+            client.version()
+    except Exception as e:
+        pytest.skip(f"Podman not accessible: {e}")
+    return True
+
+
+@pytest.fixture(scope=containers_scope)
+def podman_manager():
+    """Create the PodmanManager used by tests.
+
+    Shared by the whole session by default; run with
+    ``--containers-scope=function`` to give each test its own manager when
+    chasing state leaking between tests.
+    """
+    return _new_podman_manager()
+
+
+@pytest.fixture(scope="session")
+def session_podman_manager():
+    """PodmanManager for session-wide setup such as pulling the test image."""
+    return _new_podman_manager()
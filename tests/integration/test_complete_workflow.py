@@ -14,6 +14,7 @@ from __future__ import annotations
 import logging
 import os
 from pathlib import Path
+from typing import Dict, Optional
 
 import pytest
 
@@ -30,8 +31,6 @@ from koji_adjutant.task_adapters.base import TaskContext
 from koji_adjutant.task_adapters.buildsrpm_scm import BuildSRPMFromSCMAdapter
 from koji_adjutant.task_adapters.rebuild_srpm import RebuildSRPMAdapter
 
-# Configure test logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Test image
@@ -44,24 +43,10 @@ requires_podman = pytest.mark.skipif(
 )
 
 
-@pytest.fixture(scope="module")
-def podman_available():
-    """Check if Podman is available and accessible."""
-    if not PODMAN_AVAILABLE:
-        pytest.skip("Podman Python API not available")
-
-    try:
-        client = PodmanClient()
-        client.containers.list(all=True)
-        return True
-    except Exception as e:
-        pytest.skip(f"Podman not accessible: {e}")
-
-
-@pytest.fixture
-def temp_koji_root(tmp_path):
-    """Create a temporary /mnt/koji-like directory structure."""
-    koji_root = tmp_path / "mnt" / "koji"
+@pytest.fixture(scope="session")
+def temp_koji_root(tmp_path_factory):
+    """Create a temporary /mnt/koji-like directory structure shared by all tests."""
+    koji_root = tmp_path_factory.mktemp("koji_root") / "mnt" / "koji"
     koji_root.mkdir(parents=True, exist_ok=True)
 
     (koji_root / "work").mkdir(exist_ok=True)
@@ -72,11 +57,11 @@ def temp_koji_root(tmp_path):
 
 
 @pytest.fixture
-def test_task_context_scm(temp_koji_root):
+def test_task_context_scm(temp_koji_root, tmp_path_factory):
     """Create a TaskContext for SCM build."""
     task_id = 77777
-    work_dir = temp_koji_root / "work" / str(task_id)
-    work_dir.mkdir(parents=True, exist_ok=True)
+    # A fresh work directory per test keeps writes isolated
+    work_dir = tmp_path_factory.mktemp(f"task_{task_id}")
 
     return TaskContext(
         task_id=task_id,
@@ -87,11 +72,11 @@ def test_task_context_scm(temp_koji_root):
 
 
 @pytest.fixture
-def test_task_context_rebuild(temp_koji_root):
+def test_task_context_rebuild(temp_koji_root, tmp_path_factory):
     """Create a TaskContext for rebuild."""
     task_id = 77778
-    work_dir = temp_koji_root / "work" / str(task_id)
-    work_dir.mkdir(parents=True, exist_ok=True)
+    # A fresh work directory per test keeps writes isolated
+    work_dir = tmp_path_factory.mktemp(f"task_{task_id}")
 
     return TaskContext(
         task_id=task_id,
@@ -101,23 +86,25 @@ def test_task_context_rebuild(temp_koji_root):
     )
 
 
-@pytest.fixture
-def podman_manager():
-    """Create a PodmanManager instance for testing."""
-    return PodmanManager(
-        pull_always=False,
-        network_default=True,
-        worker_id="test-worker",
-    )
+# Outcome of each image check this session: None if available, else skip reason
+_image_checks: Dict[str, Optional[str]] = {}
 
 
 def ensure_image_available(manager: PodmanManager, image: str) -> bool:
-    """Helper to ensure test image is available."""
-    try:
-        manager.ensure_image_available(image)
-        return True
-    except Exception as e:
-        pytest.skip(f"Test image not available: {e}")
+    """Helper to ensure test image is available.
+
+    Each image is checked once; later calls reuse the outcome.
+    """
+    if image not in _image_checks:
+        try:
+            manager.ensure_image_available(image)
+            _image_checks[image] = None
+        except Exception as e:
+            _image_checks[image] = f"Test image not available: {e}"
+    reason = _image_checks[image]
+    if reason is not None:
+        pytest.skip(reason)
+    return True
 
 
 @requires_podman
@@ -224,10 +211,8 @@ def test_workflow_adapter_compatibility(
     assert rebuild_spec.image is not None
     
     # Both should mount same koji root
-    scm_koji_mounts = [m for m in scm_spec.mounts if m.target == Path("/mnt/koji")]
-    rebuild_koji_mounts = [m for m in rebuild_spec.mounts if m.target == Path("/mnt/koji")]
-    assert len(scm_koji_mounts) > 0
-    assert len(rebuild_koji_mounts) > 0
+    assert any(m.target == Path("/mnt/koji") for m in scm_spec.mounts)
+    assert any(m.target == Path("/mnt/koji") for m in rebuild_spec.mounts)
     
     # Both should use exec pattern
     assert scm_spec.command == ["/bin/sleep", "infinity"]
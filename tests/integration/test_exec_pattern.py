@@ -2,54 +2,40 @@
 
 from __future__ import annotations
 
-import logging
-from pathlib import Path
+from contextlib import contextmanager
+from dataclasses import replace
 
 import pytest
 
-from koji_adjutant.container.interface import ContainerHandle, InMemoryLogSink
-from koji_adjutant.container.podman_manager import PodmanManager
+from koji_adjutant.container.interface import ContainerError, ContainerSpec, InMemoryLogSink
 
-logger = logging.getLogger(__name__)
+# Skip the whole module at collection time without the Podman Python API
+podman = pytest.importorskip("podman", reason="Podman Python API not available")
 
-# Test if podman is available
-try:
-    from podman import PodmanClient
-    PODMAN_AVAILABLE = True
-except Exception:
-    PodmanClient = None  # type: ignore[assignment]
-    PODMAN_AVAILABLE = False
+# Every test here drives a real container
+pytestmark = pytest.mark.requires_podman
 
 # Test image (should be available in test environment)
 TEST_IMAGE = "docker.io/almalinux/9-minimal:latest"
 
-# Marker for tests requiring podman
-requires_podman = pytest.mark.skipif(
-    not PODMAN_AVAILABLE,
-    reason="Podman Python API not available",
+# Idle container that tests drive through exec(); shared by every test
+SLEEP_SPEC = ContainerSpec(
+    image=TEST_IMAGE,
+    command=("/bin/sleep", "infinity"),
+    environment={},
+    remove_after_exit=True,
 )
 
 
-@pytest.fixture
-def podman_manager():
-    """Create PodmanManager instance for testing."""
-    return PodmanManager()
-
-
-@pytest.fixture
-def podman_available():
-    """Check if Podman is available and accessible."""
-    if not PODMAN_AVAILABLE:
-        pytest.skip("Podman Python API not available")
-
-    # Try to create a client and verify it works
+@contextmanager
+def running_container(manager, spec):
+    """Create and start a container, guaranteeing forced removal on exit."""
+    handle = manager.create(spec)
     try:
-        client = PodmanClient()
-        # Simple check: list containers (should not fail)
-        client.containers.list(all=True)
-        return True
-    except Exception as e:
-        pytest.skip(f"Podman not accessible: {e}")
+        manager.start(handle)
+        yield handle
+    finally:
+        manager.remove(handle, force=True)
 
 
 @pytest.fixture
@@ -62,27 +48,11 @@ def ensure_image_available(podman_manager, podman_available):
         pytest.skip(f"Could not ensure image availability: {exc}")
 
 
-@requires_podman
 def test_exec_basic_command(podman_manager, ensure_image_available, tmp_path):
     """Test basic exec() command execution in running container."""
     manager = podman_manager
-    sink = InMemoryLogSink()
-
-    from koji_adjutant.container.interface import ContainerSpec
-
-    # Create container with sleep
-    spec = ContainerSpec(
-        image=TEST_IMAGE,
-        command=["/bin/sleep", "infinity"],
-        environment={},
-        remove_after_exit=True,
-    )
-
-    handle = manager.create(spec)
-    manager.start(handle)
-    # Don't stream container logs for this test - we only care about exec output
 
-    try:
+    with running_container(manager, SLEEP_SPEC) as handle:
         # Execute a simple command with dedicated sink
         exec_sink = InMemoryLogSink()
         exit_code = manager.exec(handle, ["/bin/echo", "hello", "world"], exec_sink)
@@ -91,35 +61,17 @@ def test_exec_basic_command(podman_manager, ensure_image_available, tmp_path):
         output = exec_sink.stdout.decode("utf-8", errors="replace")
         assert "hello world" in output or "hello" in output
 
-    finally:
-        manager.remove(handle, force=True)
-
 
-@requires_podman
 def test_copy_to_basic(podman_manager, ensure_image_available, tmp_path):
     """Test copy_to() basic file copy."""
     manager = podman_manager
     sink = InMemoryLogSink()
 
-    from koji_adjutant.container.interface import ContainerSpec
-
     # Create test file
     test_file = tmp_path / "test.txt"
     test_file.write_text("test content\n")
 
-    # Create container with sleep
-    spec = ContainerSpec(
-        image=TEST_IMAGE,
-        command=["/bin/sleep", "infinity"],
-        environment={},
-        remove_after_exit=True,
-    )
-
-    handle = manager.create(spec)
-    manager.start(handle)
-    manager.stream_logs(handle, sink, follow=False)
-
-    try:
+    with running_container(manager, SLEEP_SPEC) as handle:
         # Copy file to container
         manager.copy_to(handle, test_file, "/tmp/test.txt")
 
@@ -130,18 +82,12 @@ def test_copy_to_basic(podman_manager, ensure_image_available, tmp_path):
         output = sink.stdout.decode("utf-8", errors="replace")
         assert "test content" in output
 
-    finally:
-        manager.remove(handle, force=True)
-
 
-@requires_podman
 def test_exec_pattern_full_flow(podman_manager, ensure_image_available, tmp_path):
     """Test full exec pattern flow: copy configs, exec init commands, exec build."""
     manager = podman_manager
     sink = InMemoryLogSink()
 
-    from koji_adjutant.container.interface import ContainerSpec
-
     # Create config files
     repo_file = tmp_path / "koji.repo"
     repo_file.write_text("[koji-repo]\nbaseurl=file:///mnt/koji/repos\nenabled=1\n")
@@ -150,21 +96,17 @@ def test_exec_pattern_full_flow(podman_manager, ensure_image_available, tmp_path
     macros_file.write_text("%dist .almalinux10\n%_topdir /work/12345\n")
 
     # Create container with sleep
-    spec = ContainerSpec(
-        image=TEST_IMAGE,
-        command=["/bin/sleep", "infinity"],
-        environment={"TEST_VAR": "test_value"},
-        remove_after_exit=True,
-    )
-
-    handle = manager.create(spec)
-    manager.start(handle)
-    manager.stream_logs(handle, sink, follow=False)
+    spec = replace(SLEEP_SPEC, environment={"TEST_VAR": "test_value"})
 
-    try:
+    with running_container(manager, spec) as handle:
         # Step 1: Copy config files
-        manager.copy_to(handle, repo_file, "/etc/yum.repos.d/koji.repo")
-        manager.copy_to(handle, macros_file, "/etc/rpm/macros.koji")
+        manager.copy_many(
+            handle,
+            [
+                (repo_file, "/etc/yum.repos.d/koji.repo"),
+                (macros_file, "/etc/rpm/macros.koji"),
+            ],
+        )
 
         # Step 2: Verify files exist
         exit_code = manager.exec(handle, ["/bin/test", "-f", "/etc/yum.repos.d/koji.repo"], sink)
@@ -196,30 +138,13 @@ def test_exec_pattern_full_flow(podman_manager, ensure_image_available, tmp_path
         output = sink.stdout.decode("utf-8", errors="replace")
         assert "modified_value" in output
 
-    finally:
-        manager.remove(handle, force=True)
-
 
-@requires_podman
 def test_exec_error_handling(podman_manager, ensure_image_available, tmp_path):
     """Test error handling in exec pattern."""
     manager = podman_manager
     sink = InMemoryLogSink()
 
-    from koji_adjutant.container.interface import ContainerSpec
-
-    spec = ContainerSpec(
-        image=TEST_IMAGE,
-        command=["/bin/sleep", "infinity"],
-        environment={},
-        remove_after_exit=True,
-    )
-
-    handle = manager.create(spec)
-    manager.start(handle)
-    manager.stream_logs(handle, sink, follow=False)
-
-    try:
+    with running_container(manager, SLEEP_SPEC) as handle:
         # Execute failing command
         exit_code = manager.exec(handle, ["/bin/false"], sink)
         assert exit_code != 0
@@ -228,30 +153,12 @@ def test_exec_error_handling(podman_manager, ensure_image_available, tmp_path):
         exit_code = manager.exec(handle, ["/nonexistent/command"], sink)
         assert exit_code != 0
 
-    finally:
-        manager.remove(handle, force=True)
-
 
-@requires_podman
 def test_copy_to_error_handling(podman_manager, ensure_image_available, tmp_path):
     """Test error handling in copy_to."""
     manager = podman_manager
-    sink = InMemoryLogSink()
-
-    from koji_adjutant.container.interface import ContainerError, ContainerSpec
-
-    spec = ContainerSpec(
-        image=TEST_IMAGE,
-        command=["/bin/sleep", "infinity"],
-        environment={},
-        remove_after_exit=True,
-    )
 
-    handle = manager.create(spec)
-    manager.start(handle)
-    manager.stream_logs(handle, sink, follow=False)
-
-    try:
+    with running_container(manager, SLEEP_SPEC) as handle:
         # Try to copy nonexistent file
         nonexistent = tmp_path / "nonexistent.txt"
         with pytest.raises(ContainerError):
@@ -262,6 +169,3 @@ def test_copy_to_error_handling(podman_manager, ensure_image_available, tmp_path
         test_dir.mkdir()
         with pytest.raises(ContainerError):
             manager.copy_to(handle, test_dir, "/tmp/testdir")
-
-    finally:
-        manager.remove(handle, force=True)
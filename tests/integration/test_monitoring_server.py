@@ -3,25 +3,52 @@
 from __future__ import annotations
 
 import json
-import socket
-import threading
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from http.client import HTTPConnection
-from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
 
 from koji_adjutant.monitoring.registry import ContainerRegistry, TaskRegistry
-from koji_adjutant.monitoring.server import MonitoringServer
+from koji_adjutant.monitoring.server import (
+    FileBody,
+    MonitoringAPI,
+    MonitoringRequestHandler,
+    MonitoringServer,
+)
+
+
+@pytest.fixture(scope="class")
+def sample_log(tmp_path_factory):
+    """Write a 100-line log file once for all log endpoint tests."""
+    log_file = tmp_path_factory.mktemp("logs") / "test.log"
+    log_file.write_text("\n".join(f"line {i}" for i in range(1, 101)))
+    return log_file
 
 
 class TestMonitoringServer:
-    """Test monitoring HTTP server endpoints."""
+    """Test monitoring HTTP server endpoints.
+
+    Endpoint behavior is checked in-process through MonitoringAPI.route();
+    only tests that depend on HTTP handling go over loopback.
+    """
+
+    @pytest.fixture
+    def api(self):
+        """Create API router backed by fresh registries."""
+        container_registry = ContainerRegistry()
+        task_registry = TaskRegistry()
+        api = MonitoringAPI(
+            worker_id="test-worker",
+            container_registry=container_registry,
+            task_registry=task_registry,
+        )
+        return api, container_registry, task_registry
 
     @pytest.fixture
     def server(self):
-        """Create and start test server."""
+        """Create test server; requests are served one at a time by fetch()."""
         container_registry = ContainerRegistry()
         task_registry = TaskRegistry()
         server = MonitoringServer(
@@ -31,62 +58,74 @@ class TestMonitoringServer:
             container_registry=container_registry,
             task_registry=task_registry,
         )
-
-        # Start server in background thread
-        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
-        server_thread.start()
-
-        # Give server time to start
-        time.sleep(0.2)
+        # Don't hang the suite if a client never connects
+        server.timeout = 5
 
         yield server, container_registry, task_registry
 
         # Cleanup
-        server.shutdown()
+        server.server_close()
 
-    def get_connection(self, server):
-        """Get HTTP connection to server."""
-        address, port = server.server_address
-        return HTTPConnection(address, port)
+    def fetch(self, server, path):
+        """Issue one GET over loopback and serve it on this thread.
 
-    def test_status_endpoint(self, server):
+        Returns the response and its fully read body.
+        """
+        address, port = server.server_address
+        conn = HTTPConnection(address, port)
+
+        def client():
+            conn.request("GET", path)
+            response = conn.getresponse()
+            return response, response.read()
+
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(client)
+                server.handle_request()
+                return future.result()
+        finally:
+            conn.close()
+
+    def get(self, api, path):
+        """Route a GET request in-process and return (status, headers, body bytes)."""
+        path, _, query = path.partition("?")
+        status, headers, body = api.route("GET", path, query)
+        if isinstance(body, FileBody):
+            with body:
+                body = body.read()
+        return status, headers, body
+
+    def test_status_endpoint(self, api):
         """Test GET /api/v1/status."""
-        server_instance, _, _ = server
-        conn = self.get_connection(server_instance)
+        api_instance, _, _ = api
 
-        conn.request("GET", "/api/v1/status")
-        response = conn.getresponse()
+        status, headers, body = self.get(api_instance, "/api/v1/status")
 
-        assert response.status == 200
-        assert response.getheader("Content-Type") == "application/json; charset=utf-8"
+        assert status == 200
+        assert headers["Content-Type"] == "application/json; charset=utf-8"
 
-        data = json.loads(response.read())
+        data = json.loads(body)
         assert data["worker_id"] == "test-worker"
         assert "uptime_seconds" in data
         assert data["status"] == "healthy"
         assert "active_tasks" in data
         assert "containers_active" in data
 
-        conn.close()
-
-    def test_list_containers_empty(self, server):
+    def test_list_containers_empty(self, api):
         """Test GET /api/v1/containers with no containers."""
-        server_instance, _, _ = server
-        conn = self.get_connection(server_instance)
+        api_instance, _, _ = api
 
-        conn.request("GET", "/api/v1/containers")
-        response = conn.getresponse()
+        status, _, body = self.get(api_instance, "/api/v1/containers")
 
-        assert response.status == 200
-        data = json.loads(response.read())
+        assert status == 200
+        data = json.loads(body)
         assert data["containers"] == []
         assert data["total"] == 0
 
-        conn.close()
-
-    def test_list_containers_with_data(self, server):
+    def test_list_containers_with_data(self, api):
         """Test GET /api/v1/containers with containers."""
-        server_instance, container_registry, _ = server
+        api_instance, container_registry, _ = api
 
         # Register test container
         container_registry.register(
@@ -97,22 +136,36 @@ class TestMonitoringServer:
             started_at=datetime.now(timezone.utc),
         )
 
-        conn = self.get_connection(server_instance)
-        conn.request("GET", "/api/v1/containers")
-        response = conn.getresponse()
+        status, _, body = self.get(api_instance, "/api/v1/containers")
 
-        assert response.status == 200
-        data = json.loads(response.read())
+        assert status == 200
+        data = json.loads(body)
         assert data["total"] == 1
         assert len(data["containers"]) == 1
         assert data["containers"][0]["container_id"] == "test-container-1"
         assert data["containers"][0]["task_id"] == 12345
 
-        conn.close()
+    def test_list_containers_cache_invalidated(self, api):
+        """Test cached list body is reused until the registry changes."""
+        api_instance, container_registry, _ = api
+
+        _, _, first = self.get(api_instance, "/api/v1/containers")
+        _, _, second = self.get(api_instance, "/api/v1/containers")
+        assert second is first
+
+        container_registry.register(
+            container_id="test-container-1",
+            task_id=12345,
+            image="test/image:latest",
+            spec={"image": "test/image:latest"},
+        )
+
+        _, _, third = self.get(api_instance, "/api/v1/containers")
+        assert json.loads(third)["total"] == 1
 
-    def test_container_details(self, server):
+    def test_container_details(self, api):
         """Test GET /api/v1/containers/<id>."""
-        server_instance, container_registry, _ = server
+        api_instance, container_registry, _ = api
 
         # Register test container
         container_registry.register(
@@ -124,51 +177,39 @@ class TestMonitoringServer:
             command=["/bin/sh"],
         )
 
-        conn = self.get_connection(server_instance)
-        conn.request("GET", "/api/v1/containers/test-container-1")
-        response = conn.getresponse()
+        status, _, body = self.get(api_instance, "/api/v1/containers/test-container-1")
 
-        assert response.status == 200
-        data = json.loads(response.read())
+        assert status == 200
+        data = json.loads(body)
         assert data["container_id"] == "test-container-1"
         assert data["task_id"] == 12345
         assert data["image"] == "test/image:latest"
         assert "mounts" in data
 
-        conn.close()
-
-    def test_container_details_not_found(self, server):
+    def test_container_details_not_found(self, api):
         """Test GET /api/v1/containers/<id> with non-existent container."""
-        server_instance, _, _ = server
-        conn = self.get_connection(server_instance)
+        api_instance, _, _ = api
 
-        conn.request("GET", "/api/v1/containers/nonexistent")
-        response = conn.getresponse()
+        status, _, body = self.get(api_instance, "/api/v1/containers/nonexistent")
 
-        assert response.status == 404
-        data = json.loads(response.read())
+        assert status == 404
+        data = json.loads(body)
         assert "error" in data
 
-        conn.close()
-
-    def test_list_tasks_empty(self, server):
+    def test_list_tasks_empty(self, api):
         """Test GET /api/v1/tasks with no tasks."""
-        server_instance, _, _ = server
-        conn = self.get_connection(server_instance)
+        api_instance, _, _ = api
 
-        conn.request("GET", "/api/v1/tasks")
-        response = conn.getresponse()
+        status, _, body = self.get(api_instance, "/api/v1/tasks")
 
-        assert response.status == 200
-        data = json.loads(response.read())
+        assert status == 200
+        data = json.loads(body)
         assert data["tasks"] == []
         assert data["total"] == 0
 
-        conn.close()
-
-    def test_list_tasks_with_data(self, server):
+    def test_list_tasks_with_data(self, api):
         """Test GET /api/v1/tasks with tasks."""
-        server_instance, _, task_registry = server
+        api_instance, _, task_registry = api
 
         # Register test task
         task_registry.register_task(
@@ -178,22 +219,18 @@ class TestMonitoringServer:
             tag="el10-build",
         )
 
-        conn = self.get_connection(server_instance)
-        conn.request("GET", "/api/v1/tasks")
-        response = conn.getresponse()
+        status, _, body = self.get(api_instance, "/api/v1/tasks")
 
-        assert response.status == 200
-        data = json.loads(response.read())
+        assert status == 200
+        data = json.loads(body)
         assert data["total"] == 1
         assert len(data["tasks"]) == 1
         assert data["tasks"][0]["task_id"] == 12345
         assert data["tasks"][0]["type"] == "buildArch"
 
-        conn.close()
-
-    def test_task_details(self, server):
+    def test_task_details(self, api):
         """Test GET /api/v1/tasks/<id>."""
-        server_instance, _, task_registry = server
+        api_instance, _, task_registry = api
 
         # Register test task
         task_registry.register_task(
@@ -206,12 +243,10 @@ class TestMonitoringServer:
             log_path="/mnt/koji/logs/12345/container.log",
         )
 
-        conn = self.get_connection(server_instance)
-        conn.request("GET", "/api/v1/tasks/12345")
-        response = conn.getresponse()
+        status, _, body = self.get(api_instance, "/api/v1/tasks/12345")
 
-        assert response.status == 200
-        data = json.loads(response.read())
+        assert status == 200
+        data = json.loads(body)
         assert data["task_id"] == 12345
         assert data["type"] == "buildArch"
         assert data["arch"] == "x86_64"
@@ -220,111 +255,107 @@ class TestMonitoringServer:
         assert data["container_id"] == "test-container-1"
         assert data["log_path"] == "/mnt/koji/logs/12345/container.log"
 
-        conn.close()
-
-    def test_task_details_not_found(self, server):
+    def test_task_details_not_found(self, api):
         """Test GET /api/v1/tasks/<id> with non-existent task."""
-        server_instance, _, _ = server
-        conn = self.get_connection(server_instance)
+        api_instance, _, _ = api
 
-        conn.request("GET", "/api/v1/tasks/99999")
-        response = conn.getresponse()
+        status, _, body = self.get(api_instance, "/api/v1/tasks/99999")
 
-        assert response.status == 404
-        data = json.loads(response.read())
+        assert status == 404
+        data = json.loads(body)
         assert "error" in data
 
-        conn.close()
-
-    def test_task_logs_endpoint(self, server, tmp_path):
+    def test_task_logs_endpoint(self, api, sample_log):
         """Test GET /api/v1/tasks/<id>/logs."""
-        server_instance, _, task_registry = server
-
-        # Create test log file
-        log_file = tmp_path / "test.log"
-        log_file.write_text("line 1\nline 2\nline 3\n")
+        api_instance, _, task_registry = api
 
         # Register test task with log path
         task_registry.register_task(
             task_id=12345,
             task_type="buildArch",
-            log_path=str(log_file),
+            log_path=str(sample_log),
         )
 
-        conn = self.get_connection(server_instance)
-        conn.request("GET", "/api/v1/tasks/12345/logs")
-        response = conn.getresponse()
+        status, headers, body = self.get(api_instance, "/api/v1/tasks/12345/logs")
 
-        assert response.status == 200
-        assert response.getheader("Content-Type") == "text/plain; charset=utf-8"
-        content = response.read().decode("utf-8")
+        assert status == 200
+        assert headers["Content-Type"] == "text/plain; charset=utf-8"
+        content = body.decode("utf-8")
         assert "line 1" in content
 
-        conn.close()
-
-    def test_task_logs_with_tail(self, server, tmp_path):
+    def test_task_logs_with_tail(self, api, sample_log):
         """Test GET /api/v1/tasks/<id>/logs?tail=2."""
-        server_instance, _, task_registry = server
-
-        # Create test log file with many lines
-        log_file = tmp_path / "test.log"
-        log_file.write_text("\n".join([f"line {i}" for i in range(1, 101)]))
+        api_instance, _, task_registry = api
 
         task_registry.register_task(
             task_id=12345,
             task_type="buildArch",
-            log_path=str(log_file),
+            log_path=str(sample_log),
         )
 
-        conn = self.get_connection(server_instance)
-        conn.request("GET", "/api/v1/tasks/12345/logs?tail=2")
-        response = conn.getresponse()
+        status, _, body = self.get(api_instance, "/api/v1/tasks/12345/logs?tail=2")
 
-        assert response.status == 200
-        content = response.read().decode("utf-8")
+        assert status == 200
+        content = body.decode("utf-8")
         lines = content.strip().split("\n")
         assert len(lines) == 2
         assert "line 99" in content
         assert "line 100" in content
 
-        conn.close()
+    def test_task_logs_tail_spans_blocks(self, server, tmp_path):
+        """Test tail reads back across several blocks of a larger log."""
+        server_instance, _, task_registry = server
 
-    def test_task_logs_not_found(self, server):
+        log_file = tmp_path / "test.log"
+        log_file.write_text("".join(f"line {i}\n" for i in range(1, 5001)))
+
+        task_registry.register_task(
+            task_id=12345,
+            task_type="buildArch",
+            log_path=str(log_file),
+        )
+
+        response, body = self.fetch(server_instance, "/api/v1/tasks/12345/logs?tail=2000")
+
+        assert response.status == 200
+        lines = body.decode("utf-8").splitlines()
+        assert len(lines) == 2000
+        assert lines[0] == "line 3001"
+        assert lines[-1] == "line 5000"
+
+    def test_task_logs_not_found(self, api):
         """Test GET /api/v1/tasks/<id>/logs with non-existent task."""
-        server_instance, _, _ = server
-        conn = self.get_connection(server_instance)
+        api_instance, _, _ = api
 
-        conn.request("GET", "/api/v1/tasks/99999/logs")
-        response = conn.getresponse()
+        status, _, body = self.get(api_instance, "/api/v1/tasks/99999/logs")
 
-        assert response.status == 404
-        data = json.loads(response.read())
+        assert status == 404
+        data = json.loads(body)
         assert "error" in data
 
-        conn.close()
+    def test_file_body_closed_when_client_gone(self, sample_log):
+        """Test a log file body is closed if writing the headers fails."""
+        body = FileBody(open(sample_log, "rb"), 0, 10)
+        handler = MonitoringRequestHandler.__new__(MonitoringRequestHandler)
+        handler.send_response = Mock(side_effect=BrokenPipeError)
+
+        with pytest.raises(BrokenPipeError):
+            handler._send_response(200, {}, body)
+
+        assert body.file.closed
 
     def test_cors_headers(self, server):
         """Test CORS headers are present."""
         server_instance, _, _ = server
-        conn = self.get_connection(server_instance)
-
-        conn.request("GET", "/api/v1/status")
-        response = conn.getresponse()
+        response, _ = self.fetch(server_instance, "/api/v1/status")
 
         assert response.getheader("Access-Control-Allow-Origin") == "*"
 
-        conn.close()
-
     def test_unknown_endpoint(self, server):
         """Test 404 for unknown endpoint."""
         server_instance, _, _ = server
-        conn = self.get_connection(server_instance)
-
-        conn.request("GET", "/api/v1/unknown")
-        response = conn.getresponse()
+        response, body = self.fetch(server_instance, "/api/v1/unknown")
 
         assert response.status == 404
-        data = json.loads(response.read())
+        data = json.loads(body)
         assert "error" in data
-
-        conn.close()
\ No newline at end of file
@@ -8,82 +8,116 @@ This test suite validates critical functionality of the Phase 1 implementation:
 - Container cleanup
 
 Tests are designed to run with real Podman when available, but gracefully
-skip if Podman is not available or properly configured.
+skip if Podman is not available or properly configured. They are independent
+and may be run in parallel with ``pytest -n auto``.
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import re
+import shutil
 from pathlib import Path
+from typing import Optional
 
 import pytest
 
 # Test if podman is available
 try:
     from podman import PodmanClient
-    from podman.errors import NotFound
     PODMAN_AVAILABLE = True
 except Exception:
     PodmanClient = None  # type: ignore[assignment]
-    NotFound = Exception  # type: ignore[assignment]
     PODMAN_AVAILABLE = False
 
 from koji_adjutant.container.interface import (
+    BoundedInMemoryLogSink,
     ContainerError,
     ContainerSpec,
     InMemoryLogSink,
     VolumeMount,
 )
-from koji_adjutant.container.podman_manager import PodmanManager
 from koji_adjutant.task_adapters.base import TaskContext
 from koji_adjutant.task_adapters.buildarch import BuildArchAdapter
 from koji_adjutant.task_adapters.createrepo import CreaterepoAdapter
 from koji_adjutant.task_adapters.logging import FileKojiLogSink
 
-# Configure test logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Test image - use a minimal image available in most environments
 TEST_IMAGE = os.environ.get("KOJI_ADJUTANT_TEST_IMAGE", "docker.io/almalinux/9-minimal:latest")
 
 
+def _probe_podman() -> Optional[str]:
+    """Check once at import that Podman answers; return a skip reason if not.
+
+    Set KOJI_ADJUTANT_SKIP_PROBE to skip Podman tests without contacting
+    the service, e.g. for offline development.
+    """
+    if not PODMAN_AVAILABLE:
+        return "Podman Python API not available"
+    if os.environ.get("KOJI_ADJUTANT_SKIP_PROBE"):
+        return "Podman probe disabled by KOJI_ADJUTANT_SKIP_PROBE"
+
+    try:
+        with PodmanClient() as client:
+            # Only reachability matters; listing containers scales with the host
+            client.version()
+    except Exception as e:
+        return f"Podman not accessible: {e}"
+    return None
+
+
+PODMAN_SKIP_REASON = _probe_podman()
+PODMAN_USABLE = PODMAN_SKIP_REASON is None
+
+
 # Skip marker for tests requiring Podman
 requires_podman = pytest.mark.skipif(
-    not PODMAN_AVAILABLE,
-    reason="Podman Python API not available",
+    not PODMAN_USABLE,
+    reason=PODMAN_SKIP_REASON or "",
 )
 
 
 # Fixtures
-@pytest.fixture(scope="module")
-def podman_available():
-    """Check if Podman is available and accessible."""
-    if not PODMAN_AVAILABLE:
-        pytest.skip("Podman Python API not available")
+@pytest.fixture(scope="session")
+def shared_podman_client():
+    """Create one Podman client for the whole session."""
+    if not PODMAN_USABLE:
+        pytest.skip(PODMAN_SKIP_REASON)
 
-    # Try to create a client and verify it works
-    try:
-        client = PodmanClient()
-        # Simple check: list containers (should not fail)
-        client.containers.list(all=True)
-        return True
-    except Exception as e:
-        pytest.skip(f"Podman not accessible: {e}")
+    client = PodmanClient()
+    yield client
+    client.close()
 
 
-@pytest.fixture
-def temp_koji_root(tmp_path):
-    """Create a temporary /mnt/koji-like directory structure."""
-    koji_root = tmp_path / "mnt" / "koji"
-    koji_root.mkdir(parents=True, exist_ok=True)
+@pytest.fixture(scope="session")
+def podman_available():
+    """Podman availability is probed at import; kept for test signatures."""
+    return True
+
+
+@pytest.fixture(scope="session")
+def _koji_root_template(tmp_path_factory):
+    """Build the /mnt/koji-like skeleton once; tests clone it."""
+    template = tmp_path_factory.mktemp("koji-template")
 
     # Create standard subdirectories
-    (koji_root / "work").mkdir(exist_ok=True)
-    (koji_root / "logs").mkdir(exist_ok=True)
-    (koji_root / "repos").mkdir(exist_ok=True)
+    for subdir in ("work", "logs", "repos"):
+        (template / subdir).mkdir()
+
+    return template
+
+
+@pytest.fixture
+def temp_koji_root(tmp_path, _koji_root_template):
+    """Create a temporary /mnt/koji-like directory structure.
 
+    Any files in the template are hardlinked rather than copied.
+    """
+    koji_root = tmp_path / "mnt" / "koji"
+    shutil.copytree(_koji_root_template, koji_root, copy_function=os.link)
     return koji_root
 
 
@@ -102,17 +136,60 @@ def test_task_context(temp_koji_root):
     )
 
 
-@pytest.fixture
-def podman_manager():
-    """Create a PodmanManager instance for testing."""
-    return PodmanManager(
-        pull_always=False,  # Use if-not-present for tests
-        network_default=True,
-        worker_id="test-worker",
-    )
+def _image_archive() -> Optional[Path]:
+    """Return the image cache archive for TEST_IMAGE, if a cache is configured."""
+    cache_dir = os.environ.get("KOJI_ADJUTANT_IMAGE_CACHE")
+    if not cache_dir:
+        return None
+    return Path(cache_dir) / (re.sub(r"[^A-Za-z0-9_.-]", "_", TEST_IMAGE) + ".tar")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def _image_ready(session_podman_manager, shared_podman_client):
+    """Ensure the test image is present once per session, skip if not.
+
+    When KOJI_ADJUTANT_IMAGE_CACHE is set, the image is loaded from a saved
+    archive there instead of being pulled, and saved there after a pull.
+    """
+    archive = _image_archive()
+    if archive is not None and archive.is_file():
+        try:
+            list(shared_podman_client.images.load(file_path=archive))
+        except Exception as e:
+            logger.warning(f"Could not load cached image {archive}: {e}")
+
+    try:
+        session_podman_manager.ensure_image_available(TEST_IMAGE)
+    except ContainerError as e:
+        pytest.skip(f"Test image not available: {e}")
+
+    if archive is not None and not archive.is_file():
+        try:
+            archive.parent.mkdir(parents=True, exist_ok=True)
+            image = shared_podman_client.images.get(TEST_IMAGE)
+            with open(archive, "wb") as f:
+                for chunk in image.save(named=True):
+                    f.write(chunk)
+        except Exception as e:
+            archive.unlink(missing_ok=True)
+            logger.warning(f"Could not save image cache {archive}: {e}")
+
+    return True
+
+
+@pytest.fixture(scope="session")
+def buildarch_adapter():
+    """Share one stateless BuildArchAdapter across tests."""
+    return BuildArchAdapter()
+
+
+@pytest.fixture(scope="session")
+def createrepo_adapter():
+    """Share one stateless CreaterepoAdapter across tests."""
+    return CreaterepoAdapter()
+
+
+@pytest.fixture(scope="session")
 def mock_koji_logger():
     """Create a mock Koji logger for log sink testing."""
     return logging.getLogger("test.koji")
@@ -141,14 +218,19 @@ def test_repo_directory(temp_koji_root, test_task_context):
     return repo_dir
 
 
-# Helper functions
-def ensure_image_available(manager: PodmanManager, image: str) -> bool:
-    """Helper to ensure test image is available, skip test if not."""
-    try:
-        manager.ensure_image_available(image)
-        return True
-    except ContainerError as e:
-        pytest.skip(f"Test image not available: {e}")
+class TeeLogSink:
+    """LogSink that fans container output out to several sinks."""
+
+    def __init__(self, *sinks) -> None:
+        self.sinks = sinks
+
+    def write_stdout(self, data: bytes) -> None:
+        for sink in self.sinks:
+            sink.write_stdout(data)
+
+    def write_stderr(self, data: bytes) -> None:
+        for sink in self.sinks:
+            sink.write_stderr(data)
 
 
 # ST1: Container Lifecycle Smoke Tests
@@ -175,18 +257,29 @@ def test_st1_1_image_availability(podman_available, podman_manager):
 
 
 @requires_podman
-def test_st1_3_log_streaming(podman_available, podman_manager, temp_koji_root):
-    """ST1.3 - Log Streaming Test
+def test_st1_3_5_log_streaming_persistence_and_cleanup(
+    podman_available,
+    podman_manager,
+    _image_ready,
+    shared_podman_client,
+    test_task_context,
+    mock_koji_logger,
+):
+    """ST1.3 / ST1.5 / AC5.2 - Log Streaming, Persistence and Cleanup Test
 
-    Verify container logs are streamed correctly to LogSink.
+    A single container run covers all three checks, amortizing container
+    create/start/remove.
     AC1.4: Container stdout/stderr are streamed to LogSink immediately after start.
+    AC5.2: Container logs are persisted to /mnt/koji/logs/<task_id>/container.log
+    AC6.1: Container is removed after successful task completion.
     """
     manager = podman_manager
-    ensure_image_available(manager, TEST_IMAGE)
 
-    # Create a container that produces known output
-    sink = InMemoryLogSink()
+    log_dir = test_task_context.koji_mount_root / "logs" / str(test_task_context.task_id)
+    log_file = log_dir / "container.log"
 
+    # A shell is only needed here for the stderr redirect
+    memory_sink = BoundedInMemoryLogSink()
     spec = ContainerSpec(
         image=TEST_IMAGE,
         command=["/bin/sh", "-c", "echo 'stdout test'; echo 'stderr test' >&2"],
@@ -194,65 +287,51 @@ def test_st1_3_log_streaming(podman_available, podman_manager, temp_koji_root):
         remove_after_exit=True,
     )
 
-    # Execute container
-    result = manager.run(spec, sink, attach_streams=True)
+    file_sink = FileKojiLogSink(
+        mock_koji_logger, log_file, buffer_size=4096, flush_interval=2.0
+    )
+    with file_sink:
+        result = manager.run(spec, TeeLogSink(memory_sink, file_sink), attach_streams=True)
 
     # Verify exit code
     assert result.exit_code == 0, f"Container should exit with 0, got {result.exit_code}"
 
-    # Verify logs were captured
-    stdout_content = sink.stdout.decode("utf-8", errors="replace")
-    stderr_content = sink.stderr.decode("utf-8", errors="replace")
-
-    # Check that output was captured (may contain test strings)
+    # Verify logs were streamed
+    stdout_content = memory_sink.stdout.decode("utf-8", errors="replace")
+    stderr_content = memory_sink.stderr.decode("utf-8", errors="replace")
     assert len(stdout_content) > 0 or len(stderr_content) > 0, "Logs should be captured"
 
     logger.info(f"Captured stdout: {stdout_content[:200]}")
     logger.info(f"Captured stderr: {stderr_content[:200]}")
 
+    # Verify logs were persisted; the buffered sink flushes on close
+    assert log_file.exists(), f"Log file should exist at {log_file}"
+    log_content = log_file.read_bytes()
+    assert b"stdout test" in log_content or b"stderr test" in log_content, \
+        f"Log file should contain container output, got: {log_content[:200]}"
+
+    # Verify container was removed by checking it doesn't exist
+    assert not shared_podman_client.containers.exists(result.handle.container_id), \
+        f"Container {result.handle.container_id} should be removed but still exists"
+
 
 @requires_podman
-def test_st1_5_container_cleanup(podman_available, podman_manager, temp_koji_root):
-    """ST1.5 - Container Cleanup Test
+def test_st1_5_container_cleanup_on_failure(
+    podman_available,
+    podman_manager,
+    _image_ready,
+    shared_podman_client,
+):
+    """ST1.5 - Container Cleanup on Failure Test
 
-    Verify container cleanup on success and failure.
     AC1.6: Container is removed via remove() after task completion.
-    AC6.1: Container is removed after successful task completion.
     AC6.2: Container is removed after task failure.
     """
     manager = podman_manager
-    ensure_image_available(manager, TEST_IMAGE)
-
-    # Test 1: Successful cleanup
     sink = InMemoryLogSink()
-    spec = ContainerSpec(
-        image=TEST_IMAGE,
-        command=["/bin/sh", "-c", "echo 'success'; exit 0"],
-        environment={},
-        remove_after_exit=True,
-    )
-
-    result = manager.run(spec, sink, attach_streams=True)
-    assert result.exit_code == 0
-
-    # Verify container was removed by checking it doesn't exist
-    if PODMAN_AVAILABLE:
-        try:
-            # Try to inspect the container - should raise NotFound
-            client = PodmanClient()
-            container = client.containers.get(result.handle.container_id)
-            pytest.fail(f"Container {result.handle.container_id} should be removed but still exists")
-        except NotFound:
-            # Expected - container was removed
-            pass
-        except Exception as e:
-            # Other errors are acceptable (container may not be accessible)
-            logger.debug(f"Could not verify container removal (expected): {e}")
-
-    # Test 2: Cleanup on failure
     spec_fail = ContainerSpec(
         image=TEST_IMAGE,
-        command=["/bin/sh", "-c", "echo 'failure'; exit 1"],
+        command=["/usr/bin/false"],
         environment={},
         remove_after_exit=True,
     )
@@ -261,28 +340,22 @@ def test_st1_5_container_cleanup(podman_available, podman_manager, temp_koji_roo
     assert result_fail.exit_code != 0
 
     # Verify container was removed even on failure
-    if PODMAN_AVAILABLE:
-        try:
-            client = PodmanClient()
-            container = client.containers.get(result_fail.handle.container_id)
-            pytest.fail(f"Container {result_fail.handle.container_id} should be removed after failure")
-        except NotFound:
-            pass
-        except Exception as e:
-            logger.debug(f"Could not verify container removal (expected): {e}")
+    assert not shared_podman_client.containers.exists(result_fail.handle.container_id), \
+        f"Container {result_fail.handle.container_id} should be removed after failure"
 
 
 # ST2: Mount Configuration Smoke Tests
 
 @requires_podman
-def test_st2_2_mount_permissions(podman_available, podman_manager, temp_koji_root):
+def test_st2_2_mount_permissions(
+    podman_available, podman_manager, _image_ready, temp_koji_root
+):
     """ST2.2 - Mount Permissions Test
 
     Verify container can read/write mounted directories.
     AC2.2: Mounted directories are accessible by container user.
     """
     manager = podman_manager
-    ensure_image_available(manager, TEST_IMAGE)
 
     # Create test file on host
     test_file = temp_koji_root / "test_write.txt"
@@ -290,7 +363,7 @@ def test_st2_2_mount_permissions(podman_available, podman_manager, temp_koji_roo
     test_file.write_text(test_content, encoding="utf-8")
 
     # Create container with mount that writes a file
-    sink = InMemoryLogSink()
+    sink = BoundedInMemoryLogSink()
     mount_source = temp_koji_root
     mount_target = Path("/mnt/test")
 
@@ -329,21 +402,17 @@ def test_st2_2_mount_permissions(podman_available, podman_manager, temp_koji_roo
 
 # ST3: buildArch Task Smoke Tests
 
-@requires_podman
 def test_st3_1_buildarch_task_execution(
-    podman_available, podman_manager, test_task_context, temp_koji_root
+    buildarch_adapter, test_task_context, temp_koji_root
 ):
     """ST3.1 - BuildArch Task Execution Test
 
     Verify buildArch task adapter executes successfully in container.
     AC3.1: Task adapter builds ContainerSpec from TaskContext correctly.
 
-    Note: This is a simplified test that validates the adapter runs,
-    not a full RPM build (which would require build dependencies).
+    Note: This only checks the ContainerSpec the adapter builds and needs
+    no Podman; a full RPM build would require build dependencies.
     """
-    manager = podman_manager
-    ensure_image_available(manager, TEST_IMAGE)
-
     # Create a minimal "SRPM" file for testing
     # In real scenario, this would be a valid SRPM
     work_dir = test_task_context.work_dir
@@ -351,8 +420,7 @@ def test_st3_1_buildarch_task_execution(
     test_srpm = work_dir / "work" / "test.src.rpm"
     test_srpm.write_bytes(b"MINIMAL_SRPM_CONTENT\n")
 
-    # Create adapter
-    adapter = BuildArchAdapter()
+    adapter = buildarch_adapter
 
     # Build task parameters
     task_params = {
@@ -376,16 +444,15 @@ def test_st3_1_buildarch_task_execution(
     # For Phase 1, we'll verify the spec is correct rather than running
     # a full build (which would require build dependencies in the image)
     # The spec should include proper mounts and environment
-    assert any(m.target == Path("/mnt/koji") for m in spec.mounts), "Should mount /mnt/koji"
-    assert any(m.target == Path(f"/work/{test_task_context.task_id}") for m in spec.mounts), "Should mount work directory"
+    mount_targets = {m.target for m in spec.mounts}
+    assert Path("/mnt/koji") in mount_targets, "Should mount /mnt/koji"
+    assert Path(f"/work/{test_task_context.task_id}") in mount_targets, "Should mount work directory"
 
 
 # ST4: createrepo Task Smoke Tests
 
-@requires_podman
 def test_st4_1_createrepo_task_execution(
-    podman_available,
-    podman_manager,
+    createrepo_adapter,
     test_task_context,
     test_repo_directory,
     temp_koji_root,
@@ -395,14 +462,10 @@ def test_st4_1_createrepo_task_execution(
     Verify createrepo task adapter executes successfully in container.
     AC4.1: Task adapter builds ContainerSpec from TaskContext correctly.
 
-    Note: This is a simplified test that validates the adapter runs,
-    not a full createrepo execution (which would require createrepo_c in image).
+    Note: This only checks the ContainerSpec the adapter builds and needs
+    no Podman; a full createrepo run would require createrepo_c in the image.
     """
-    manager = podman_manager
-    ensure_image_available(manager, TEST_IMAGE)
-
-    # Create adapter
-    adapter = CreaterepoAdapter()
+    adapter = createrepo_adapter
 
     # Build task parameters
     repo_id = 1
@@ -429,53 +492,6 @@ def test_st4_1_createrepo_task_execution(
     assert any(m.target == Path("/mnt/koji") for m in spec.mounts), "Should mount /mnt/koji"
 
 
-# Additional validation tests for log persistence
-
-@requires_podman
-def test_log_persistence_to_filesystem(
-    podman_available, podman_manager, test_task_context, mock_koji_logger
-):
-    """Test that logs are persisted to filesystem.
-
-    AC5.2: Container logs are persisted to /mnt/koji/logs/<task_id>/container.log
-    """
-    manager = podman_manager
-    ensure_image_available(manager, TEST_IMAGE)
-
-    # Create log file path
-    log_dir = test_task_context.koji_mount_root / "logs" / str(test_task_context.task_id)
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / "container.log"
-
-    # Create FileKojiLogSink
-    sink = FileKojiLogSink(mock_koji_logger, log_file)
-
-    try:
-        # Create container with known output
-        spec = ContainerSpec(
-            image=TEST_IMAGE,
-            command=["/bin/sh", "-c", "echo 'test log output'; echo 'test error' >&2"],
-            environment={},
-            remove_after_exit=True,
-        )
-
-        result = manager.run(spec, sink, attach_streams=True)
-
-        # Close sink to ensure file is flushed
-        sink.close()
-
-        # Verify log file exists
-        assert log_file.exists(), f"Log file should exist at {log_file}"
-
-        # Verify log file contains output
-        log_content = log_file.read_bytes()
-        assert b"test log output" in log_content or b"test error" in log_content, \
-            f"Log file should contain container output, got: {log_content[:200]}"
-
-    finally:
-        sink.close()
-
-
 # Test execution helpers
 
 if __name__ == "__main__":
@@ -13,36 +13,76 @@ Tests use mocked koji hub XMLRPC calls and do not require live hub.
 from __future__ import annotations
 
 import json
-import os
-import tempfile
-from pathlib import Path
-from unittest.mock import MagicMock, patch
-from datetime import datetime, timedelta
+import time
+from types import MappingProxyType
+from unittest.mock import patch
 
 import pytest
 
 from koji_adjutant import config as adj_config
-from koji_adjutant.policy.resolver import PolicyResolver, CachedPolicy
+from koji_adjutant.policy.resolver import PolicyResolver
 from koji_adjutant.task_adapters.buildarch import BuildArchAdapter
 from koji_adjutant.task_adapters.createrepo import CreaterepoAdapter
 from koji_adjutant.task_adapters.base import TaskContext
 
+from _fakes import FakeKojiSession
 
-class TestPolicyResolutionIntegration:
-    """Integration tests for PolicyResolver with mock hub."""
+# Sample kojid.conf [adjutant] section
+KOJID_CONF = b"""\
+[adjutant]
+task_image_default = registry/test:latest
+image_pull_policy = always
+network_enabled = false
+policy_enabled = false
+policy_cache_ttl = 900
+container_mounts = /mnt/test:/mnt/test:rw:Z /other:/other:ro
+container_labels = key1=value1,key2=value2
+container_timeouts = pull=600,start=120,stop_grace=30
+"""
 
-    @pytest.fixture
-    def mock_session(self):
-        """Create a mock koji session."""
-        session = MagicMock()
-        return session
 
-    @pytest.fixture
-    def resolver(self, mock_session):
-        """Create a PolicyResolver instance."""
-        return PolicyResolver(mock_session)
+@pytest.fixture
+def frozen_config(monkeypatch):
+    """Return a setter installing an already-parsed [adjutant] section.
 
-    def test_policy_resolution_with_tag_extra_data(self, resolver, mock_session):
+    Bypasses the kojid options object and config file parsing; the
+    previous config state is restored after the test.
+    """
+    monkeypatch.setattr(adj_config, "_options", None)
+
+    def freeze(section):
+        monkeypatch.setattr(adj_config, "_config", MappingProxyType(dict(section)))
+
+    return freeze
+
+
+@pytest.fixture(scope="class")
+def session():
+    """Create a fake koji hub session shared by the test class."""
+    return FakeKojiSession()
+
+
+@pytest.fixture(scope="class")
+def resolver(session):
+    """Create a PolicyResolver instance shared by the test class."""
+    return PolicyResolver(session)
+
+
+@pytest.fixture
+def _reset_resolver(resolver, session):
+    """Return the class-shared resolver and hub to a clean state after each test."""
+    ttl_seconds = resolver._ttl_seconds
+    yield
+    resolver.invalidate_cache()
+    resolver._ttl_seconds = ttl_seconds
+    session.reset()
+
+
+@pytest.mark.usefixtures("_reset_resolver")
+class TestPolicyResolutionIntegration:
+    """Integration tests for PolicyResolver with a fake hub."""
+
+    def test_policy_resolution_with_tag_extra_data(self, resolver, session):
         """Test policy resolution when policy is in tag extra data."""
         # Setup policy in tag extra data
         policy = {
@@ -58,8 +98,8 @@ class TestPolicyResolutionIntegration:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getTag.return_value = tag_info
-        mock_session.getBuildConfig.return_value = None
+        session.tag_info = tag_info
+        session.build_config = None
 
         # Resolve image
         image = resolver.resolve_image(
@@ -67,9 +107,9 @@ class TestPolicyResolutionIntegration:
         )
 
         assert image == "registry/koji-adjutant-task:f39-x86_64"
-        mock_session.getTag.assert_called_once_with("f39-build", event=None, strict=False)
+        assert session.getTag_calls == [("f39-build", None, False)]
 
-    def test_policy_resolution_with_build_config_fallback(self, resolver, mock_session):
+    def test_policy_resolution_with_build_config_fallback(self, resolver, session):
         """Test policy resolution falls back to build config when tag extra unavailable."""
         policy = {
             "rules": [
@@ -77,22 +117,23 @@ class TestPolicyResolutionIntegration:
             ]
         }
 
-        mock_session.getTag.return_value = None
+        session.tag_info = None
         build_config = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getBuildConfig.return_value = build_config
+        session.build_config = build_config
 
         image = resolver.resolve_image(
             tag_name="test-tag", arch="x86_64", task_type="buildArch"
         )
 
         assert image == "registry/koji-adjutant-task:from-config"
-        mock_session.getTag.assert_called_once()
-        mock_session.getBuildConfig.assert_called_once_with("test-tag", event=None)
+        assert len(session.getTag_calls) == 1
+        assert session.getBuildConfig_calls == [("test-tag", None)]
+        # Both lookups go to the hub in a single round trip
+        assert session.multicall_calls == [("getTag", "getBuildConfig")]
 
-    def test_policy_resolution_fallback_to_config_default(self, resolver, mock_session):
+    def test_policy_resolution_fallback_to_config_default(self, resolver, session):
         """Test fallback to config default when hub unavailable."""
-        mock_session.getTag.side_effect = Exception("Hub unavailable")
-        mock_session.getBuildConfig.side_effect = Exception("Hub unavailable")
+        session.error = Exception("Hub unavailable")
 
         # Should fall back to config default without raising
         image = resolver.resolve_image(
@@ -101,7 +142,29 @@ class TestPolicyResolutionIntegration:
 
         assert image == "registry/almalinux:10"  # Config default
 
-    def test_policy_cache_effectiveness(self, resolver, mock_session):
+    def test_stale_policy_served_on_hub_failure(self, resolver, session):
+        """Test an expired cached policy is used while the hub is unavailable."""
+        policy = {
+            "rules": [
+                {"type": "tag", "tag": "f39-build", "image": "registry/image:f39"},
+            ]
+        }
+        session.tag_info = {
+            "extra": {"adjutant_image_policy": json.dumps(policy)}
+        }
+        resolver.resolve_image(tag_name="f39-build", arch="x86_64", task_type="buildArch")
+
+        resolver._cache["f39-build"].cached_at = time.monotonic() - 3600
+        session.error = Exception("Hub unavailable")
+
+        image = resolver.resolve_image(
+            tag_name="f39-build", arch="x86_64", task_type="buildArch"
+        )
+
+        assert image == "registry/image:f39"
+        assert len(session.getTag_calls) == 2
+
+    def test_policy_cache_effectiveness(self, resolver, session):
         """Test that policy caching reduces hub queries."""
         policy = {
             "rules": [
@@ -115,31 +178,31 @@ class TestPolicyResolutionIntegration:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         # First call - should query hub
         image1 = resolver.resolve_image(
             tag_name="f39-build", arch="x86_64", task_type="buildArch"
         )
         assert image1 == "registry/koji-adjutant-task:f39-x86_64"
-        assert mock_session.getTag.call_count == 1
+        assert len(session.getTag_calls) == 1
 
         # Second call - should use cache (no new query)
         image2 = resolver.resolve_image(
             tag_name="f39-build", arch="x86_64", task_type="buildArch"
         )
         assert image2 == "registry/koji-adjutant-task:f39-x86_64"
-        assert mock_session.getTag.call_count == 1  # Still 1, cached
+        assert len(session.getTag_calls) == 1  # Still 1, cached
 
-        # Different arch - should query again (different cache key)
+        # Different arch - policy is cached per tag, so no new query
         image3 = resolver.resolve_image(
             tag_name="f39-build", arch="aarch64", task_type="buildArch"
         )
         # Should fall back to config default (no rule for aarch64)
         assert image3 == "registry/almalinux:10"
-        assert mock_session.getTag.call_count == 2  # New query for different arch
+        assert len(session.getTag_calls) == 1  # Still 1, same tag
 
-    def test_policy_rule_precedence(self, resolver, mock_session):
+    def test_policy_rule_precedence(self, resolver, session):
         """Test rule precedence: tag_arch > tag > task_type > default."""
         policy = {
             "rules": [
@@ -164,7 +227,7 @@ class TestPolicyResolutionIntegration:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         # Should match tag_arch (highest precedence)
         image = resolver.resolve_image(
@@ -194,91 +257,66 @@ class TestPolicyResolutionIntegration:
 class TestConfigParsingIntegration:
     """Integration tests for config parsing with real kojid.conf format."""
 
-    def test_config_parsing_with_real_kojid_conf(self, monkeypatch):
+    def test_config_parsing_with_real_kojid_conf(self, monkeypatch, tmp_path):
         """Test config parsing with sample kojid.conf file."""
-        adj_config.reset_config()
-
-        # Create a temporary config file
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".conf") as f:
-            f.write(
-                """[adjutant]
-task_image_default = registry/test:latest
-image_pull_policy = always
-network_enabled = false
-policy_enabled = false
-policy_cache_ttl = 900
-container_mounts = /mnt/test:/mnt/test:rw:Z /other:/other:ro
-container_labels = key1=value1,key2=value2
-container_timeouts = pull=600,start=120,stop_grace=30
-"""
-            )
-            config_file = f.name
-
-        try:
-            monkeypatch.setenv("KOJI_CONFIG", config_file)
-
-            # Mock koji.read_config_files
-            mock_config = {
-                "adjutant": {
-                    "task_image_default": "registry/test:latest",
-                    "image_pull_policy": "always",
-                    "network_enabled": "false",
-                    "policy_enabled": "false",
-                    "policy_cache_ttl": "900",
-                    "container_mounts": "/mnt/test:/mnt/test:rw:Z /other:/other:ro",
-                    "container_labels": "key1=value1,key2=value2",
-                    "container_timeouts": "pull=600,start=120,stop_grace=30",
-                }
-            }
-
-            class MockKoji:
-                @staticmethod
-                def read_config_files(files=None):
-                    return mock_config
-
-            monkeypatch.setattr(adj_config, "koji", MockKoji)
+        # Restored after the test so the parsed file doesn't leak
+        monkeypatch.setattr(adj_config, "_config", None)
+        monkeypatch.setattr(adj_config, "_options", None)
 
-            # Verify config values
-            assert adj_config.adjutant_task_image_default() == "registry/test:latest"
-            assert adj_config.adjutant_image_pull_policy() == "always"
-            assert adj_config.adjutant_network_enabled() is False
-            assert adj_config.adjutant_policy_enabled() is False
-            assert adj_config.adjutant_policy_cache_ttl() == 900
-
-            mounts = adj_config.adjutant_container_mounts()
-            assert len(mounts) == 2
-            assert "/mnt/test:/mnt/test:rw:Z" in mounts
-
-            labels = adj_config.adjutant_container_labels()
-            assert labels["key1"] == "value1"
-            assert labels["key2"] == "value2"
-
-            timeouts = adj_config.adjutant_container_timeouts()
-            assert timeouts["pull"] == 600
-            assert timeouts["start"] == 120
-            assert timeouts["stop_grace"] == 30
-
-        finally:
-            os.unlink(config_file)
-
-    def test_env_var_overrides_config_file(self, monkeypatch):
-        """Test that environment variables override config file values."""
-        adj_config.reset_config()
+        config_file = tmp_path / "kojid.conf"
+        config_file.write_bytes(KOJID_CONF)
+        monkeypatch.setenv("KOJI_CONFIG", str(config_file))
 
-        # Mock config file with one value
+        # Mock koji.read_config_files
         mock_config = {
             "adjutant": {
-                "task_image_default": "config/image:tag",
+                "task_image_default": "registry/test:latest",
+                "image_pull_policy": "always",
+                "network_enabled": "false",
+                "policy_enabled": "false",
+                "policy_cache_ttl": "900",
+                "container_mounts": "/mnt/test:/mnt/test:rw:Z /other:/other:ro",
+                "container_labels": "key1=value1,key2=value2",
+                "container_timeouts": "pull=600,start=120,stop_grace=30",
             }
         }
+        read_files = []
 
         class MockKoji:
             @staticmethod
             def read_config_files(files=None):
+                read_files.append(files)
                 return mock_config
 
         monkeypatch.setattr(adj_config, "koji", MockKoji)
 
+        # Verify config values
+        assert adj_config.adjutant_task_image_default() == "registry/test:latest"
+        assert adj_config.adjutant_image_pull_policy() == "always"
+        assert adj_config.adjutant_network_enabled() is False
+        assert adj_config.adjutant_policy_enabled() is False
+        assert adj_config.adjutant_policy_cache_ttl() == 900
+
+        mounts = adj_config.adjutant_container_mounts()
+        assert len(mounts) == 2
+        assert "/mnt/test:/mnt/test:rw:Z" in mounts
+
+        labels = adj_config.adjutant_container_labels()
+        assert labels["key1"] == "value1"
+        assert labels["key2"] == "value2"
+
+        timeouts = adj_config.adjutant_container_timeouts()
+        assert timeouts["pull"] == 600
+        assert timeouts["start"] == 120
+        assert timeouts["stop_grace"] == 30
+
+        # KOJI_CONFIG names the file, which is read once
+        assert read_files == [str(config_file)]
+
+    def test_env_var_overrides_config_file(self, monkeypatch, frozen_config):
+        """Test that environment variables override config file values."""
+        frozen_config({"task_image_default": "config/image:tag"})
+
         # Env var should override
         monkeypatch.setenv("KOJI_ADJUTANT_TASK_IMAGE_DEFAULT", "env/image:tag")
         assert adj_config.adjutant_task_image_default() == "env/image:tag"
@@ -287,10 +325,9 @@ container_timeouts = pull=600,start=120,stop_grace=30
         monkeypatch.delenv("KOJI_ADJUTANT_TASK_IMAGE_DEFAULT", raising=False)
         assert adj_config.adjutant_task_image_default() == "config/image:tag"
 
-    def test_config_fallback_when_koji_unavailable(self, monkeypatch):
-        """Test fallback to defaults when koji library unavailable."""
-        adj_config.reset_config()
-        monkeypatch.setattr(adj_config, "koji", None)
+    def test_config_fallback_when_koji_unavailable(self, frozen_config):
+        """Test fallback to defaults when no config values are available."""
+        frozen_config({})
 
         # Should use Phase 1 defaults
         assert adj_config.adjutant_task_image_default() == "registry/almalinux:10"
@@ -303,23 +340,22 @@ class TestEndToEndImageSelection:
     """End-to-end tests for image selection flow."""
 
     @pytest.fixture
-    def mock_session(self):
-        """Create a mock koji session."""
-        return MagicMock()
+    def session(self):
+        """Create a fake koji hub session."""
+        return FakeKojiSession()
 
     @pytest.fixture
     def temp_koji_root(self, tmp_path):
-        """Create a temporary /mnt/koji-like directory structure."""
-        koji_root = tmp_path / "mnt" / "koji"
-        koji_root.mkdir(parents=True, exist_ok=True)
-        (koji_root / "work").mkdir(exist_ok=True)
-        (koji_root / "logs").mkdir(exist_ok=True)
-        (koji_root / "repos").mkdir(exist_ok=True)
-        return koji_root
+        """Create a temporary /mnt/koji-like directory."""
+        return tmp_path / "mnt" / "koji"
 
     @pytest.fixture
     def test_task_context(self, temp_koji_root):
-        """Create a TaskContext for testing."""
+        """Create a TaskContext backed by a real work directory.
+
+        BuildArchAdapter.build_spec creates the result directory and may
+        write the buildroot init script, so its tests need real paths.
+        """
         task_id = 12345
         work_dir = temp_koji_root / "work" / str(task_id)
         work_dir.mkdir(parents=True, exist_ok=True)
@@ -331,7 +367,7 @@ class TestEndToEndImageSelection:
             environment={"TEST": "1"},
         )
 
-    def test_buildarch_adapter_with_policy(self, mock_session, test_task_context):
+    def test_buildarch_adapter_with_policy(self, session, test_task_context):
         """Test BuildArchAdapter uses PolicyResolver when session provided."""
         # Setup policy
         policy = {
@@ -346,7 +382,7 @@ class TestEndToEndImageSelection:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         # Enable policy
         with patch("koji_adjutant.config.adjutant_policy_enabled", return_value=True):
@@ -360,12 +396,12 @@ class TestEndToEndImageSelection:
             }
 
             spec = adapter.build_spec(
-                test_task_context, task_params, session=mock_session
+                test_task_context, task_params, session=session
             )
 
             # Verify image was resolved from policy
             assert spec.image == "registry/koji-adjutant-task:f39-x86_64"
-            mock_session.getTag.assert_called_once()
+            assert len(session.getTag_calls) == 1
 
     def test_buildarch_adapter_fallback_without_session(self, test_task_context):
         """Test BuildArchAdapter falls back to config default without session."""
@@ -383,7 +419,7 @@ class TestEndToEndImageSelection:
         # Should use config default (Phase 1 compatibility)
         assert spec.image == "registry/almalinux:10"
 
-    def test_createrepo_adapter_with_policy(self, mock_session, test_task_context):
+    def test_createrepo_adapter_with_policy(self, session, test_task_context, temp_koji_root):
         """Test CreaterepoAdapter uses PolicyResolver when session and tag_name provided."""
         # Setup policy
         policy = {
@@ -397,28 +433,33 @@ class TestEndToEndImageSelection:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         # Enable policy
         with patch("koji_adjutant.config.adjutant_policy_enabled", return_value=True):
             adapter = CreaterepoAdapter()
+            # build_spec sizes the package list and checks for the repo dir
+            repo_dir = temp_koji_root / "repos" / "1" / "x86_64"
+            repo_dir.mkdir(parents=True)
+            (repo_dir / "pkglist").touch()
             task_params = {
                 "repo_id": 1,
                 "arch": "x86_64",
+                "pkglist": str(repo_dir / "pkglist"),
             }
 
             spec = adapter.build_spec(
                 test_task_context,
                 task_params,
-                session=mock_session,
+                session=session,
                 tag_name="f39-build",
             )
 
             # Verify image was resolved from policy
             assert spec.image == "registry/koji-adjutant-task:repo"
-            mock_session.getTag.assert_called_once()
+            assert len(session.getTag_calls) == 1
 
-    def test_policy_disabled_fallback(self, mock_session, test_task_context):
+    def test_policy_disabled_fallback(self, session, test_task_context):
         """Test that adapters fall back to config when policy disabled."""
         # Disable policy
         with patch("koji_adjutant.config.adjutant_policy_enabled", return_value=False):
@@ -432,29 +473,20 @@ class TestEndToEndImageSelection:
             }
 
             spec = adapter.build_spec(
-                test_task_context, task_params, session=mock_session
+                test_task_context, task_params, session=session
             )
 
             # Should use config default (policy disabled)
             assert spec.image == "registry/almalinux:10"
             # Should not query hub
-            mock_session.getTag.assert_not_called()
+            assert session.getTag_calls == []
 
 
+@pytest.mark.usefixtures("_reset_resolver")
 class TestCacheEffectiveness:
     """Tests for policy cache effectiveness."""
 
-    @pytest.fixture
-    def mock_session(self):
-        """Create a mock koji session."""
-        return MagicMock()
-
-    @pytest.fixture
-    def resolver(self, mock_session):
-        """Create a PolicyResolver instance."""
-        return PolicyResolver(mock_session)
-
-    def test_cache_reduces_hub_queries(self, resolver, mock_session):
+    def test_cache_reduces_hub_queries(self, resolver, session):
         """Test that cache reduces hub queries for same tag+arch."""
         policy = {
             "rules": [
@@ -468,30 +500,30 @@ class TestCacheEffectiveness:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         # First call - queries hub
         image1 = resolver.resolve_image(
             tag_name="f39-build", arch="x86_64", task_type="buildArch"
         )
         assert image1 == "registry/image:f39-x86_64"
-        assert mock_session.getTag.call_count == 1
+        assert len(session.getTag_calls) == 1
 
         # Second call - uses cache, no new query
         image2 = resolver.resolve_image(
             tag_name="f39-build", arch="x86_64", task_type="buildArch"
         )
         assert image2 == "registry/image:f39-x86_64"
-        assert mock_session.getTag.call_count == 1  # Still 1
+        assert len(session.getTag_calls) == 1  # Still 1
 
         # Third call - still cached
         image3 = resolver.resolve_image(
             tag_name="f39-build", arch="x86_64", task_type="createrepo"
         )
         assert image3 == "registry/image:f39-x86_64"
-        assert mock_session.getTag.call_count == 1  # Still 1
+        assert len(session.getTag_calls) == 1  # Still 1
 
-    def test_cache_invalidation(self, resolver, mock_session):
+    def test_cache_invalidation(self, resolver, session):
         """Test cache invalidation removes entries."""
         policy = {
             "rules": [
@@ -505,7 +537,7 @@ class TestCacheEffectiveness:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         # Cache an entry
         resolver.resolve_image(
@@ -521,9 +553,9 @@ class TestCacheEffectiveness:
         resolver.resolve_image(
             tag_name="f39-build", arch="x86_64", task_type="buildArch"
         )
-        assert mock_session.getTag.call_count == 2  # New query after invalidation
+        assert len(session.getTag_calls) == 2  # New query after invalidation
 
-    def test_cache_ttl_expiration(self, resolver, mock_session):
+    def test_cache_ttl_expiration(self, resolver, session):
         """Test that cache entries expire after TTL."""
         policy = {
             "rules": [
@@ -537,7 +569,7 @@ class TestCacheEffectiveness:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         # Create resolver with short TTL
         resolver._ttl_seconds = 1  # 1 second TTL
@@ -546,18 +578,64 @@ class TestCacheEffectiveness:
         resolver.resolve_image(
             tag_name="f39-build", arch="x86_64", task_type="buildArch"
         )
-        assert mock_session.getTag.call_count == 1
+        assert len(session.getTag_calls) == 1
 
         # Manually expire the cache entry
-        cache_key = ("f39-build", "x86_64")
-        cached = resolver._cache[cache_key]
-        cached.cached_at = datetime.now() - timedelta(seconds=2)  # Expired
+        cached = resolver._cache["f39-build"]
+        cached.cached_at = time.monotonic() - 2  # Expired
 
         # Next call should query hub again (cache expired)
         resolver.resolve_image(
             tag_name="f39-build", arch="x86_64", task_type="buildArch"
         )
-        assert mock_session.getTag.call_count == 2  # New query after expiration
+        assert len(session.getTag_calls) == 2  # New query after expiration
+
+    def test_cache_ttl_tiers_by_source(self, session, monkeypatch):
+        """Test cache TTL follows the source the policy was found in."""
+        monkeypatch.setenv("KOJI_ADJUTANT_POLICY_CACHE_TTL", "300")
+        monkeypatch.setenv("KOJI_ADJUTANT_POLICY_CACHE_TTL_BUILD_CONFIG", "30")
+        monkeypatch.setenv("KOJI_ADJUTANT_POLICY_CACHE_TTL_MISS", "3600")
+        resolver = PolicyResolver(session)
+
+        policy = {"rules": [{"type": "default", "image": "registry/image:default"}]}
+
+        def get_tag(tag_name):
+            if tag_name == "tag-policy":
+                return {"extra": {"adjutant_image_policy": json.dumps(policy)}}
+            return {"extra": {}}
+
+        def get_build_config(tag_name):
+            if tag_name == "build-config-policy":
+                return {"extra": {"adjutant_image_policy": json.dumps(policy)}}
+            return {"extra": {}}
+
+        session.tag_info = get_tag
+        session.build_config = get_build_config
+
+        for tag_name in ("tag-policy", "build-config-policy", "no-policy"):
+            resolver.resolve_image(
+                tag_name=tag_name, arch="x86_64", task_type="buildArch"
+            )
+
+        assert resolver._cache["tag-policy"].ttl_seconds == 300
+        assert resolver._cache["build-config-policy"].ttl_seconds == 30
+        assert resolver._cache["no-policy"].ttl_seconds == 3600
+
+        # A cached miss serves the config default without querying the hub
+        calls = len(session.getTag_calls)
+        image = resolver.resolve_image(
+            tag_name="no-policy", arch="x86_64", task_type="buildArch"
+        )
+        assert image == adj_config.adjutant_task_image_default()
+        assert len(session.getTag_calls) == calls
+
+        # An expired build config entry is fetched again
+        cached = resolver._cache["build-config-policy"]
+        cached.cached_at = time.monotonic() - 31  # Expired
+        resolver.resolve_image(
+            tag_name="build-config-policy", arch="x86_64", task_type="buildArch"
+        )
+        assert len(session.getTag_calls) == calls + 1
 
 
 class TestBackwardCompatibility:
@@ -605,7 +683,8 @@ class TestBackwardCompatibility:
 
     def test_config_defaults_match_phase1(self, monkeypatch):
         """Test that config defaults match Phase 1 hardcoded values."""
-        adj_config.reset_config()
+        monkeypatch.setattr(adj_config, "_config", None)
+        monkeypatch.setattr(adj_config, "_options", None)
         monkeypatch.setattr(adj_config, "koji", None)
 
         # Should match Phase 1 defaults
@@ -22,19 +22,22 @@ except Exception:
     NotFound = Exception  # type: ignore[assignment]
     PODMAN_AVAILABLE = False
 
-from koji_adjutant.container.interface import InMemoryLogSink
-from koji_adjutant.container.podman_manager import PodmanManager
 from koji_adjutant.task_adapters.base import TaskContext
 from koji_adjutant.task_adapters.logging import FileKojiLogSink
 from koji_adjutant.task_adapters.rebuild_srpm import RebuildSRPMAdapter
 
-# Configure test logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+# Koji task logger handed to the log sinks
+_TEST_KOJI_LOGGER = logging.getLogger("test.koji")
 
 # Test image - use a minimal image available in most environments
 TEST_IMAGE = os.environ.get("KOJI_ADJUTANT_TEST_IMAGE", "docker.io/almalinux/9-minimal:latest")
 
+# Task id shared by every test context in this module
+TASK_ID = 99999
+SRPM_PATH = f"work/{TASK_ID}/work/test-package-1.0-1.src.rpm"
+SRPM_CONTENT = b"TEST_SRPM_CONTENT\n"
+
 # Skip marker for tests requiring Podman
 requires_podman = pytest.mark.skipif(
     not PODMAN_AVAILABLE,
@@ -42,25 +45,10 @@ requires_podman = pytest.mark.skipif(
 )
 
 
-@pytest.fixture(scope="module")
-def podman_available():
-    """Check if Podman is available and accessible."""
-    if not PODMAN_AVAILABLE:
-        pytest.skip("Podman Python API not available")
-
-    # Try to create a client and verify it works
-    try:
-        client = PodmanClient()
-        client.containers.list(all=True)
-        return True
-    except Exception as e:
-        pytest.skip(f"Podman not accessible: {e}")
-
-
-@pytest.fixture
-def temp_koji_root(tmp_path):
-    """Create a temporary /mnt/koji-like directory structure."""
-    koji_root = tmp_path / "mnt" / "koji"
+@pytest.fixture(scope="session")
+def temp_koji_root(tmp_path_factory):
+    """Create a temporary /mnt/koji-like directory structure shared by all tests."""
+    koji_root = tmp_path_factory.mktemp("koji_root") / "mnt" / "koji"
     koji_root.mkdir(parents=True, exist_ok=True)
 
     # Create standard subdirectories
@@ -72,62 +60,59 @@ def temp_koji_root(tmp_path):
 
 
 @pytest.fixture
-def test_task_context(temp_koji_root):
+def test_task_context(temp_koji_root, tmp_path_factory):
     """Create a TaskContext for testing."""
-    task_id = 99999
-    work_dir = temp_koji_root / "work" / str(task_id)
-    work_dir.mkdir(parents=True, exist_ok=True)
+    # A fresh work directory per test keeps writes isolated
+    work_dir = tmp_path_factory.mktemp(f"task_{TASK_ID}")
 
     return TaskContext(
-        task_id=task_id,
+        task_id=TASK_ID,
         work_dir=work_dir,
         koji_mount_root=temp_koji_root,
         environment={"TEST": "1"},
     )
 
 
-@pytest.fixture
-def podman_manager():
-    """Create a PodmanManager instance for testing."""
-    return PodmanManager(
-        pull_always=False,
-        network_default=True,
-        worker_id="test-worker",
-    )
+@pytest.fixture(scope="module")
+def adapter() -> RebuildSRPMAdapter:
+    """Share one RebuildSRPMAdapter across the tests in this module."""
+    return RebuildSRPMAdapter()
 
 
-def ensure_image_available(manager: PodmanManager, image: str) -> bool:
-    """Helper to ensure test image is available, skip test if not."""
+@pytest.fixture(scope="session")
+def log_dir(temp_koji_root):
+    """Create the task log directory under the shared koji root once."""
+    path = temp_koji_root / "logs" / str(TASK_ID)
+    path.mkdir()
+    return path
+
+
+@pytest.fixture(scope="session")
+def session_image(podman_available, session_podman_manager):
+    """Ensure the test image is available once; skip dependent tests if not."""
     try:
-        manager.ensure_image_available(image)
-        return True
+        session_podman_manager.ensure_image_available(TEST_IMAGE)
     except Exception as e:
         pytest.skip(f"Test image not available: {e}")
+    return TEST_IMAGE
 
 
-@pytest.fixture
-def minimal_test_srpm(test_task_context):
-    """Create a minimal test SRPM file for testing."""
-    # Create a minimal SRPM-like structure
-    # In a real scenario, this would be a valid SRPM file
-    work_dir = test_task_context.work_dir
-    (work_dir / "work").mkdir(exist_ok=True)
-    
-    # Create a dummy SRPM file path
-    srpm_path = work_dir / "work" / "test-package-1.0-1.src.rpm"
-    # Write minimal content (not a real SRPM, but sufficient for structure testing)
-    srpm_path.write_bytes(b"TEST_SRPM_CONTENT\n")
-    
+@pytest.fixture(scope="session")
+def minimal_test_srpm(tmp_path_factory):
+    """Write a minimal test SRPM file once; tests only refer to its path."""
+    srpm_path = tmp_path_factory.mktemp("srpm") / "test-package-1.0-1.src.rpm"
+    # Not a real SRPM, but sufficient for structure testing
+    srpm_path.write_bytes(SRPM_CONTENT)
     return srpm_path
 
 
 @requires_podman
 def test_rebuild_srpm_real_container(
-    podman_available,
-    podman_manager,
+    adapter,
+    session_image,
     test_task_context,
     minimal_test_srpm,
-    tmp_path,
+    log_dir,
 ):
     """Test RebuildSRPM adapter with real podman container.
     
@@ -137,20 +122,11 @@ def test_rebuild_srpm_real_container(
     3. Container cleanup
     4. Result collection
     """
-    manager = podman_manager
-    ensure_image_available(manager, TEST_IMAGE)
-
-    adapter = RebuildSRPMAdapter()
-    
-    # Create log sink
-    log_dir = test_task_context.koji_mount_root / "logs" / str(test_task_context.task_id)
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / "container.log"
-    sink = FileKojiLogSink(logging.getLogger("test.koji"), log_file)
+    sink = None
 
     # Task parameters
     task_params = {
-        "srpm": f"work/{test_task_context.task_id}/work/test-package-1.0-1.src.rpm",
+        "srpm": SRPM_PATH,
         "build_tag": "test-build",
         "opts": {"repo_id": 1},
     }
@@ -163,7 +139,10 @@ def test_rebuild_srpm_real_container(
         # Note: This will fail if buildroot not enabled, but validates adapter structure
         # For full integration, we'd need buildroot initialization
         spec = adapter.build_spec(test_task_context, task_params, session=mock_session)
-        
+
+        # Create the log sink only once there is a container to log
+        sink = FileKojiLogSink(_TEST_KOJI_LOGGER, log_dir / "container.log")
+
         # Verify spec is valid
         assert spec.image is not None
         assert len(spec.command) > 0
@@ -172,9 +151,10 @@ def test_rebuild_srpm_real_container(
         assert spec.remove_after_exit is True
         
         # Verify mounts include work directory
-        assert any(
-            m.target == Path(f"/work/{test_task_context.task_id}") for m in spec.mounts
-        ), "Should mount work directory"
+        mount_targets = {m.target for m in spec.mounts}
+        assert Path(f"/work/{TASK_ID}") in mount_targets, (
+            "Should mount work directory"
+        )
         
         logger.info("RebuildSRPM adapter spec validation passed")
         
@@ -184,13 +164,12 @@ def test_rebuild_srpm_real_container(
         assert "buildroot" in str(e).lower() or "repo_id" in str(e).lower()
     
     finally:
-        sink.close()
+        if sink is not None:
+            sink.close()
 
 
-@requires_podman
 def test_rebuild_srpm_container_spec_validation(
-    podman_available,
-    podman_manager,
+    adapter,
     test_task_context,
     minimal_test_srpm,
 ):
@@ -199,13 +178,8 @@ def test_rebuild_srpm_container_spec_validation(
     This validates the adapter's build_spec method without requiring
     full buildroot initialization.
     """
-    manager = podman_manager
-    ensure_image_available(manager, TEST_IMAGE)
-
-    adapter = RebuildSRPMAdapter()
-    
     task_params = {
-        "srpm": f"work/{test_task_context.task_id}/work/test-package-1.0-1.src.rpm",
+        "srpm": SRPM_PATH,
         "build_tag": "test-build",
         "opts": {"repo_id": 1},
     }
@@ -228,15 +202,8 @@ def test_rebuild_srpm_container_spec_validation(
     logger.info("ContainerSpec validation passed")
 
 
-@requires_podman
-def test_rebuild_srpm_error_handling(
-    podman_available,
-    podman_manager,
-    test_task_context,
-):
+def test_rebuild_srpm_error_handling(adapter, test_task_context):
     """Test RebuildSRPM adapter error handling."""
-    adapter = RebuildSRPMAdapter()
-    
     # Test missing repo_id
     task_params_no_repo = {
         "srpm": "work/12345/test.src.rpm",
@@ -0,0 +1,46 @@
+"""Lightweight fakes for unit tests."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any, List
+
+# Canned BuildrootInitializer.initialize() result; adapters only read it,
+# so tests share this dict
+BUILDROOT_INIT = {
+    "repo_file_content": "[koji-repo]\n",
+    "repo_file_dest": "/etc/yum.repos.d/koji.repo",
+    "macros_file_content": "%dist .almalinux10\n",
+    "macros_file_dest": "/etc/rpm/macros.koji",
+    "init_commands": [["mkdir", "-p", "/work/12345/build"]],
+    "build_command": ["echo", "test"],
+    "environment": {},
+}
+
+
+class ExecRecorder:
+    """Stand-in for ContainerManager.exec that records each command.
+
+    Returns the given exit codes in turn, repeating the last one.
+    ``calls`` holds the commands and ``handles`` the container handle of
+    each call, in order.
+    """
+
+    __slots__ = ("calls", "handles", "_exit_codes")
+
+    def __init__(self, *exit_codes: int) -> None:
+        self.calls: List[List[str]] = []
+        self.handles: List[Any] = []
+        self._exit_codes = list(exit_codes) or [0]
+
+    def __call__(self, handle, command, sink, environment=None) -> int:
+        self.calls.append(command)
+        self.handles.append(handle)
+        if len(self._exit_codes) > 1:
+            return self._exit_codes.pop(0)
+        return self._exit_codes[0]
+
+
+def exec_manager(*exit_codes: int) -> SimpleNamespace:
+    """Build a container manager offering only a recording exec()."""
+    return SimpleNamespace(exec=ExecRecorder(*exit_codes))
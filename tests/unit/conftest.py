@@ -0,0 +1,42 @@
+"""Fixtures shared by the task adapter unit tests.
+
+An adapter test module names the module under test in ``ADAPTER_MODULE``
+and opts in with ``pytestmark = pytest.mark.usefixtures("fake_adj_config")``.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from ._fakes import BUILDROOT_INIT
+
+
+@pytest.fixture
+def fake_adj_config(request, monkeypatch):
+    """Replace the adapter module's config with plain callables.
+
+    A setting the adapter starts reading without a stub here fails with
+    AttributeError rather than falling through to the real config
+    lookups. Tests adjust settings by reassigning attributes, e.g.
+    ``fake_adj_config.adjutant_buildroot_enabled = lambda: True``.
+    """
+    config = SimpleNamespace(
+        adjutant_policy_enabled=lambda: False,
+        adjutant_task_image_default=lambda: "test-image:latest",
+        adjutant_buildroot_enabled=lambda: False,
+    )
+    monkeypatch.setattr(request.module.ADAPTER_MODULE, "adj_config", config)
+    return config
+
+
+@pytest.fixture
+def patched_run_env(fake_adj_config, request, monkeypatch):
+    """Enable the buildroot and stub the adapter's initializer for run()."""
+    fake_adj_config.adjutant_buildroot_enabled = lambda: True
+    initializer = SimpleNamespace(initialize=lambda **kwargs: BUILDROOT_INIT)
+    monkeypatch.setattr(
+        request.module.ADAPTER_MODULE, "BuildrootInitializer", lambda session: initializer
+    )
+    return fake_adj_config
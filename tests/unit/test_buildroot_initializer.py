@@ -3,78 +3,128 @@
 from __future__ import annotations
 
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
+from koji_adjutant.buildroot import initializer as initializer_module
 from koji_adjutant.buildroot.initializer import BuildrootInitializer
 
 
+class _StubSession:
+    """Hub session answering the tag and repo lookups with fixed data."""
+
+    def getTag(self, tag, strict=False, event=None):
+        return {"id": 123, "name": "test-tag"}
+
+    def getRepo(self, tag, *args, **kwargs):
+        return {"id": 456}
+
+    def repoInfo(self, repo_id, *args, **kwargs):
+        return {"id": 456, "tag_id": 123}
+
+
+@pytest.fixture(scope="module")
+def initializer():
+    """Create a BuildrootInitializer shared by the module's tests."""
+    return BuildrootInitializer(_StubSession())
+
+
+# Canned results of the buildroot helpers stubbed out by stub_buildroot_modules
+STUB_BUILDREQUIRES = ["gcc", "make"]
+STUB_DEPENDENCIES = ["gcc", "make", "python3-devel"]
+STUB_REPO_CONFIG = "[koji-repo]\nbaseurl=file:///mnt/koji/repos\n"
+STUB_ENVIRONMENT = {
+    "KOJI_TASK_ID": "0",
+    "KOJI_BUILD_TAG": "test-tag",
+    "KOJI_ARCH": "x86_64",
+}
+STUB_MACROS = {
+    "dist": ".almalinux10",
+    "_topdir": "/work/12345",
+}
+
+
+# Macros shared by the formatting and build command tests
+MACROS = {
+    "dist": ".almalinux10",
+    "_topdir": "/work/12345",
+    "_builddir": "/work/12345/build",
+}
+SRPM_PATH = "/work/12345/work/test.src.rpm"
+
+
+@pytest.fixture(scope="module")
+def formatted_macros(initializer):
+    """Format MACROS once for all macros file cases."""
+    return initializer._format_macros_file(MACROS)
+
+
+@pytest.fixture(scope="module")
+def build_command(initializer):
+    """Generate the rpmbuild command for MACROS once."""
+    return initializer._generate_build_command(
+        work_dir=Path("/work/12345"),
+        srpm_path=SRPM_PATH,
+        macros=MACROS,
+    )
+
+
+@pytest.fixture
+def stub_buildroot_modules():
+    """Replace the dependency, repo and environment helpers used by initialize()."""
+    with patch.multiple(
+        initializer_module,
+        dependencies=SimpleNamespace(
+            extract_buildrequires_from_srpm=lambda srpm_path: list(STUB_BUILDREQUIRES),
+            resolve_build_dependencies=lambda **kwargs: list(STUB_DEPENDENCIES),
+        ),
+        repos=SimpleNamespace(generate_repo_config=lambda **kwargs: STUB_REPO_CONFIG),
+        environment=SimpleNamespace(
+            setup_build_environment=lambda **kwargs: dict(STUB_ENVIRONMENT),
+            generate_rpm_macros=lambda **kwargs: dict(STUB_MACROS),
+        ),
+    ):
+        yield
+
+
 class TestBuildrootInitializer:
     """Test BuildrootInitializer class."""
 
-    def test_initialize_returns_structured_data(self, tmp_path):
+    @pytest.mark.usefixtures("stub_buildroot_modules")
+    def test_initialize_returns_structured_data(self, initializer, tmp_path):
         """Test that initialize() returns structured data instead of script."""
-        session = MagicMock()
-        session.getTag.return_value = {"id": 123, "name": "test-tag"}
-        session.getRepo.return_value = {"id": 456}
-        session.repoInfo.return_value = {"id": 456, "tag_id": 123}
-
-        initializer = BuildrootInitializer(session)
-
         srpm_path = tmp_path / "test.src.rpm"
         srpm_path.write_bytes(b"fake srpm")
 
-        with patch("koji_adjutant.buildroot.dependencies") as mock_deps, \
-             patch("koji_adjutant.buildroot.repos") as mock_repos, \
-             patch("koji_adjutant.buildroot.environment") as mock_env:
-
-            # Mock dependencies
-            mock_deps.extract_buildrequires_from_srpm.return_value = ["gcc", "make"]
-            mock_deps.resolve_build_dependencies.return_value = ["gcc", "make", "python3-devel"]
-
-            # Mock repos
-            mock_repos.generate_repo_config.return_value = "[koji-repo]\nbaseurl=file:///mnt/koji/repos\n"
-
-            # Mock environment
-            mock_env.setup_build_environment.return_value = {
-                "KOJI_TASK_ID": "0",
-                "KOJI_BUILD_TAG": "test-tag",
-                "KOJI_ARCH": "x86_64",
-            }
-            mock_env.generate_rpm_macros.return_value = {
-                "dist": ".almalinux10",
-                "_topdir": "/work/12345",
-            }
-
-            result = initializer.initialize(
-                srpm_path=srpm_path,
-                build_tag="test-tag",
-                arch="x86_64",
-                work_dir=Path("/work/12345"),
-                repo_id=456,
-            )
-
-            # Verify new structure
-            assert "repo_file_content" in result
-            assert "repo_file_dest" in result
-            assert result["repo_file_dest"] == "/etc/yum.repos.d/koji.repo"
-            assert "macros_file_content" in result
-            assert "macros_file_dest" in result
-            assert result["macros_file_dest"] == "/etc/rpm/macros.koji"
-            assert "init_commands" in result
-            assert isinstance(result["init_commands"], list)
-            assert "build_command" in result
-            assert isinstance(result["build_command"], list)
-            assert "environment" in result
-            assert "dependencies" in result
-
-            # Verify no script field (old structure)
-            assert "script" not in result
-
-    def test_init_commands_structure(self):
+        result = initializer.initialize(
+            srpm_path=srpm_path,
+            build_tag="test-tag",
+            arch="x86_64",
+            work_dir=Path("/work/12345"),
+            repo_id=456,
+        )
+
+        # Verify new structure
+        assert result["repo_file_content"] == STUB_REPO_CONFIG
+        assert "repo_file_dest" in result
+        assert result["repo_file_dest"] == "/etc/yum.repos.d/koji.repo"
+        assert "macros_file_content" in result
+        assert "macros_file_dest" in result
+        assert result["macros_file_dest"] == "/etc/rpm/macros.koji"
+        assert "init_commands" in result
+        assert isinstance(result["init_commands"], list)
+        assert "build_command" in result
+        assert isinstance(result["build_command"], list)
+        assert result["environment"] == STUB_ENVIRONMENT
+        assert result["dependencies"] == STUB_DEPENDENCIES
+
+        # Verify no script field (old structure)
+        assert "script" not in result
+
+    def test_init_commands_structure(self, initializer):
         """Test that init_commands are properly structured."""
-        initializer = BuildrootInitializer(MagicMock())
 
         commands = initializer._generate_init_commands(
             work_dir=Path("/work/12345"),
@@ -91,40 +141,20 @@ class TestBuildrootInitializer:
             assert commands[1][0] == "dnf"
             assert "install" in commands[1]
 
-    def test_format_macros_file(self):
+    @pytest.mark.parametrize("name,value", MACROS.items(), ids=list(MACROS))
+    def test_format_macros_file(self, formatted_macros, name, value):
         """Test macros file formatting."""
-        initializer = BuildrootInitializer(MagicMock())
-
-        macros = {
-            "dist": ".almalinux10",
-            "_topdir": "/work/12345",
-            "_builddir": "/work/12345/build",
-        }
+        assert f"%{name} {value}\n" in formatted_macros
+        assert formatted_macros.endswith("\n")
 
-        content = initializer._format_macros_file(macros)
-
-        assert "%dist .almalinux10" in content
-        assert "%_topdir /work/12345" in content
-        assert "%_builddir /work/12345/build" in content
-        assert content.endswith("\n")
-
-    def test_generate_build_command(self):
+    def test_generate_build_command(self, build_command):
         """Test build command generation."""
-        initializer = BuildrootInitializer(MagicMock())
-
-        macros = {
-            "dist": ".almalinux10",
-            "_topdir": "/work/12345",
-        }
-
-        command = initializer._generate_build_command(
-            work_dir=Path("/work/12345"),
-            srpm_path="/work/12345/work/test.src.rpm",
-            macros=macros,
-        )
-
-        assert command[0] == "rpmbuild"
-        assert "--rebuild" in command
-        assert "/work/12345/work/test.src.rpm" in command
-        assert "--define" in command
-        assert "dist .almalinux10" in command or any("dist" in str(c) for c in command)
+        assert build_command[0] == "rpmbuild"
+        assert "--rebuild" in build_command
+        assert SRPM_PATH in build_command
+
+    @pytest.mark.parametrize("name,value", MACROS.items(), ids=list(MACROS))
+    def test_generate_build_command_defines(self, build_command, name, value):
+        """Test each macro is passed to rpmbuild with --define."""
+        index = build_command.index(f"{name} {value}")
+        assert build_command[index - 1] == "--define"
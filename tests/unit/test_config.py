@@ -2,22 +2,42 @@
 
 from __future__ import annotations
 
-import os
-import tempfile
-from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 
 from koji_adjutant import config as adj_config
 
 
+class _MockKoji:
+    """Stand-in for the koji module returning ``config`` as parsed files."""
+
+    config: dict = {}
+
+    @staticmethod
+    def read_config_files(files=None):
+        return _MockKoji.config
+
+
+@pytest.fixture(autouse=True)
+def _isolated_config(monkeypatch):
+    """Start every test with no cached config, options object or config file.
+
+    koji is replaced by _MockKoji so that no test reads the host's
+    kojid.conf; tests provide file contents through ``_MockKoji.config``.
+    monkeypatch restores the previous module state afterwards, so nothing
+    leaks into other tests sharing the process (e.g. under pytest-xdist).
+    """
+    monkeypatch.setattr(adj_config, "_config", None)
+    monkeypatch.setattr(adj_config, "_options", None)
+    monkeypatch.setattr(adj_config, "koji", _MockKoji)
+
+
 class TestConfigParsing:
     """Test config file parsing."""
 
     def test_defaults_without_config(self, monkeypatch):
         """Test that defaults work when no config file exists."""
-        # Reset config cache
-        adj_config.reset_config()
         # Ensure no config file is found
         monkeypatch.delenv("KOJI_CONFIG", raising=False)
         monkeypatch.setattr(adj_config, "koji", None)
@@ -28,9 +48,20 @@ class TestConfigParsing:
         assert adj_config.adjutant_policy_enabled() is True
         assert adj_config.adjutant_policy_cache_ttl() == 300
 
+    def test_container_defaults_not_shared(self, monkeypatch):
+        """Test that mutating a returned default doesn't change the next call."""
+        monkeypatch.delenv("KOJI_ADJUTANT_CONTAINER_MOUNTS", raising=False)
+        monkeypatch.delenv("KOJI_ADJUTANT_CONTAINER_TIMEOUTS", raising=False)
+        monkeypatch.setattr(adj_config, "koji", None)
+
+        adj_config.adjutant_container_mounts().append("/tmp:/tmp:rw")
+        adj_config.adjutant_container_timeouts()["pull"] = 1
+
+        assert adj_config.adjutant_container_mounts() == ["/mnt/koji:/mnt/koji:rw:Z"]
+        assert adj_config.adjutant_container_timeouts()["pull"] == 300
+
     def test_env_var_overrides(self, monkeypatch):
         """Test that environment variables override defaults."""
-        adj_config.reset_config()
         monkeypatch.setenv("KOJI_ADJUTANT_TASK_IMAGE_DEFAULT", "custom/image:tag")
         monkeypatch.setenv("KOJI_ADJUTANT_IMAGE_PULL_POLICY", "always")
         monkeypatch.setenv("KOJI_ADJUTANT_NETWORK_ENABLED", "false")
@@ -45,76 +76,60 @@ class TestConfigParsing:
 
     def test_config_file_parsing(self, monkeypatch):
         """Test parsing from config file."""
-        adj_config.reset_config()
-
-        # Create a temporary config file
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".conf") as f:
-            f.write(
-                """[adjutant]
-task_image_default = registry/test:latest
-image_pull_policy = always
-network_enabled = false
-policy_enabled = false
-policy_cache_ttl = 900
-container_mounts = /mnt/test:/mnt/test:rw:Z /other:/other:ro
-container_labels = key1=value1,key2=value2
-container_timeouts = pull=600,start=120,stop_grace=30
-"""
-            )
-            config_file = f.name
-
-        try:
-            monkeypatch.setenv("KOJI_CONFIG", config_file)
-            # Mock koji.read_config_files
-            mock_config = {
-                "adjutant": {
-                    "task_image_default": "registry/test:latest",
-                    "image_pull_policy": "always",
-                    "network_enabled": "false",
-                    "policy_enabled": "false",
-                    "policy_cache_ttl": "900",
-                    "container_mounts": "/mnt/test:/mnt/test:rw:Z /other:/other:ro",
-                    "container_labels": "key1=value1,key2=value2",
-                    "container_timeouts": "pull=600,start=120,stop_grace=30",
-                }
+        # Mock koji.read_config_files
+        mock_config = {
+            "adjutant": {
+                "task_image_default": "registry/test:latest",
+                "image_pull_policy": "always",
+                "network_enabled": "false",
+                "policy_enabled": "false",
+                "policy_cache_ttl": "900",
+                "container_mounts": "/mnt/test:/mnt/test:rw:Z /other:/other:ro",
+                "container_labels": "key1=value1,key2=value2",
+                "container_timeouts": "pull=600,start=120,stop_grace=30",
             }
+        }
 
-            # Mock koji module
-            class MockKoji:
-                @staticmethod
-                def read_config_files(files=None):
-                    return mock_config
+        read_config_files = MagicMock(return_value=mock_config)
+        monkeypatch.setattr(_MockKoji, "read_config_files", read_config_files)
 
-            monkeypatch.setattr(adj_config, "koji", MockKoji)
+        assert adj_config.adjutant_task_image_default() == "registry/test:latest"
+        assert adj_config.adjutant_image_pull_policy() == "always"
+        assert adj_config.adjutant_network_enabled() is False
+        assert adj_config.adjutant_policy_enabled() is False
+        assert adj_config.adjutant_policy_cache_ttl() == 900
 
-            assert adj_config.adjutant_task_image_default() == "registry/test:latest"
-            assert adj_config.adjutant_image_pull_policy() == "always"
-            assert adj_config.adjutant_network_enabled() is False
-            assert adj_config.adjutant_policy_enabled() is False
-            assert adj_config.adjutant_policy_cache_ttl() == 900
+        mounts = adj_config.adjutant_container_mounts()
+        assert len(mounts) == 2
+        assert "/mnt/test:/mnt/test:rw:Z" in mounts
+        assert "/other:/other:ro" in mounts
+
+        labels = adj_config.adjutant_container_labels()
+        assert labels["key1"] == "value1"
+        assert labels["key2"] == "value2"
 
-            mounts = adj_config.adjutant_container_mounts()
-            assert len(mounts) == 2
-            assert "/mnt/test:/mnt/test:rw:Z" in mounts
-            assert "/other:/other:ro" in mounts
+        timeouts = adj_config.adjutant_container_timeouts()
+        assert timeouts["pull"] == 600
+        assert timeouts["start"] == 120
+        assert timeouts["stop_grace"] == 30
 
-            labels = adj_config.adjutant_container_labels()
-            assert labels["key1"] == "value1"
-            assert labels["key2"] == "value2"
+        # The file is read once and shared by every accessor
+        read_config_files.assert_called_once()
 
-            timeouts = adj_config.adjutant_container_timeouts()
-            assert timeouts["pull"] == 600
-            assert timeouts["start"] == 120
-            assert timeouts["stop_grace"] == 30
+    def test_config_file_read_error_logged(self, monkeypatch, caplog):
+        """Test an unreadable config file falls back to defaults with a warning."""
+        read_config_files = MagicMock(side_effect=ValueError("bad line 3"))
+        monkeypatch.setattr(_MockKoji, "read_config_files", read_config_files)
+        monkeypatch.delenv("KOJI_ADJUTANT_TASK_IMAGE_DEFAULT", raising=False)
 
-        finally:
-            os.unlink(config_file)
+        with caplog.at_level("WARNING", logger=adj_config.logger.name):
+            assert adj_config.adjutant_task_image_default() == "registry/almalinux:10"
 
-    def test_bool_parsing(self, monkeypatch):
-        """Test boolean value parsing."""
-        adj_config.reset_config()
+        assert "bad line 3" in caplog.text
 
-        test_cases = [
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
             ("true", True),
             ("True", True),
             ("1", True),
@@ -125,35 +140,30 @@ container_timeouts = pull=600,start=120,stop_grace=30
             ("0", False),
             ("no", False),
             ("off", False),
-        ]
-
-        for value, expected in test_cases:
-            monkeypatch.setenv("KOJI_ADJUTANT_NETWORK_ENABLED", value)
-            assert adj_config.adjutant_network_enabled() == expected
-
-    def test_mounts_parsing(self, monkeypatch):
-        """Test mount specification parsing."""
-        adj_config.reset_config()
+            ("", False),
+        ],
+    )
+    def test_bool_parsing(self, monkeypatch, value, expected):
+        """Test boolean value parsing."""
+        monkeypatch.setenv("KOJI_ADJUTANT_NETWORK_ENABLED", value)
+        assert adj_config.adjutant_network_enabled() is expected
 
-        # Test space-separated
-        monkeypatch.setenv(
-            "KOJI_ADJUTANT_CONTAINER_MOUNTS",
+    @pytest.mark.parametrize(
+        "value",
+        [
             "/mnt/koji:/mnt/koji:rw:Z /other:/other:ro",
-        )
-        mounts = adj_config.adjutant_container_mounts()
-        assert len(mounts) == 2
-
-        # Test comma-separated
-        monkeypatch.setenv(
-            "KOJI_ADJUTANT_CONTAINER_MOUNTS", "/mnt/koji:/mnt/koji:rw:Z,/other:/other:ro"
-        )
+            "/mnt/koji:/mnt/koji:rw:Z,/other:/other:ro",
+        ],
+        ids=["space-separated", "comma-separated"],
+    )
+    def test_mounts_parsing(self, monkeypatch, value):
+        """Test mount specification parsing."""
+        monkeypatch.setenv("KOJI_ADJUTANT_CONTAINER_MOUNTS", value)
         mounts = adj_config.adjutant_container_mounts()
-        assert len(mounts) == 2
+        assert mounts == ["/mnt/koji:/mnt/koji:rw:Z", "/other:/other:ro"]
 
     def test_labels_parsing(self, monkeypatch):
         """Test label parsing."""
-        adj_config.reset_config()
-
         monkeypatch.setenv("KOJI_ADJUTANT_CONTAINER_LABELS", "key1=value1,key2=value2")
         labels = adj_config.adjutant_container_labels()
         assert labels["key1"] == "value1"
@@ -161,8 +171,6 @@ container_timeouts = pull=600,start=120,stop_grace=30
 
     def test_timeouts_parsing(self, monkeypatch):
         """Test timeout parsing."""
-        adj_config.reset_config()
-
         monkeypatch.setenv(
             "KOJI_ADJUTANT_CONTAINER_TIMEOUTS", "pull=600,start=120,stop_grace=30"
         )
@@ -171,10 +179,20 @@ container_timeouts = pull=600,start=120,stop_grace=30
         assert timeouts["start"] == 120
         assert timeouts["stop_grace"] == 30
 
+    def test_timeouts_parsing_memoized(self, monkeypatch):
+        """Test an unchanged timeouts string is tokenized only once."""
+        monkeypatch.setenv("KOJI_ADJUTANT_CONTAINER_TIMEOUTS", "pull=600,start=120")
+        adj_config._split_timeouts.cache_clear()
+
+        for _ in range(5):
+            assert adj_config.adjutant_container_timeouts() == {"pull": 600, "start": 120}
+
+        info = adj_config._split_timeouts.cache_info()
+        assert info.misses == 1
+        assert info.hits == 4
+
     def test_env_overrides_config(self, monkeypatch):
         """Test that env vars override config file values."""
-        adj_config.reset_config()
-
         # Mock config file with one value
         mock_config = {
             "adjutant": {
@@ -182,12 +200,7 @@ container_timeouts = pull=600,start=120,stop_grace=30
             }
         }
 
-        class MockKoji:
-            @staticmethod
-            def read_config_files(files=None):
-                return mock_config
-
-        monkeypatch.setattr(adj_config, "koji", MockKoji)
+        monkeypatch.setattr(_MockKoji, "config", mock_config)
 
         # Env var should override
         monkeypatch.setenv("KOJI_ADJUTANT_TASK_IMAGE_DEFAULT", "env/image:tag")
@@ -203,7 +216,6 @@ class TestConfigInitialization:
 
     def test_initialize_stores_options_object(self, monkeypatch):
         """Test config.initialize() stores options object."""
-        adj_config.reset_config()
         monkeypatch.delenv("KOJI_ADJUTANT_TASK_IMAGE_DEFAULT", raising=False)
 
         # Create mock options object with adjutant_* attributes
@@ -223,7 +235,6 @@ class TestConfigInitialization:
 
     def test_config_value_from_options_object(self, monkeypatch):
         """Test reading config value from initialized options object."""
-        adj_config.reset_config()
         monkeypatch.delenv("KOJI_ADJUTANT_TASK_IMAGE_DEFAULT", raising=False)
 
         # Create mock options with various adjutant_* attributes
@@ -246,15 +257,11 @@ class TestConfigInitialization:
 
     def test_fallback_to_defaults_when_not_initialized(self, monkeypatch):
         """Test fallback to defaults when options object not initialized."""
-        adj_config.reset_config()
         monkeypatch.delenv("KOJI_ADJUTANT_TASK_IMAGE_DEFAULT", raising=False)
         monkeypatch.delenv("KOJI_ADJUTANT_IMAGE_PULL_POLICY", raising=False)
         monkeypatch.delenv("KOJI_ADJUTANT_NETWORK_ENABLED", raising=False)
         monkeypatch.delenv("KOJI_ADJUTANT_POLICY_CACHE_TTL", raising=False)
 
-        # Ensure _options is None (not initialized)
-        adj_config.reset_config()
-
         # Verify defaults are used
         assert adj_config.adjutant_task_image_default() == "registry/almalinux:10"
         assert adj_config.adjutant_image_pull_policy() == "if-not-present"
@@ -263,8 +270,6 @@ class TestConfigInitialization:
 
     def test_precedence_env_var_over_options(self, monkeypatch):
         """Test env var takes precedence over options object."""
-        adj_config.reset_config()
-
         # Create mock options with one value
         class MockOptions:
             adjutant_task_image_default = "options/image:tag"
@@ -295,7 +300,6 @@ class TestConfigInitialization:
 
     def test_precedence_options_over_defaults(self, monkeypatch):
         """Test options object takes precedence over defaults."""
-        adj_config.reset_config()
         monkeypatch.delenv("KOJI_ADJUTANT_TASK_IMAGE_DEFAULT", raising=False)
         monkeypatch.delenv("KOJI_ADJUTANT_IMAGE_PULL_POLICY", raising=False)
 
@@ -313,7 +317,6 @@ class TestConfigInitialization:
 
     def test_options_with_string_type(self, monkeypatch):
         """Test options object with string values."""
-        adj_config.reset_config()
         monkeypatch.delenv("KOJI_ADJUTANT_TASK_IMAGE_DEFAULT", raising=False)
         monkeypatch.delenv("KOJI_ADJUTANT_IMAGE_PULL_POLICY", raising=False)
 
@@ -334,7 +337,6 @@ class TestConfigInitialization:
 
     def test_options_with_bool_type(self, monkeypatch):
         """Test options object with boolean values."""
-        adj_config.reset_config()
         monkeypatch.delenv("KOJI_ADJUTANT_NETWORK_ENABLED", raising=False)
         monkeypatch.delenv("KOJI_ADJUTANT_POLICY_ENABLED", raising=False)
 
@@ -364,7 +366,6 @@ class TestConfigInitialization:
 
     def test_options_with_int_type(self, monkeypatch):
         """Test options object with integer values."""
-        adj_config.reset_config()
         monkeypatch.delenv("KOJI_ADJUTANT_POLICY_CACHE_TTL", raising=False)
         monkeypatch.delenv("KOJI_ADJUTANT_MONITORING_CONTAINER_HISTORY_TTL", raising=False)
 
@@ -397,7 +398,6 @@ class TestConfigInitialization:
 
     def test_options_missing_attribute_falls_back(self, monkeypatch):
         """Test that missing attributes in options object fall back to defaults."""
-        adj_config.reset_config()
         monkeypatch.delenv("KOJI_ADJUTANT_TASK_IMAGE_DEFAULT", raising=False)
         monkeypatch.delenv("KOJI_ADJUTANT_IMAGE_PULL_POLICY", raising=False)
 
@@ -416,8 +416,7 @@ class TestConfigInitialization:
         assert adj_config.adjutant_image_pull_policy() == "if-not-present"
 
     def test_reset_config_clears_options(self, monkeypatch):
-        """Test that reset_config() clears both _config and _options."""
-        adj_config.reset_config()
+        """Test that reset_config() clears _config, _options and parse caches."""
         monkeypatch.delenv("KOJI_ADJUTANT_TASK_IMAGE_DEFAULT", raising=False)
 
         # Initialize with options
@@ -428,8 +427,21 @@ class TestConfigInitialization:
         adj_config.initialize(options)
         assert adj_config.adjutant_task_image_default() == "options/image:tag"
 
+        # Memoize some parsed values
+        monkeypatch.setenv("KOJI_ADJUTANT_CONTAINER_MOUNTS", "/a:/a:rw")
+        monkeypatch.setenv("KOJI_ADJUTANT_CONTAINER_LABELS", "key=value")
+        monkeypatch.setenv("KOJI_ADJUTANT_CONTAINER_TIMEOUTS", "pull=1")
+        adj_config.adjutant_container_mounts()
+        adj_config.adjutant_container_labels()
+        adj_config.adjutant_container_timeouts()
+
         # Reset config
         adj_config.reset_config()
 
         # Should now use defaults
         assert adj_config.adjutant_task_image_default() == "registry/almalinux:10"
+
+        # Parsed values are no longer memoized
+        assert adj_config._split_mounts.cache_info().currsize == 0
+        assert adj_config._split_labels.cache_info().currsize == 0
+        assert adj_config._split_timeouts.cache_info().currsize == 0
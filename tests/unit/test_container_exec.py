@@ -2,26 +2,64 @@
 
 from __future__ import annotations
 
+import io
+import tarfile
+import threading
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
 from koji_adjutant.container.interface import ContainerError, ContainerHandle, InMemoryLogSink
+from koji_adjutant.container import podman_manager
 from koji_adjutant.container.podman_manager import PodmanManager
 
+HANDLE = ContainerHandle(container_id="test-container-id")
+
+
+def _archive_names(container):
+    """Record the member names of each archive passed to put_archive.
+
+    Small archives arrive as bytes; a file archive is closed once
+    put_archive returns, so it is read while the call is in progress.
+    """
+    uploads = []
+
+    def put_archive(path, data):
+        if isinstance(data, bytes):
+            data = io.BytesIO(data)
+        with tarfile.open(fileobj=data) as tar:
+            uploads.append(tar.getnames())
+        return True
+
+    container.put_archive.side_effect = put_archive
+    return uploads
+
+
+@pytest.fixture
+def podman_ctx():
+    """Return a PodmanManager wired to a mock client and container.
+
+    ``client.containers.get`` returns the container; tests only set the
+    side effects they need.
+    """
+    manager = PodmanManager()
+    client = MagicMock()
+    container = MagicMock()
+    client.containers.get.return_value = container
+    # Fills the lazily created client slot, so no real client is built
+    manager._client = client
+    return manager, client, container
+
 
 class TestPodmanManagerExec:
     """Test exec() method of PodmanManager."""
 
-    def test_exec_success(self):
+    def test_exec_success(self, podman_ctx):
         """Test successful command execution."""
-        manager = PodmanManager()
-        handle = ContainerHandle(container_id="test-container-id")
+        manager, client, container = podman_ctx
         sink = InMemoryLogSink()
 
-        # Mock container
-        mock_container = MagicMock()
         mock_chunk1 = (b"stdout output", None)
         mock_chunk2 = (None, b"stderr output")
         mock_chunk3 = (b"more stdout", None)
@@ -33,69 +71,53 @@ class TestPodmanManagerExec:
             else:
                 return (0, b"output")
 
-        mock_container.exec_run.side_effect = exec_run_side_effect
+        container.exec_run.side_effect = exec_run_side_effect
 
-        with patch.object(manager, "_ensure_client"):
-            manager._client = MagicMock()
-            manager._client.containers.get.return_value = mock_container
+        exit_code = manager.exec(HANDLE, ["/bin/echo", "test"], sink)
 
-            exit_code = manager.exec(handle, ["/bin/echo", "test"], sink)
+        assert exit_code == 0
+        assert b"stdout output" in sink.stdout
+        assert b"more stdout" in sink.stdout
+        assert b"stderr output" in sink.stderr
 
-            assert exit_code == 0
-            assert b"stdout output" in sink.stdout
-            assert b"more stdout" in sink.stdout
-            assert b"stderr output" in sink.stderr
-
-    def test_exec_failure(self):
+    def test_exec_failure(self, podman_ctx):
         """Test command execution with non-zero exit code."""
-        manager = PodmanManager()
-        handle = ContainerHandle(container_id="test-container-id")
+        manager, client, container = podman_ctx
         sink = InMemoryLogSink()
 
-        mock_container = MagicMock()
-
         def exec_run_side_effect(cmd, environment=None, stream=False, demux=False):
             if stream:
                 return iter([(b"error output", None)])
             else:
                 return (1, b"error output")
 
-        mock_container.exec_run.side_effect = exec_run_side_effect
+        container.exec_run.side_effect = exec_run_side_effect
 
-        with patch.object(manager, "_ensure_client"):
-            manager._client = MagicMock()
-            manager._client.containers.get.return_value = mock_container
+        exit_code = manager.exec(HANDLE, ["/bin/false"], sink)
 
-            exit_code = manager.exec(handle, ["/bin/false"], sink)
+        assert exit_code == 1
 
-            assert exit_code == 1
-
-    def test_exec_container_not_found(self):
+    def test_exec_container_not_found(self, podman_ctx):
         """Test exec() raises ContainerError when container not found."""
-        manager = PodmanManager()
+        manager, client, container = podman_ctx
         handle = ContainerHandle(container_id="nonexistent")
         sink = InMemoryLogSink()
 
         from podman.errors import NotFound
 
-        with patch.object(manager, "_ensure_client"):
-            manager._client = MagicMock()
-            manager._client.containers.get.side_effect = NotFound("container not found")
+        client.containers.get.side_effect = NotFound("container not found")
 
-            with pytest.raises(ContainerError) as exc_info:
-                manager.exec(handle, ["/bin/echo", "test"], sink)
+        with pytest.raises(ContainerError) as exc_info:
+            manager.exec(handle, ["/bin/echo", "test"], sink)
 
-            assert "container not found" in str(exc_info.value).lower()
+        assert "container not found" in str(exc_info.value).lower()
 
-    def test_exec_with_environment(self):
+    def test_exec_with_environment(self, podman_ctx):
         """Test exec() with custom environment variables."""
-        manager = PodmanManager()
-        handle = ContainerHandle(container_id="test-container-id")
+        manager, client, container = podman_ctx
         sink = InMemoryLogSink()
         env = {"TEST_VAR": "test_value"}
 
-        mock_container = MagicMock()
-
         def exec_run_side_effect(cmd, environment=None, stream=False, demux=False):
             if stream:
                 return iter([(b"output", None)])
@@ -104,108 +126,177 @@ class TestPodmanManagerExec:
                 assert environment == env
                 return (0, b"output")
 
-        mock_container.exec_run.side_effect = exec_run_side_effect
+        container.exec_run.side_effect = exec_run_side_effect
+
+        exit_code = manager.exec(HANDLE, ["/bin/env"], sink, environment=env)
+
+        assert exit_code == 0
+
+    def test_exec_coalesces_output_frames(self, podman_ctx):
+        """Test consecutive frames from one stream reach the sink as one write."""
+        manager, client, container = podman_ctx
+        sink = MagicMock()
+
+        frames = [(b"line 1\n", None), (b"line 2\n", None), (None, b"warn\n"), (b"line 3\n", None)]
 
-        with patch.object(manager, "_ensure_client"):
-            manager._client = MagicMock()
-            manager._client.containers.get.return_value = mock_container
+        container.exec_run.return_value = (0, iter(frames))
 
-            exit_code = manager.exec(handle, ["/bin/env"], sink, environment=env)
+        exit_code = manager.exec(HANDLE, ["/bin/echo", "test"], sink)
 
-            assert exit_code == 0
+        assert exit_code == 0
+        assert sink.write_stdout.call_args_list[0].args == (b"line 1\nline 2\n",)
+        assert sink.write_stderr.call_args_list[0].args == (b"warn\n",)
+        assert sink.write_stdout.call_args_list[1].args == (b"line 3\n",)
+        assert sink.method_calls[1][0] == "write_stderr"
+
+    def test_exec_flushes_output_before_quiet_spell(self, podman_ctx):
+        """Test buffered output reaches the sink while the command is silent."""
+        manager, client, container = podman_ctx
+        written = threading.Event()
+        sink = MagicMock()
+        sink.write_stdout.side_effect = lambda data: written.set()
+        flushed_while_silent = []
+
+        def frames():
+            yield (b"compiling...\n", None)
+            # No further output until the age limit has flushed the batch
+            flushed_while_silent.append(written.wait(timeout=5))
+            yield (b"done\n", None)
+
+        container.exec_run.return_value = (0, frames())
+
+        exit_code = manager.exec(HANDLE, ["/usr/bin/make"], sink)
+
+        assert exit_code == 0
+        assert flushed_while_silent == [True]
+        assert sink.write_stdout.call_args_list[0].args == (b"compiling...\n",)
+        assert sink.write_stdout.call_args_list[1].args == (b"done\n",)
 
 
 class TestPodmanManagerCopyTo:
     """Test copy_to() method of PodmanManager."""
 
-    def test_copy_to_success(self, tmp_path):
+    def test_copy_to_success(self, podman_ctx, tmp_path):
         """Test successful file copy to container."""
-        manager = PodmanManager()
-        handle = ContainerHandle(container_id="test-container-id")
+        manager, client, container = podman_ctx
 
         # Create test file
         test_file = tmp_path / "test.txt"
         test_file.write_text("test content")
 
-        mock_container = MagicMock()
-        mock_container.put_archive.return_value = None
+        uploads = _archive_names(container)
 
-        with patch.object(manager, "_ensure_client"):
-            manager._client = MagicMock()
-            manager._client.containers.get.return_value = mock_container
+        manager.copy_to(HANDLE, test_file, "/etc/test.txt")
 
-            manager.copy_to(handle, test_file, "/etc/test.txt")
+        # Verify put_archive was called with a streamed archive
+        assert container.put_archive.called
+        call_args = container.put_archive.call_args
+        assert call_args[1]["path"] == "/etc"
+        # A small archive stays in memory and is uploaded as bytes
+        assert isinstance(call_args[1]["data"], bytes)
+        assert uploads == [["test.txt"]]
+
+    def test_copy_to_large_file_spools_to_disk(self, podman_ctx, tmp_path, monkeypatch):
+        """Test an archive beyond the spool limit is uploaded from a file."""
+        manager, client, container = podman_ctx
+        monkeypatch.setattr(podman_manager, "_ARCHIVE_SPOOL_BYTES", 1024)
+
+        test_file = tmp_path / "big.bin"
+        test_file.write_bytes(b"x" * 4096)
 
-            # Verify put_archive was called
-            assert mock_container.put_archive.called
-            call_args = mock_container.put_archive.call_args
-            assert call_args[1]["path"] == "/etc"
-            assert isinstance(call_args[1]["data"], bytes)
+        uploads = _archive_names(container)
 
-    def test_copy_to_file_not_found(self):
+        manager.copy_to(HANDLE, test_file, "/tmp/big.bin")
+
+        assert not isinstance(container.put_archive.call_args[1]["data"], bytes)
+        assert uploads == [["big.bin"]]
+
+    def test_copy_to_file_not_found(self, podman_ctx):
         """Test copy_to() raises ContainerError when source file doesn't exist."""
-        manager = PodmanManager()
-        handle = ContainerHandle(container_id="test-container-id")
+        manager, client, container = podman_ctx
         nonexistent_file = Path("/nonexistent/file.txt")
 
-        with patch.object(manager, "_ensure_client"):
-            manager._client = MagicMock()
+        with pytest.raises(ContainerError) as exc_info:
+            manager.copy_to(HANDLE, nonexistent_file, "/etc/file.txt")
 
-            with pytest.raises(ContainerError) as exc_info:
-                manager.copy_to(handle, nonexistent_file, "/etc/file.txt")
+        assert "does not exist" in str(exc_info.value).lower()
 
-            assert "does not exist" in str(exc_info.value).lower()
-
-    def test_copy_to_directory_not_file(self, tmp_path):
+    def test_copy_to_directory_not_file(self, podman_ctx, tmp_path):
         """Test copy_to() raises ContainerError when source is a directory."""
-        manager = PodmanManager()
-        handle = ContainerHandle(container_id="test-container-id")
+        manager, client, container = podman_ctx
         test_dir = tmp_path / "testdir"
         test_dir.mkdir()
 
-        with patch.object(manager, "_ensure_client"):
-            manager._client = MagicMock()
-
-            with pytest.raises(ContainerError) as exc_info:
-                manager.copy_to(handle, test_dir, "/etc/testdir")
+        with pytest.raises(ContainerError) as exc_info:
+            manager.copy_to(HANDLE, test_dir, "/etc/testdir")
 
-            assert "not a file" in str(exc_info.value).lower()
+        assert "not a file" in str(exc_info.value).lower()
 
-    def test_copy_to_container_not_found(self, tmp_path):
+    def test_copy_to_container_not_found(self, podman_ctx, tmp_path):
         """Test copy_to() raises ContainerError when container not found."""
-        manager = PodmanManager()
+        manager, client, container = podman_ctx
         handle = ContainerHandle(container_id="nonexistent")
         test_file = tmp_path / "test.txt"
         test_file.write_text("test")
 
         from podman.errors import NotFound
 
-        with patch.object(manager, "_ensure_client"):
-            manager._client = MagicMock()
-            manager._client.containers.get.side_effect = NotFound("container not found")
+        client.containers.get.side_effect = NotFound("container not found")
 
-            with pytest.raises(ContainerError) as exc_info:
-                manager.copy_to(handle, test_file, "/etc/test.txt")
+        with pytest.raises(ContainerError) as exc_info:
+            manager.copy_to(handle, test_file, "/etc/test.txt")
 
-            assert "container not found" in str(exc_info.value).lower()
+        assert "container not found" in str(exc_info.value).lower()
 
-    def test_copy_to_api_error(self, tmp_path):
+    def test_copy_to_api_error(self, podman_ctx, tmp_path):
         """Test copy_to() handles API errors."""
-        manager = PodmanManager()
-        handle = ContainerHandle(container_id="test-container-id")
+        manager, client, container = podman_ctx
         test_file = tmp_path / "test.txt"
         test_file.write_text("test")
 
         from podman.errors import APIError
 
-        mock_container = MagicMock()
-        mock_container.put_archive.side_effect = APIError("API error")
-
-        with patch.object(manager, "_ensure_client"):
-            manager._client = MagicMock()
-            manager._client.containers.get.return_value = mock_container
-
-            with pytest.raises(ContainerError) as exc_info:
-                manager.copy_to(handle, test_file, "/etc/test.txt")
-
-            assert "failed to copy file" in str(exc_info.value).lower()
+        container.put_archive.side_effect = APIError("API error")
+
+        with pytest.raises(ContainerError) as exc_info:
+            manager.copy_to(HANDLE, test_file, "/etc/test.txt")
+
+        assert "failed to copy file" in str(exc_info.value).lower()
+
+    def test_copy_many_single_archive(self, podman_ctx, tmp_path):
+        """Test copy_many() uploads all files in one put_archive call."""
+        manager, client, container = podman_ctx
+        uploads = _archive_names(container)
+
+        repo_file = tmp_path / "koji.repo"
+        repo_file.write_text("[koji-repo]\n")
+        macros_file = tmp_path / "macros.koji"
+        macros_file.write_text("%dist .el10\n")
+
+        manager.copy_many(
+            HANDLE,
+            [
+                (repo_file, "/etc/yum.repos.d/koji.repo"),
+                (macros_file, "/etc/rpm/macros.koji"),
+            ],
+        )
+
+        assert container.put_archive.call_count == 1
+        call_args = container.put_archive.call_args
+        assert call_args[1]["path"] == "/"
+        assert uploads == [["etc/yum.repos.d/koji.repo", "etc/rpm/macros.koji"]]
+
+    def test_copy_many_validates_all_sources(self, podman_ctx, tmp_path):
+        """Test copy_many() fails before uploading when any source is missing."""
+        manager, client, container = podman_ctx
+        good_file = tmp_path / "good.txt"
+        good_file.write_text("ok")
+
+        with pytest.raises(ContainerError) as exc_info:
+            manager.copy_many(
+                HANDLE,
+                [(good_file, "/tmp/good.txt"), (tmp_path / "missing.txt", "/tmp/missing.txt")],
+            )
+
+        assert "does not exist" in str(exc_info.value).lower()
+        assert not container.put_archive.called
@@ -0,0 +1,60 @@
+"""Unit tests for log sink implementations."""
+
+from __future__ import annotations
+
+import logging
+
+from koji_adjutant.container.interface import BoundedInMemoryLogSink
+from koji_adjutant.task_adapters.logging import FileKojiLogSink
+
+
+class TestBoundedInMemoryLogSink:
+    """Test tail-only in-memory sink."""
+
+    def test_keeps_everything_under_limit(self):
+        """Test output smaller than the limit is kept whole."""
+        sink = BoundedInMemoryLogSink(max_bytes=16)
+        sink.write_stdout(b"hello ")
+        sink.write_stdout(b"world")
+        sink.write_stderr(b"oops")
+
+        assert sink.stdout == b"hello world"
+        assert sink.stderr == b"oops"
+
+    def test_keeps_tail_over_limit(self):
+        """Test only the last max_bytes of each stream are retained."""
+        sink = BoundedInMemoryLogSink(max_bytes=8)
+        for i in range(10):
+            sink.write_stdout(f"line {i}\n".encode())
+
+        assert sink.stdout == b"\nline 9\n"
+        assert sink.stderr == b""
+
+
+class TestFileKojiLogSink:
+    """Test file persistence of FileKojiLogSink."""
+
+    def test_unbuffered_flushes_each_write(self, tmp_path):
+        """Test default sink makes each write visible immediately."""
+        log_file = tmp_path / "logs" / "container.log"
+        with FileKojiLogSink(logging.getLogger("test.koji"), log_file) as sink:
+            sink.write_stdout(b"out\n")
+            assert log_file.read_bytes() == b"out\n"
+            sink.write_stderr(b"err\n")
+            assert log_file.read_bytes() == b"out\nerr\n"
+
+    def test_buffered_flushes_on_close(self, tmp_path):
+        """Test buffered sink holds writes until the interval or close."""
+        log_file = tmp_path / "container.log"
+        sink = FileKojiLogSink(
+            logging.getLogger("test.koji"),
+            log_file,
+            buffer_size=4096,
+            flush_interval=3600.0,
+        )
+        sink.write_stdout(b"out\n")
+        sink.write_stderr(b"err\n")
+        assert log_file.read_bytes() == b""
+
+        sink.close()
+        assert log_file.read_bytes() == b"out\nerr\n"
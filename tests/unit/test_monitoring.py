@@ -4,11 +4,11 @@ from __future__ import annotations
 
 import threading
 import time
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
-from koji_adjutant.monitoring.registry import ContainerInfo, ContainerRegistry, TaskInfo, TaskRegistry
+from koji_adjutant.monitoring.registry import ContainerRegistry, TaskRegistry
 
 
 class TestContainerRegistry:
@@ -85,6 +85,27 @@ class TestContainerRegistry:
         assert len(containers) == 1
         assert containers[0].container_id == "container-2"
 
+    def test_epoch_tracks_mutations(self):
+        """Test epoch changes on mutation and not on reads."""
+        registry = ContainerRegistry()
+        start = registry.epoch
+
+        registry.register(
+            container_id="container-1",
+            task_id=1,
+            image="test/image:latest",
+            spec={},
+        )
+        after_register = registry.epoch
+        assert after_register > start
+
+        registry.get("container-1")
+        registry.list_containers()
+        assert registry.epoch == after_register
+
+        registry.update_status("container-1", "running")
+        assert registry.epoch > after_register
+
     def test_cleanup_old_entries(self):
         """Test TTL-based cleanup."""
         registry = ContainerRegistry(history_ttl=1)  # 1 second TTL
@@ -107,41 +128,48 @@ class TestContainerRegistry:
         assert removed == 1
         assert registry.get("container-1") is None
 
+    def test_cleanup_skips_reregistered_container(self):
+        """Test cleanup keeps a container re-registered after it finished."""
+        registry = ContainerRegistry(history_ttl=0)
+        registry.register(container_id="container-1", task_id=1, image="test:latest", spec={})
+        registry.unregister("container-1")
+        registry.register(container_id="container-1", task_id=2, image="test:latest", spec={})
+
+        assert registry.cleanup_old_entries() == 0
+        assert registry.get("container-1").task_id == 2
+
     def test_thread_safety(self):
         """Test concurrent access thread safety."""
         registry = ContainerRegistry()
         results = []
+        # Release the writers and the lister together so they contend
+        barrier = threading.Barrier(11)
 
-        def register_containers():
+        def register_containers(worker):
+            barrier.wait()
             for i in range(100):
                 registry.register(
-                    container_id=f"container-{i}",
-                    task_id=i,
+                    container_id=f"container-{worker}-{i}",
+                    task_id=worker * 100 + i,
                     image="test/image:latest",
                     spec={},
                 )
 
         def list_containers():
+            barrier.wait()
             for _ in range(100):
                 containers = registry.list_containers()
                 results.append(len(containers))
 
-        threads = []
-        for _ in range(10):
-            t = threading.Thread(target=register_containers)
-            threads.append(t)
-            t.start()
-
-        list_thread = threading.Thread(target=list_containers)
-        list_thread.start()
-        threads.append(list_thread)
-
-        for t in threads:
-            t.join()
+        with ThreadPoolExecutor(max_workers=11) as executor:
+            lister = executor.submit(list_containers)
+            list(executor.map(register_containers, range(10)))
+            lister.result()
 
         # Should have registered all containers
         containers = registry.list_containers()
         assert len(containers) == 1000  # 10 threads * 100 containers
+        assert results == sorted(results)
 
 
 class TestTaskRegistry:
@@ -216,6 +244,22 @@ class TestTaskRegistry:
         assert len(tasks) == 1
         assert tasks[0].task_id == 2
 
+    def test_epoch_tracks_mutations(self):
+        """Test epoch changes on mutation and not on reads."""
+        registry = TaskRegistry()
+        start = registry.epoch
+
+        registry.register_task(task_id=1, task_type="buildArch")
+        after_register = registry.epoch
+        assert after_register > start
+
+        registry.get(1)
+        registry.list_tasks()
+        assert registry.epoch == after_register
+
+        registry.update_task_progress(1, {"stage": "build"})
+        assert registry.epoch > after_register
+
     def test_cleanup_old_entries(self):
         """Test TTL-based cleanup."""
         registry = TaskRegistry(history_ttl=1)  # 1 second TTL
@@ -237,32 +281,29 @@ class TestTaskRegistry:
         """Test concurrent access thread safety."""
         registry = TaskRegistry()
         results = []
+        # Release the writers and the lister together so they contend
+        barrier = threading.Barrier(11)
 
-        def register_tasks():
+        def register_tasks(worker):
+            barrier.wait()
             for i in range(100):
                 registry.register_task(
-                    task_id=i,
+                    task_id=worker * 100 + i,
                     task_type="buildArch",
                 )
 
         def list_tasks():
+            barrier.wait()
             for _ in range(100):
                 tasks = registry.list_tasks()
                 results.append(len(tasks))
 
-        threads = []
-        for _ in range(10):
-            t = threading.Thread(target=register_tasks)
-            threads.append(t)
-            t.start()
-
-        list_thread = threading.Thread(target=list_tasks)
-        list_thread.start()
-        threads.append(list_thread)
-
-        for t in threads:
-            t.join()
+        with ThreadPoolExecutor(max_workers=11) as executor:
+            lister = executor.submit(list_tasks)
+            list(executor.map(register_tasks, range(10)))
+            lister.result()
 
         # Should have registered all tasks
         tasks = registry.list_tasks()
-        assert len(tasks) == 1000  # 10 threads * 100 tasks
\ No newline at end of file
+        assert len(tasks) == 1000  # 10 threads * 100 tasks
+        assert results == sorted(results)
@@ -3,12 +3,37 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime, timedelta
-from unittest.mock import MagicMock
+import logging
+import time
 
 import pytest
 
-from koji_adjutant.policy.resolver import CachedPolicy, PolicyResolver
+from koji_adjutant.policy.resolver import CachedPolicy, CompiledPolicy, PolicyResolver
+
+
+class FakeSession:
+    """Hub session stub without multicall support.
+
+    getTag and getBuildConfig return ``tag_info`` and ``build_config``, or
+    raise ``error`` when it is set; ``getTag_calls`` counts tag lookups.
+    """
+
+    def __init__(self) -> None:
+        self.tag_info = None
+        self.build_config = None
+        self.error = None
+        self.getTag_calls = 0
+
+    def getTag(self, tag_name, event=None, strict=False):
+        self.getTag_calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.tag_info
+
+    def getBuildConfig(self, tag_name, event=None):
+        if self.error is not None:
+            raise self.error
+        return self.build_config
 
 
 class TestCachedPolicy:
@@ -17,38 +42,68 @@ class TestCachedPolicy:
     def test_is_valid(self):
         """Test cache validity checking."""
         policy = {"rules": []}
-        cached = CachedPolicy(
-            policy=policy, cached_at=datetime.now(), ttl_seconds=300
-        )
+        cached = CachedPolicy(policy=policy, ttl_seconds=300)
         assert cached.is_valid() is True
 
         # Expired cache
         cached = CachedPolicy(
             policy=policy,
-            cached_at=datetime.now() - timedelta(seconds=400),
+            cached_at=time.monotonic() - 400,
             ttl_seconds=300,
         )
         assert cached.is_valid() is False
 
 
+class TestCompiledPolicy:
+    """Test CompiledPolicy rule indexing."""
+
+    def test_from_policy_indexes_rules(self):
+        """Test rules are indexed by type, first match wins, bad rules skipped."""
+        compiled = CompiledPolicy.from_policy(
+            {
+                "rules": [
+                    {"type": "tag", "tag": "f39-build", "image": "first"},
+                    {"type": "tag", "tag": "f39-build", "image": "second"},
+                    {"type": "tag_arch", "tag": "f39-build", "arch": "x86_64", "image": "ta"},
+                    {"type": "task_type", "task_type": "createrepo", "image": ""},
+                    "not-a-rule",
+                    {"type": "default", "image": "fallback"},
+                ]
+            }
+        )
+
+        assert compiled.by_tag == {"f39-build": "first"}
+        assert compiled.by_tag_arch == {("f39-build", "x86_64"): "ta"}
+        assert compiled.by_task_type == {}
+        assert compiled.default == "fallback"
+
+    def test_from_policy_rejects_non_list_rules(self):
+        """Test malformed rules compile to an empty policy."""
+        compiled = CompiledPolicy.from_policy({"rules": "bogus"})
+
+        assert not compiled.by_tag_arch
+        assert not compiled.by_tag
+        assert not compiled.by_task_type
+        assert compiled.default is None
+
+
 class TestPolicyResolver:
     """Test PolicyResolver class."""
 
     @pytest.fixture
-    def mock_session(self):
-        """Create a mock koji session."""
-        session = MagicMock()
-        return session
+    def session(self):
+        """Create a fake koji session without multicall support."""
+        return FakeSession()
 
     @pytest.fixture
-    def resolver(self, mock_session):
+    def resolver(self, session):
         """Create a PolicyResolver instance."""
-        return PolicyResolver(mock_session)
+        return PolicyResolver(session)
 
-    def test_resolve_image_config_fallback(self, resolver, mock_session):
+    def test_resolve_image_config_fallback(self, resolver, session):
         """Test fallback to config default when policy disabled."""
-        mock_session.getTag.return_value = None
-        mock_session.getBuildConfig.return_value = None
+        session.tag_info = None
+        session.build_config = None
 
         # Policy disabled (default should be True, but we'll test the fallback path)
         image = resolver.resolve_image(
@@ -57,7 +112,7 @@ class TestPolicyResolver:
         # Should get config default
         assert image == "registry/almalinux:10"
 
-    def test_resolve_image_tag_arch_match(self, resolver, mock_session):
+    def test_resolve_image_tag_arch_match(self, resolver, session):
         """Test policy resolution with tag_arch match."""
         policy = {
             "rules": [
@@ -72,14 +127,14 @@ class TestPolicyResolver:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         image = resolver.resolve_image(
             tag_name="f39-build", arch="x86_64", task_type="buildArch"
         )
         assert image == "registry/image:f39-x86_64"
 
-    def test_resolve_image_tag_match(self, resolver, mock_session):
+    def test_resolve_image_tag_match(self, resolver, session):
         """Test policy resolution with tag match."""
         policy = {
             "rules": [
@@ -93,14 +148,14 @@ class TestPolicyResolver:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         image = resolver.resolve_image(
             tag_name="f39-build", arch="aarch64", task_type="buildArch"
         )
         assert image == "registry/image:f39"
 
-    def test_resolve_image_task_type_match(self, resolver, mock_session):
+    def test_resolve_image_task_type_match(self, resolver, session):
         """Test policy resolution with task_type match."""
         policy = {
             "rules": [
@@ -114,14 +169,14 @@ class TestPolicyResolver:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         image = resolver.resolve_image(
             tag_name="any-tag", arch="x86_64", task_type="createrepo"
         )
         assert image == "registry/image:repo"
 
-    def test_resolve_image_default_fallback(self, resolver, mock_session):
+    def test_resolve_image_default_fallback(self, resolver, session):
         """Test policy resolution with default rule."""
         policy = {
             "rules": [
@@ -130,24 +185,24 @@ class TestPolicyResolver:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         image = resolver.resolve_image(
             tag_name="unknown-tag", arch="x86_64", task_type="buildArch"
         )
         assert image == "registry/image:default"
 
-    def test_resolve_image_config_fallback_no_policy(self, resolver, mock_session):
+    def test_resolve_image_config_fallback_no_policy(self, resolver, session):
         """Test fallback to config when no policy found."""
-        mock_session.getTag.return_value = None
-        mock_session.getBuildConfig.return_value = None
+        session.tag_info = None
+        session.build_config = None
 
         image = resolver.resolve_image(
             tag_name="test-tag", arch="x86_64", task_type="buildArch"
         )
         assert image == "registry/almalinux:10"
 
-    def test_resolve_image_build_config_fallback(self, resolver, mock_session):
+    def test_resolve_image_build_config_fallback(self, resolver, session):
         """Test fallback to build config when tag extra unavailable."""
         policy = {
             "rules": [
@@ -155,16 +210,16 @@ class TestPolicyResolver:
             ]
         }
 
-        mock_session.getTag.return_value = None
+        session.tag_info = None
         build_config = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getBuildConfig.return_value = build_config
+        session.build_config = build_config
 
         image = resolver.resolve_image(
             tag_name="test-tag", arch="x86_64", task_type="buildArch"
         )
         assert image == "registry/image:from-config"
 
-    def test_resolve_image_caching(self, resolver, mock_session):
+    def test_resolve_image_caching(self, resolver, session):
         """Test that policy results are cached."""
         policy = {
             "rules": [
@@ -178,14 +233,14 @@ class TestPolicyResolver:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         # First call - should query hub
         image1 = resolver.resolve_image(
             tag_name="f39-build", arch="x86_64", task_type="buildArch"
         )
         assert image1 == "registry/image:f39-x86_64"
-        assert mock_session.getTag.call_count == 1
+        assert session.getTag_calls == 1
 
         # Second call - should use cache
         image2 = resolver.resolve_image(
@@ -193,9 +248,43 @@ class TestPolicyResolver:
         )
         assert image2 == "registry/image:f39-x86_64"
         # Should still be 1 (cached, no new query)
-        assert mock_session.getTag.call_count == 1
+        assert session.getTag_calls == 1
 
-    def test_resolve_image_precedence(self, resolver, mock_session):
+    def test_resolve_image_expired_unchanged_policy(self, resolver, session):
+        """Test an expired entry is renewed, not rebuilt, if the policy is unchanged."""
+        policy = {"rules": [{"type": "default", "image": "registry/image:default"}]}
+        session.tag_info = {
+            "extra": {"adjutant_image_policy": json.dumps(policy)}
+        }
+
+        resolver.resolve_image(tag_name="f39-build", arch="x86_64", task_type="buildArch")
+        cached = resolver._cache["f39-build"]
+        compiled = cached.compiled
+        cached.cached_at = time.monotonic() - 400  # Expired
+
+        image = resolver.resolve_image(
+            tag_name="f39-build", arch="x86_64", task_type="buildArch"
+        )
+        assert image == "registry/image:default"
+        assert session.getTag_calls == 2
+        assert resolver._cache["f39-build"] is cached
+        assert cached.compiled is compiled
+        assert cached.is_valid()
+
+        # A changed policy replaces the entry
+        policy["rules"][0]["image"] = "registry/image:new"
+        session.tag_info = {
+            "extra": {"adjutant_image_policy": json.dumps(policy)}
+        }
+        cached.cached_at = time.monotonic() - 400
+
+        image = resolver.resolve_image(
+            tag_name="f39-build", arch="x86_64", task_type="buildArch"
+        )
+        assert image == "registry/image:new"
+        assert resolver._cache["f39-build"] is not cached
+
+    def test_resolve_image_precedence(self, resolver, session):
         """Test rule precedence: tag_arch > tag > task_type > default."""
         policy = {
             "rules": [
@@ -220,7 +309,7 @@ class TestPolicyResolver:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": json.dumps(policy)}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         # Should match tag_arch (highest precedence)
         image = resolver.resolve_image(
@@ -246,7 +335,7 @@ class TestPolicyResolver:
         )
         assert image == "registry/image:default"
 
-    def test_resolve_image_wrapped_policy_format(self, resolver, mock_session):
+    def test_resolve_image_wrapped_policy_format(self, resolver, session):
         """Test handling of wrapped policy format."""
         wrapped_policy = {
             "adjutant_image_policy": {
@@ -257,17 +346,16 @@ class TestPolicyResolver:
         }
 
         tag_info = {"extra": {"adjutant_image_policy": wrapped_policy}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         image = resolver.resolve_image(
             tag_name="test-tag", arch="x86_64", task_type="buildArch"
         )
         assert image == "registry/image:wrapped"
 
-    def test_resolve_image_hub_error_handling(self, resolver, mock_session):
+    def test_resolve_image_hub_error_handling(self, resolver, session):
         """Test graceful handling of hub errors."""
-        mock_session.getTag.side_effect = Exception("Hub unavailable")
-        mock_session.getBuildConfig.side_effect = Exception("Hub unavailable")
+        session.error = Exception("Hub unavailable")
 
         # Should fall back to config default without raising
         image = resolver.resolve_image(
@@ -275,10 +363,10 @@ class TestPolicyResolver:
         )
         assert image == "registry/almalinux:10"
 
-    def test_resolve_image_invalid_json(self, resolver, mock_session):
+    def test_resolve_image_invalid_json(self, resolver, session):
         """Test handling of invalid JSON in policy."""
         tag_info = {"extra": {"adjutant_image_policy": "invalid json"}}
-        mock_session.getTag.return_value = tag_info
+        session.tag_info = tag_info
 
         # Should fall back to config default
         image = resolver.resolve_image(
@@ -286,40 +374,106 @@ class TestPolicyResolver:
         )
         assert image == "registry/almalinux:10"
 
+        # The broken policy is cached, not fetched again
+        image = resolver.resolve_image(
+            tag_name="test-tag", arch="x86_64", task_type="buildArch"
+        )
+        assert image == "registry/almalinux:10"
+        assert session.getTag_calls == 1
+
+        # Once expired, the unchanged broken policy is renewed, not decoded again
+        cached = resolver._cache["test-tag"]
+        cached.cached_at = time.monotonic() - 400
+        resolver.resolve_image(tag_name="test-tag", arch="x86_64", task_type="buildArch")
+        assert session.getTag_calls == 2
+        assert resolver._cache["test-tag"] is cached
+
+    def test_resolve_image_malformed_rule(self, resolver, session, caplog):
+        """Test rules with non-string match fields are skipped with a warning."""
+        policy = {
+            "rules": [
+                {"type": "tag", "tag": ["test-tag"], "image": "registry/image:list"},
+                {"type": "tag_arch", "tag": "test-tag", "arch": {}, "image": "registry/image:dict"},
+                {"type": "task_type", "task_type": None, "image": "registry/image:none"},
+                {"type": "tag", "tag": "test-tag", "image": "registry/image:tag"},
+            ]
+        }
+        session.tag_info = {"extra": {"adjutant_image_policy": policy}}
+
+        with caplog.at_level(logging.WARNING, logger="koji_adjutant.policy.resolver"):
+            image = resolver.resolve_image(
+                tag_name="test-tag", arch="x86_64", task_type="buildArch"
+            )
+
+        assert image == "registry/image:tag"
+        assert caplog.text.count("Invalid rule format") == 3
+
+    def test_decode_policy_extra(self, resolver):
+        """Test decoding of policy values stored in hub extra data."""
+        policy = {"rules": [{"type": "default", "image": "registry/image:default"}]}
+
+        assert resolver._decode_policy_extra(json.dumps(policy)) == policy
+        assert resolver._decode_policy_extra(policy) is policy
+        assert resolver._decode_policy_extra("invalid json") is None
+
+    def test_resolve_image_uses_policy_decoder(self, resolver, session, monkeypatch):
+        """Test hub extra data is passed through _decode_policy_extra."""
+        policy = {"rules": [{"type": "default", "image": "registry/image:decoded"}]}
+        decoded = []
+
+        def decode(raw):
+            decoded.append(raw)
+            return policy
+
+        monkeypatch.setattr(resolver, "_decode_policy_extra", decode)
+        session.tag_info = {"extra": {"adjutant_image_policy": "opaque"}}
+
+        image = resolver.resolve_image(
+            tag_name="test-tag", arch="x86_64", task_type="buildArch"
+        )
+        assert image == "registry/image:decoded"
+        assert decoded == ["opaque"]
+
     def test_invalidate_cache(self, resolver):
         """Test cache invalidation."""
         # Add some cache entries
-        resolver._cache[("tag1", "x86_64")] = CachedPolicy(
-            policy={"rules": []}, cached_at=datetime.now(), ttl_seconds=300
-        )
-        resolver._cache[("tag1", "aarch64")] = CachedPolicy(
-            policy={"rules": []}, cached_at=datetime.now(), ttl_seconds=300
-        )
-        resolver._cache[("tag2", "x86_64")] = CachedPolicy(
-            policy={"rules": []}, cached_at=datetime.now(), ttl_seconds=300
-        )
+        resolver._cache["tag1"] = CachedPolicy(policy={"rules": []}, ttl_seconds=300)
+        resolver._cache["tag2"] = CachedPolicy(policy={"rules": []}, ttl_seconds=300)
 
         # Invalidate all
         resolver.invalidate_cache()
         assert len(resolver._cache) == 0
 
         # Re-add entries
-        resolver._cache[("tag1", "x86_64")] = CachedPolicy(
-            policy={"rules": []}, cached_at=datetime.now(), ttl_seconds=300
-        )
-        resolver._cache[("tag1", "aarch64")] = CachedPolicy(
-            policy={"rules": []}, cached_at=datetime.now(), ttl_seconds=300
-        )
+        resolver._cache["tag1"] = CachedPolicy(policy={"rules": []}, ttl_seconds=300)
+        resolver._cache["tag2"] = CachedPolicy(policy={"rules": []}, ttl_seconds=300)
 
         # Invalidate specific tag
         resolver.invalidate_cache(tag_name="tag1")
+        assert list(resolver._cache) == ["tag2"]
+
+        # Entries are per tag, so tag+arch drops the whole tag
+        resolver.invalidate_cache(tag_name="tag2", arch="x86_64")
         assert len(resolver._cache) == 0
 
-        # Re-add entries
-        resolver._cache[("tag1", "x86_64")] = CachedPolicy(
-            policy={"rules": []}, cached_at=datetime.now(), ttl_seconds=300
-        )
+    def test_resolve_image_cached_per_tag(self, resolver, session):
+        """Test one hub lookup serves every arch of a tag."""
+        policy = {
+            "rules": [
+                {
+                    "type": "tag_arch",
+                    "tag": "f39-build",
+                    "arch": "x86_64",
+                    "image": "registry/image:f39-x86_64",
+                },
+            ]
+        }
+        session.tag_info = {
+            "extra": {"adjutant_image_policy": json.dumps(policy)}
+        }
 
-        # Invalidate specific tag+arch
-        resolver.invalidate_cache(tag_name="tag1", arch="x86_64")
-        assert len(resolver._cache) == 0
+        for arch in ("x86_64", "aarch64", "ppc64le"):
+            resolver.resolve_image(tag_name="f39-build", arch=arch, task_type="buildArch")
+
+        assert session.getTag_calls == 1
+        assert list(resolver._cache) == ["f39-build"]
@@ -1,164 +1,116 @@
 """Unit tests for SCM handlers."""
 
-from unittest.mock import MagicMock
-
 import pytest
 
 from koji_adjutant.container.interface import ContainerError, ContainerHandle
 from koji_adjutant.task_adapters.scm.git import GitHandler, get_scm_handler
 
+from ._fakes import exec_manager
+
+HANDLE = ContainerHandle(container_id="test-container")
+
 
 class TestGitHandler:
     """Test GitHandler class."""
     
-    def test_is_scm_url_git_protocol(self):
-        """Test git:// URL detection."""
-        assert GitHandler.is_scm_url("git://example.com/repo.git") is True
-        assert GitHandler.is_scm_url("git+https://example.com/repo.git") is True
-        assert GitHandler.is_scm_url("git+http://example.com/repo.git") is True
-        
-    def test_is_scm_url_https_git(self):
-        """Test https://*.git URL detection."""
-        assert GitHandler.is_scm_url("https://github.com/user/repo.git") is True
-        assert GitHandler.is_scm_url("https://gitlab.com/user/repo.git") is True
-        assert GitHandler.is_scm_url("http://example.com/repo.git") is True
-        
-    def test_is_scm_url_non_git(self):
-        """Test non-git URL rejection."""
-        assert GitHandler.is_scm_url("svn://example.com/repo") is False
-        assert GitHandler.is_scm_url("https://example.com/file.tar.gz") is False
-        assert GitHandler.is_scm_url("ftp://example.com/file.tar.gz") is False
-    
-    def test_init_with_branch(self):
-        """Test GitHandler initialization with branch in fragment."""
-        handler = GitHandler("git://example.com/repo.git#develop")
-        assert handler.url == "git://example.com/repo.git"
-        assert handler.ref == "develop"
-        assert handler.ref_type == "branch"
-    
-    def test_init_with_tag(self):
-        """Test GitHandler initialization with tag in fragment."""
-        handler = GitHandler("git://example.com/repo.git#v1.0.0")
-        assert handler.url == "git://example.com/repo.git"
-        assert handler.ref == "v1.0.0"
-        assert handler.ref_type == "tag"
-    
-    def test_init_with_commit(self):
-        """Test GitHandler initialization with commit in fragment."""
-        handler = GitHandler("git://example.com/repo.git#abc123def456")
-        assert handler.url == "git://example.com/repo.git"
-        assert handler.ref == "abc123def456"
-        assert handler.ref_type == "commit"
-    
-    def test_init_default_ref(self):
-        """Test GitHandler initialization without fragment defaults to main."""
-        handler = GitHandler("git://example.com/repo.git")
-        assert handler.url == "git://example.com/repo.git"
-        assert handler.ref == "main"
-        assert handler.ref_type == "branch"
-    
-    def test_init_with_options_branch(self):
-        """Test GitHandler initialization with branch in options."""
-        handler = GitHandler("git://example.com/repo.git", {"branch": "feature"})
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            # git protocols
+            ("git://example.com/repo.git", True),
+            ("git+https://example.com/repo.git", True),
+            ("git+http://example.com/repo.git", True),
+            # http(s) URLs of .git repositories
+            ("https://github.com/user/repo.git", True),
+            ("https://gitlab.com/user/repo.git", True),
+            ("http://example.com/repo.git", True),
+            # anything else
+            ("svn://example.com/repo", False),
+            ("https://example.com/file.tar.gz", False),
+            ("ftp://example.com/file.tar.gz", False),
+        ],
+    )
+    def test_is_scm_url(self, url, expected):
+        """Test git URL detection and non-git URL rejection."""
+        assert GitHandler.is_scm_url(url) is expected
+    
+    @pytest.mark.parametrize(
+        "url,options,ref,ref_type",
+        [
+            ("git://example.com/repo.git#develop", None, "develop", "branch"),
+            ("git://example.com/repo.git#v1.0.0", None, "v1.0.0", "tag"),
+            ("git://example.com/repo.git#abc123def456", None, "abc123def456", "commit"),
+            ("git://example.com/repo.git", None, "main", "branch"),  # default ref
+            ("git://example.com/repo.git", {"branch": "feature"}, "feature", "branch"),
+            ("git://example.com/repo.git", {"commit": "abc123"}, "abc123", "commit"),
+        ],
+        ids=["branch", "tag", "commit", "default_ref", "options_branch", "options_commit"],
+    )
+    def test_init(self, url, options, ref, ref_type):
+        """Test GitHandler picks the ref from the URL fragment or options."""
+        handler = GitHandler(url, options)
         assert handler.url == "git://example.com/repo.git"
-        assert handler.ref == "feature"
-        assert handler.ref_type == "branch"
-    
-    def test_init_with_options_commit(self):
-        """Test GitHandler initialization with commit in options."""
-        handler = GitHandler("git://example.com/repo.git", {"commit": "abc123"})
-        assert handler.url == "git://example.com/repo.git"
-        assert handler.ref == "abc123"
-        assert handler.ref_type == "commit"
-    
-    def test_checkout_success_branch(self):
-        """Test successful git checkout with branch."""
-        handler = GitHandler("git://example.com/repo.git#main")
-        handle = ContainerHandle(container_id="test-container")
-        mock_manager = MagicMock()
-        mock_manager.exec.return_value = 0
+        assert handler.ref == ref
+        assert handler.ref_type == ref_type
+    
+    @pytest.mark.parametrize(
+        "url,ref,ref_type,branch,commands",
+        [
+            # A branch is cloned shallowly
+            (
+                "git://example.com/repo.git#main", "main", "branch", "main",
+                [
+                    ["git", "clone", "--depth", "1", "--branch", "main",
+                     "git://example.com/repo.git", "/builddir/source"],
+                ],
+            ),
+            # A commit needs a full clone followed by a checkout of the commit
+            (
+                "git://example.com/repo.git#abc123def456", "abc123def456", "commit", "",
+                [
+                    ["git", "clone", "git://example.com/repo.git", "/builddir/source"],
+                    ["git", "-C", "/builddir/source", "checkout", "abc123def456"],
+                ],
+            ),
+        ],
+        ids=["branch", "commit"],
+    )
+    def test_checkout_success(self, url, ref, ref_type, branch, commands):
+        """Test successful git checkout of a branch or a commit."""
+        handler = GitHandler(url)
+        manager = exec_manager()
         
-        result = handler.checkout(mock_manager, handle, "/builddir/source")
+        result = handler.checkout(manager, HANDLE, "/builddir/source")
         
         assert result["url"] == "git://example.com/repo.git"
         assert "commit" in result
-        assert result["branch"] == "main"
-        assert result["ref"] == "main"
-        assert result["ref_type"] == "branch"
-        
-        # Verify git clone was called with correct args
-        calls = mock_manager.exec.call_args_list
-        clone_calls = [call for call in calls if "clone" in str(call)]
-        assert len(clone_calls) > 0
-        
-        # Check that --depth 1 and --branch were used for branch checkout
-        clone_call = clone_calls[0]
-        clone_cmd = clone_call[0][1]  # Second arg is command list
-        assert "clone" in clone_cmd
-        assert "--depth" in clone_cmd
-        assert "--branch" in clone_cmd
-    
-    def test_checkout_success_commit(self):
-        """Test successful git checkout with commit."""
-        handler = GitHandler("git://example.com/repo.git#abc123def456")
-        handle = ContainerHandle(container_id="test-container")
-        mock_manager = MagicMock()
-        mock_manager.exec.return_value = 0
-        
-        result = handler.checkout(mock_manager, handle, "/builddir/source")
+        assert result["branch"] == branch
+        assert result["ref"] == ref
+        assert result["ref_type"] == ref_type
         
-        assert result["url"] == "git://example.com/repo.git"
-        assert result["ref"] == "abc123def456"
-        assert result["ref_type"] == "commit"
-        
-        # Verify git clone was called without --depth for commit checkout
-        calls = mock_manager.exec.call_args_list
-        clone_calls = [call for call in calls if "clone" in str(call)]
-        assert len(clone_calls) > 0
-        
-        # Check that checkout command was also called
-        checkout_calls = [call for call in calls if "checkout" in str(call)]
-        assert len(checkout_calls) > 0
-    
-    def test_checkout_failure_mkdir(self):
-        """Test git checkout failure on mkdir."""
-        handler = GitHandler("git://example.com/repo.git")
-        handle = ContainerHandle(container_id="test-container")
-        mock_manager = MagicMock()
-        mock_manager.exec.side_effect = [
-            1,  # mkdir fails
-        ]
-        
-        with pytest.raises(ContainerError, match="Failed to create directory"):
-            handler.checkout(mock_manager, handle, "/builddir/source")
-    
-    def test_checkout_failure_clone(self):
-        """Test git checkout failure on clone."""
-        handler = GitHandler("git://example.com/repo.git")
-        handle = ContainerHandle(container_id="test-container")
-        mock_manager = MagicMock()
-        mock_manager.exec.side_effect = [
-            0,  # mkdir succeeds
-            1,  # git clone fails
-        ]
-        
-        with pytest.raises(ContainerError, match="Git clone failed"):
-            handler.checkout(mock_manager, handle, "/builddir/source")
-    
-    def test_checkout_failure_checkout_commit(self):
-        """Test git checkout failure on commit checkout."""
-        # Use a commit hash that matches the 7-40 character requirement
-        handler = GitHandler("git://example.com/repo.git#abc1234")
-        handle = ContainerHandle(container_id="test-container")
-        mock_manager = MagicMock()
-        mock_manager.exec.side_effect = [
-            0,  # mkdir succeeds
-            0,  # git clone succeeds
-            1,  # git checkout fails
-        ]
+        # Verify the git commands ran in order, right after the mkdir
+        calls = manager.exec.calls
+        assert calls[0] == ["mkdir", "-p", "/builddir/source"]
+        assert calls[1:1 + len(commands)] == commands
+        assert set(manager.exec.handles) == {HANDLE}
+    
+    @pytest.mark.parametrize(
+        "url,exit_codes,match",
+        [
+            ("git://example.com/repo.git", [1], "Failed to create directory"),
+            ("git://example.com/repo.git", [0, 1], "Git clone failed"),
+            # Use a commit hash that matches the 7-40 character requirement
+            ("git://example.com/repo.git#abc1234", [0, 0, 1], "Git checkout commit failed"),
+        ],
+        ids=["mkdir", "clone", "checkout_commit"],
+    )
+    def test_checkout_failure(self, url, exit_codes, match):
+        """Test git checkout fails on the first command that exits non-zero."""
+        handler = GitHandler(url)
+        manager = exec_manager(*exit_codes)
         
-        with pytest.raises(ContainerError, match="Git checkout commit failed"):
-            handler.checkout(mock_manager, handle, "/builddir/source")
+        with pytest.raises(ContainerError, match=match):
+            handler.checkout(manager, HANDLE, "/builddir/source")
 
 
 class TestGetSCMHandler: